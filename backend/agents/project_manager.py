@@ -1,19 +1,43 @@
 # Import relevant functionality
 from langchain_core.tools import tool
 from langchain_core.prompts import PromptTemplate
+import asyncio
 import os, sys
+import pytz
 
 # Add the parent directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from notion_api import NotionAPI, Assignment
+from services.assignment_sync import AssignmentSyncEngine
+from services.course_dashboard import (
+    COMPLETED_STATUSES,
+    DEFAULT_ASSIGNMENT_MINUTES,
+    assignment_due,
+    build_course_dashboard,
+    course_dashboards,
+)
+from services.completion_estimates import (
+    CompletionTimeEstimator,
+    EstimateInput,
+    load_estimates,
+    page_revision,
+    save_estimates,
+)
+from services.notion_blocks import get_page_content
+from services.subtask_tree import SubtaskDraft, SubtaskTreeBuilder
+from services.notion_write_queue import get_write_queue, write_behind_enabled
+from services.user_profile import scheduling_preferences
+from utils.availability import as_interval_arrays, find_free_slots
+from utils.study_planner import STRATEGIES, StudyTask, plan_study_sessions
+from utils.relative_dates import parse_relative_date
+from utils.assignment_ranking import OpenAssignment, rank_assignments
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, Union
-from difflib import get_close_matches
+from typing import Dict, Any, List, Optional, Tuple, Union
 from langchain_anthropic import ChatAnthropic
-from dateparser import parse
-import re
 from langchain_core.runnables import RunnableConfig
 from .configuration import Configuration
+from .scheduler import find_available_time_slots, parse_range_bound
 
 import logging
 
@@ -47,9 +71,42 @@ def get_user_id_from_config(config: Optional[RunnableConfig] = None) -> str:
     return "99d11141-76eb-460f-8741-f2f5e767ba0f"
 
 
+# smart_schedule plans this far ahead unless given an end date
+SCHEDULE_HORIZON_DAYS = 14
+
+
 # Define the tools
 
 
+def resolve_assignment_names(
+    notion_api: NotionAPI, assignment_names: List[str], fuzzy: bool = True
+) -> Tuple[Optional[List[Dict[str, Any]]], List[str]]:
+    """
+    Resolve assignment names as the user wrote them against the local name index.
+
+    Args:
+        notion_api: NotionAPI of the user
+        assignment_names: Names to resolve
+        fuzzy: Allow typos and paraphrases; tools that write pass False
+
+    Returns:
+        Tuple of (distinct matched pages in order, names without a match);
+        pages is None if the assignments could not be listed
+    """
+    index = notion_api.assignment_index()
+    if index is None:
+        return None, list(assignment_names)
+    pages: Dict[str, Dict[str, Any]] = {}
+    unmatched = []
+    for name in assignment_names:
+        page = index.resolve(name, fuzzy=fuzzy)
+        if page is None:
+            unmatched.append(name)
+        else:
+            pages.setdefault(page["id"], page)
+    return list(pages.values()), unmatched
+
+
 @tool
 def get_current_time(config: RunnableConfig):
     """
@@ -77,30 +134,7 @@ def parse_relative_datetime(date_description: str):
         ISO format datetime string with the correct date and time
     """
 
-    current_time = datetime.now()
-
-    # Try to extract time information
-    time_pattern = r"at\s+(\d+)(?::(\d+))?\s*(am|pm|AM|PM)"
-    time_match = re.search(time_pattern, date_description)
-
-    # First parse the date
-    parsed_date = parse(date_description, settings={"RELATIVE_BASE": current_time})
-
-    # If we found specific time information, apply it
-    if time_match and parsed_date:
-        hour = int(time_match.group(1))
-        minute = int(time_match.group(2)) if time_match.group(2) else 0
-        am_pm = time_match.group(3).lower()
-
-        # Convert to 24-hour format
-        if am_pm == "pm" and hour < 12:
-            hour += 12
-        elif am_pm == "am" and hour == 12:
-            hour = 0
-
-        # Set the time component
-        parsed_date = parsed_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-
+    parsed_date = parse_relative_date(date_description, datetime.now())
     if parsed_date:
         return parsed_date.isoformat()
     return None
@@ -148,9 +182,12 @@ def create_assignment(assignment: Assignment, config: RunnableConfig) -> Optiona
         assignment: Assignment dataclass instance containing assignment details
         config: RunnableConfig containing user-specific configuration
     Returns:
-        Notion page dict if created successfully, else None
+        Notion page dict if created successfully, else None.
+        In write-behind mode, a provisional result with status "queued".
     """
     user_id = get_user_id_from_config(config)
+    if write_behind_enabled(config):
+        return get_write_queue().enqueue(user_id, "create", assignment)
     notion_api = NotionAPI(user_id=user_id)
     return notion_api.create_assignment_page(assignment)
 
@@ -188,6 +225,30 @@ def get_all_courses(config: RunnableConfig = None) -> Optional[Dict[str, Any]]:
     return notion_api.get_all_course_pages()
 
 
+@tool
+def get_assignment_notes(assignment_name: str, config: RunnableConfig) -> Optional[Dict[str, Any]]:
+    """
+    Read the notes written in the body of an assignment's Notion page.
+
+    Args:
+        assignment_name: Name of the assignment whose notes to read
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        Dictionary with the assignment name, page id and notes text, or None if not found
+    """
+    user_id = get_user_id_from_config(config)
+    notion_api = NotionAPI(user_id=user_id)
+    page = notion_api.find_assignment_page(assignment_name)
+    if not page:
+        return None
+    return {
+        "name": notion_api.page_fields(page)["name"],
+        "page_id": page["id"],
+        "notes": get_page_content(notion_api, page),
+    }
+
+
 @tool
 def update_assignment(assignment: Assignment, config: RunnableConfig) -> Dict[str, Any]:
     """
@@ -198,9 +259,12 @@ def update_assignment(assignment: Assignment, config: RunnableConfig) -> Dict[st
         config: RunnableConfig containing user-specific configuration
 
     Returns:
-        Updated Notion page dict if successful, else None
+        Updated Notion page dict if successful, else None.
+        In write-behind mode, a provisional result with status "queued".
     """
     user_id = get_user_id_from_config(config)
+    if write_behind_enabled(config):
+        return get_write_queue().enqueue(user_id, "update", assignment)
     notion_api = NotionAPI(user_id=user_id)
     return notion_api.update_assignment_page(assignment)
 
@@ -218,96 +282,420 @@ def update_bulk_pages(updates: Dict[Assignment, Any], config: RunnableConfig) ->
         Dictionary containing the results of the update operations
     """
     user_id = get_user_id_from_config(config)
+    if write_behind_enabled(config):
+        queue = get_write_queue()
+        return {name: queue.enqueue(user_id, "update", assignment) for name, assignment in updates.items()}
     notion_api = NotionAPI(user_id=user_id)
     return notion_api.update_assignment_page(updates)
 
 
+@tool
+def sync_assignments(assignments: List[Assignment], dry_run: bool = False, config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Bulk import or re-sync a batch of assignments (e.g. a whole Canvas semester) into Notion.
+    Only assignments that are new or whose content changed are written.
+
+    Args:
+        assignments: List of Assignment dataclass instances to sync
+        dry_run: If True, only report what would be created or updated
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        Report with counts of created/updated/unchanged assignments and per-assignment details
+    """
+    user_id = get_user_id_from_config(config)
+    notion_api = NotionAPI(user_id=user_id)
+    engine = AssignmentSyncEngine(notion_api)
+    return engine.sync(assignments, dry_run=dry_run).to_dict()
+
+
 time_prompt = PromptTemplate.from_template(
     """
-Given an {assignment}, give an Estimated Time of Completion. This should consider the following factors:
-- Due date: {due_date}
-- Description: {description}
-- Current progress: {status}
-- Assignment Notes: {notes}
-
-The time should be in hours and minutes, and should be a rough estimate.
-The output should be a simple string with the time in the format "X hours Y minutes" with some explaination as to why.
-For example:
-"Based on the current progress and the due date, I estimate that it will take approximately 3 hours and 30 minutes to complete this assignment.
-This includes time for research, writing, and editing. Would you like me to create subtasks for this assignment?"
+Give an Estimated Time of Completion for each of the assignments below. Today is {current_date}.
+For each assignment consider the following factors:
+- Due date
+- Description
+- Current progress (status)
+- Assignment Notes
+
+The time should be the remaining work in minutes, and should be a rough estimate.
+Give a one sentence explanation for each estimate, for example:
+"Research, an outline and two drafts with editing; the notes show the research is done."
+
+Return exactly one estimate per assignment, with index set to the assignment's number in the list.
+
+Assignments:
+{assignments}
 """
 )
 
 
 @tool
-def estimate_completion_time(assignment: Assignment = None, config: RunnableConfig = None):
+async def estimate_completion_time(assignment_names: Optional[List[str]] = None, config: RunnableConfig = None):
     """
-    Estimate the time required to complete an assignment based on its details.
+    Estimate the time required to complete assignments based on their details.
+    All assignments are estimated together in a few model calls, and estimates are reused
+    until the assignment's page (its properties or notes) is edited.
+
+    Args:
+        assignment_names: Assignments to estimate (defaults to every assignment that isn't done)
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        List of dicts with assignment, estimated_minutes and explanation
     """
-    pass
+    user_id = get_user_id_from_config(config)
+    notion_api = await asyncio.to_thread(NotionAPI, user_id)
+    if assignment_names:
+        pages, _ = await asyncio.to_thread(resolve_assignment_names, notion_api, assignment_names)
+    else:
+        pages = await asyncio.to_thread(notion_api.query_all_assignment_pages)
+    if pages is None:
+        return [{"error": "Could not load assignments from Notion"}]
+
+    selected = []
+    for page in pages:
+        fields = notion_api.page_fields(page)
+        if assignment_names or fields["status"] not in COMPLETED_STATUSES:
+            selected.append((page, fields))
+    if not selected:
+        return [{"error": f"No matching assignments found: {', '.join(assignment_names or [])}"}]
+
+    estimator = CompletionTimeEstimator(llm, time_prompt)
+    items = [
+        EstimateInput(
+            fields["name"],
+            fields["description"],
+            fields["status"] or "",
+            due_date=fields["due_date"],
+            revision=page_revision(page),
+        )
+        for page, fields in selected
+    ]
+    # Pages unedited since their last estimate need neither their notes nor a new estimate
+    missing = [i for i, item in enumerate(items) if not item.revision or estimator.cache.get(item.key) is None]
+    notes = await asyncio.gather(*(asyncio.to_thread(get_page_content, notion_api, selected[i][0]) for i in missing))
+    for i, text in zip(missing, notes):
+        items[i] = replace(items[i], notes=text)
+    fresh = {i for i in missing if estimator.cache.get(items[i].key) is None}
+    estimates = await estimator.estimate(items, datetime.now().date().isoformat())
+
+    results = []
+    saved = []
+    for i, ((page, fields), estimate) in enumerate(zip(selected, estimates)):
+        if estimate is None:
+            results.append({"assignment": fields["name"], "error": "No estimate returned"})
+            continue
+        results.append(
+            {"assignment": fields["name"], "estimated_minutes": estimate.minutes, "explanation": estimate.explanation}
+        )
+        if i not in fresh:
+            # Saved when it was first computed
+            continue
+        saved.append(
+            {
+                "notion_page_id": page["id"],
+                "title": fields["name"],
+                "description": fields["description"],
+                "due_date": fields["due_date"],
+                "minutes": estimate.minutes,
+            }
+        )
+    await save_estimates(user_id, saved)
+    return results
 
 
 subtask_prompt = PromptTemplate.from_template(
     """
-Break down {assignment} into subtasks considering:
-- Current date: {current_date}
-- Due date: {due_date}
-- Current progress: {status}
-- Description: {description}
-- Assignment Notes: {notes}
+Break down each of the assignments below into subtasks. Current date: {current_date}
+For each assignment consider its due date, current progress, description and notes.
 
-Create NO MORE THAN 5 subtasks that are manageable and specific.
-The Due Dates for the each subtask should be set to some time BEFORE the due date of the assignment, but AFTER the current time.
-Return ONLY a simple list of subtask names, one per line, with no additional formatting.
+Create NO MORE THAN 5 subtasks per assignment that are manageable and specific, in the order they should be done.
+The Due Dates for the each subtask should be set to some time BEFORE the due date of the assignment, but AFTER the current time (YYYY-MM-DD).
+Use the assignment's number in the list as index.
 
 Common subtasks for assignments include:
 - For essays: Research topic, Create outline, Write first draft, Edit draft, Finalize citations
 - For exams: Review lecture notes, Create study guide, Take practice exams, Review weak areas
 - For projects: Research topic, Create project plan, Gather materials, Implementation, Final review
+
+Assignments:
+{assignments}
 """
 )
 
 
 @tool
-def create_subtask_assignment(assignment_dict, config: RunnableConfig):
+async def create_subtask_assignment(
+    parent_assignment_name: str, subtask_name: str, due_date: Optional[str] = None, config: RunnableConfig = None
+) -> Dict[str, Any]:
     """
     Create a subtask assignment in Notion.
+
+    Args:
+        parent_assignment_name: Name of the assignment the subtask belongs to
+        subtask_name: Name of the subtask
+        due_date: Subtask due date (YYYY-MM-DD); must fall before the parent's due date
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        The parent assignment with the created subtask, page ID and due date
     """
-    pass
+    user_id = get_user_id_from_config(config)
+    notion_api = await asyncio.to_thread(NotionAPI, user_id)
+    parent = await asyncio.to_thread(notion_api.find_assignment_page, parent_assignment_name, False)
+    if not parent:
+        return {"error": f"Assignment not found: {parent_assignment_name}"}
+
+    builder = SubtaskTreeBuilder(notion_api)
+    draft = SubtaskDraft(name=subtask_name, due_date=due_date)
+    tree = await asyncio.to_thread(builder.materialize, [parent], [[draft]], datetime.now().date())
+    return tree[0].to_dict()
 
 
 @tool
-def create_subtasks(assignment_dict, config: RunnableConfig):
+async def create_subtasks(assignment_names: List[str], config: RunnableConfig = None) -> List[Dict[str, Any]]:
     """
-    Create subtasks for a given assignment in Notion.
+    Create subtasks for one or more assignments in Notion.
+    All assignments are broken down together, and every subtask page is created in the
+    same step, linked to its parent and course, with due dates before the parent's.
+
+    Args:
+        assignment_names: Names of the assignments to break down
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        One entry per assignment with its subtasks (name, due_date, page_id, success)
     """
-    pass
+    user_id = get_user_id_from_config(config)
+    notion_api = await asyncio.to_thread(NotionAPI, user_id)
+    parents, unmatched = await asyncio.to_thread(resolve_assignment_names, notion_api, assignment_names, False)
+    if parents is None:
+        return [{"error": "Could not load assignments from Notion"}]
+
+    missing = [{"error": f"Assignment not found: {name}"} for name in unmatched]
+    if not parents:
+        return missing
+
+    notes = await asyncio.gather(*(asyncio.to_thread(get_page_content, notion_api, page) for page in parents))
+    today = datetime.now().date()
+    builder = SubtaskTreeBuilder(notion_api, llm, subtask_prompt)
+    try:
+        drafts = await builder.generate(list(zip(parents, notes)), today)
+    except Exception as e:
+        logger.error(f"Error generating subtasks: {e}")
+        return [{"error": f"Could not generate subtasks: {e}"}]
+    tree = await asyncio.to_thread(builder.materialize, parents, drafts, today)
+    return [node.to_dict() for node in tree] + missing
 
 
 @tool
-def smart_schedule(config: RunnableConfig):
+async def smart_schedule(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    strategy: str = "weighted",
+    estimated_minutes: Optional[Dict[str, int]] = None,
+    default_duration_minutes: int = DEFAULT_ASSIGNMENT_MINUTES,
+    config: RunnableConfig = None,
+) -> Dict[str, Any]:
     """
     Created a smart schedule for the user based on their assignments and deadlines.
     This will analyze all assignments, their due dates, and estimated completion times to create a study/work schedule.
     Information will be passed to scheduler agent for further processing.
+
+    Study time is planned in focus sessions (the user's focus session length, with their
+    break length between sessions) inside free calendar time during work hours. Every
+    assignment in the plan gets all of its sessions before it is due.
+
+    Args:
+        start_date: Plan from this time (ISO format, defaults to now)
+        end_date: Plan until this time (ISO format, defaults to two weeks after start_date)
+        strategy: "weighted" keeps high priority assignments when not everything fits,
+            "edf" keeps as many assignments on time as possible
+        estimated_minutes: Study minutes per assignment name; overrides saved estimates
+        default_duration_minutes: Study minutes for assignments never estimated by estimate_completion_time
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        Dictionary with "sessions" (assignment, start, end, minutes, session "n/total"),
+        "unscheduled" assignments with the reason, and "overdue" assignment names
     """
-    # TO DO
-    pass
+    if strategy not in STRATEGIES:
+        return {"error": f"Unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}"}
+
+    user_id = get_user_id_from_config(config)
+    preferences = await scheduling_preferences.get(user_id)
+    time_zone = preferences.timezone if preferences.timezone in pytz.all_timezones_set else "UTC"
+    tz = pytz.timezone(time_zone)
+    start = parse_range_bound(start_date) if start_date else datetime.now(timezone.utc)
+    end = parse_range_bound(end_date) if end_date else start + timedelta(days=SCHEDULE_HORIZON_DAYS)
+
+    notion_api = await asyncio.to_thread(NotionAPI, user_id)
+    pages = await asyncio.to_thread(notion_api.query_all_assignment_pages)
+    if pages is None:
+        return {"error": "Could not load assignments from Notion"}
+
+    estimates = {name.lower(): minutes for name, minutes in (estimated_minutes or {}).items()}
+    saved_estimates = await load_estimates(user_id)
+    tasks = []
+    overdue = []
+    for page in pages:
+        fields = notion_api.page_fields(page)
+        if fields["status"] in COMPLETED_STATUSES:
+            continue
+        due = assignment_due(page, tz) or end
+        if due <= start:
+            overdue.append(fields["name"])
+            continue
+        minutes = estimates.get(fields["name"].lower()) or saved_estimates.get(page["id"], default_duration_minutes)
+        tasks.append(StudyTask(page["id"], fields["name"], due, int(minutes), fields["priority"]))
+
+    result: Dict[str, Any] = {}
+    slots = await find_available_time_slots.ainvoke(
+        {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "duration_minutes": preferences.focus_session_duration_minutes,
+            "within_work_hours": True,
+        },
+        config=config,
+    )
+    if slots and str(slots[0]).startswith("Error"):
+        # Without the calendar, plan against work hours alone
+        result["warning"] = f"Existing calendar events were not considered: {slots[0]}"
+        work_time = find_free_slots(
+            *as_interval_arrays([]),
+            start,
+            end,
+            durations_minutes=[preferences.focus_session_duration_minutes],
+            time_zone=time_zone,
+            work_hours=preferences.work_hours,
+        )[preferences.focus_session_duration_minutes]
+        free = [(slot.start.timestamp(), slot.end.timestamp()) for slot in work_time]
+    else:
+        free = [
+            (parse_range_bound(slot["start"]).timestamp(), parse_range_bound(slot["end"]).timestamp())
+            for slot in slots
+            if isinstance(slot, dict)
+        ]
+    free_starts, free_ends = as_interval_arrays(free)
+
+    plan = plan_study_sessions(
+        tasks,
+        free_starts,
+        free_ends,
+        focus_minutes=preferences.focus_session_duration_minutes,
+        break_minutes=preferences.break_duration_minutes,
+        strategy=strategy,
+        time_zone=time_zone,
+    )
+    result.update(plan.to_dict())
+    result["overdue"] = overdue
+    return result
+
+
+@tool
+async def rank_next_assignments(limit: int = 5, config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Rank the user's open assignments by what to work on next.
+    Use for "what should I work on next?", "what's most urgent?" and similar questions.
+    Scores combine urgency (time left before the due date after the estimated work),
+    priority and estimated effort; no further lookups are needed to answer.
+
+    Args:
+        limit: Number of assignments to return
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        Dictionary with "generated_at" and "assignments" (rank, assignment, status, priority,
+        due, estimated_minutes, hours_left, overdue, score, reason), best first
+    """
+    user_id = get_user_id_from_config(config)
+    preferences = await scheduling_preferences.get(user_id)
+    tz = pytz.timezone(preferences.timezone if preferences.timezone in pytz.all_timezones_set else "UTC")
+    notion_api = await asyncio.to_thread(NotionAPI, user_id)
+    pages, saved_estimates = await asyncio.gather(
+        asyncio.to_thread(notion_api.query_all_assignment_pages), load_estimates(user_id)
+    )
+    if pages is None:
+        return {"error": "Could not load assignments from Notion"}
+
+    assignments = []
+    for page in pages:
+        fields = notion_api.page_fields(page)
+        if fields["status"] in COMPLETED_STATUSES:
+            continue
+        assignments.append(
+            OpenAssignment(
+                page["id"],
+                fields["name"],
+                assignment_due(page, tz),
+                int(saved_estimates.get(page["id"], DEFAULT_ASSIGNMENT_MINUTES)),
+                fields["priority"],
+                fields["status"],
+            )
+        )
+    now = datetime.now(tz)
+    ranked = rank_assignments(assignments, now, limit=max(limit, 1))
+    return {"generated_at": now.isoformat(), "assignments": [item.to_dict() for item in ranked]}
+
+
+@tool
+async def get_course_progress(upcoming_days: int = 7, config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Progress of every course: assignment counts by status, overdue assignments and the
+    load due in the next upcoming_days. Use this for course-level progress questions
+    instead of retrieving assignments course by course.
+
+    Args:
+        upcoming_days: Days ahead counted as upcoming load
+        config: RunnableConfig containing user-specific configuration
+
+    Returns:
+        Dictionary with "courses" (course, total, completed, completion_rate, by_status,
+        overdue, upcoming count/estimated_minutes/assignments) and overall "totals"
+    """
+    user_id = get_user_id_from_config(config)
+    upcoming_days = max(int(upcoming_days), 0)
+    cached = course_dashboards.get(user_id, upcoming_days)
+    if cached is not None:
+        return cached
+
+    preferences = await scheduling_preferences.get(user_id)
+    time_zone = preferences.timezone if preferences.timezone in pytz.all_timezones_set else "UTC"
+    notion_api = await asyncio.to_thread(NotionAPI, user_id)
+    courses, pages, saved_estimates = await asyncio.gather(
+        asyncio.to_thread(notion_api.get_all_course_pages),
+        asyncio.to_thread(notion_api.query_all_assignment_pages),
+        load_estimates(user_id),
+    )
+    if pages is None:
+        return {"error": "Could not load assignments from Notion"}
+
+    now = datetime.now(pytz.timezone(time_zone))
+    dashboard = build_course_dashboard(courses, pages, now, time_zone, saved_estimates, upcoming_days)
+    course_dashboards.put(user_id, upcoming_days, dashboard)
+    return dashboard
 
 
 tools = [
     retrieve_assignment,
     retrieve_assignments,
+    get_assignment_notes,
     get_current_time,
     create_assignment,
     get_course_info,
     get_all_courses,
     update_bulk_pages,
+    sync_assignments,
     parse_relative_datetime,
     update_assignment,
     create_subtasks,
+    create_subtask_assignment,
     estimate_completion_time,
     smart_schedule,
+    rank_next_assignments,
+    get_course_progress,
 ]
 
 project_manager_prompt = """
@@ -330,22 +718,27 @@ You are an agent specialized in managing academic assignments in Notion using OA
 - **`get_current_time`** - Get current date/time in user's timezone
 - **`retrieve_assignment`** - Find ONE specific assignment by exact name
 - **`retrieve_assignments`** - Find MULTIPLE assignments with filters (name, status, priority, due_date, course_name)
+- **`get_assignment_notes`** - Read the notes/content inside ONE assignment's page (checklists, outlines, links)
 - **`get_course_info`** - Get details about a specific course by name
 - **`get_all_courses`** - Get all enrolled courses
 
 #### For Data Creation - Use These Tools:
 - **`create_assignment`** - Create new assignment (requires Assignment dataclass)
-- **`create_subtasks`** - Break down assignment into manageable subtasks
-- **`create_subtask_assignment`** - Create individual subtask as assignment
+- **`create_subtasks`** - Break down one or more assignments into manageable subtasks and create them; pass every assignment in ONE call
+- **`create_subtask_assignment`** - Create individual subtask under an existing assignment
 
 #### For Data Modification - Use These Tools:
 - **`update_assignment`** - Update single assignment properties (requires Assignment dataclass)
 - **`update_bulk_pages`** - Update multiple assignments simultaneously (requires dict of Assignment dataclasses)
+- **`sync_assignments`** - Import or re-sync many assignments at once (e.g. a Canvas semester); skips unchanged ones. Use dry_run=True to preview
 - **`parse_relative_datetime`** - Convert "tomorrow at 5pm" to ISO format
+- If a write tool returns status "queued", the change is saved and syncing to Notion in the background; report it as done. Do NOT retry it or verify it with retrieve_assignment()
 
 #### For Analysis - Use These Tools:
-- **`estimate_completion_time`** - Calculate time needed for assignment completion
-- **`smart_schedule`** - Generate study/work schedule based on all assignments
+- **`estimate_completion_time`** - Calculate time needed for assignment completion. Pass several assignment_names at once (or none for all open assignments) instead of calling it once per assignment
+- **`smart_schedule`** - Generate study/work schedule based on all assignments. It reuses saved estimate_completion_time estimates, so run that first for new assignments; report "unscheduled" assignments to the user
+- **`get_course_progress`** - Per-course counts by status, overdue items and upcoming load in one call; use it instead of retrieve_assignments per course
+- **`rank_next_assignments`** - Answer "what should I work on next?" / "what's most urgent?" in one call; pass its ranked list on as is
 
 ### 3. MANDATORY Tool Usage Patterns
 
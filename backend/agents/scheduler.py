@@ -3,16 +3,57 @@ Google Calendar Scheduler Agent
 Handles calendar operations using Google Calendar API with OAuth authentication
 """
 
+import asyncio
+import json
 import logging
-import httpx
-from typing import Dict, Any, Optional, List, Union
+import re
+import uuid
+import pytz
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from datetime import datetime, timedelta, time as dt_time, timezone as dt_timezone
 from langchain_core.tools import tool
 from langchain_core.runnables import RunnableConfig
 
+try:
+    # Try relative import (for CI/normal backend execution)
+    from services.google_http import BearerAuth, get_google_client
+    from services.calendar_cache import access_token_cache, calendar_metadata_cache, calendar_response_cache
+    from services.calendar_event_store import EVENT_ITEM_FIELDS, is_sync_request, mark_stores_stale, query_events
+    from services.calendar_watch import calendar_watch_registry
+    from services.user_profile import find_availability_sharers, scheduling_preferences
+    from utils.availability import as_interval_arrays, find_free_slots, off_hours, union_sorted_busy
+    from utils.recurrence import expand_recurring_events
+except ImportError:
+    # Fall back to absolute import (for test scripts run from project root)
+    from backend.services.google_http import BearerAuth, get_google_client
+    from backend.services.calendar_cache import access_token_cache, calendar_metadata_cache, calendar_response_cache
+    from backend.services.calendar_event_store import EVENT_ITEM_FIELDS, is_sync_request, mark_stores_stale, query_events
+    from backend.services.calendar_watch import calendar_watch_registry
+    from backend.services.user_profile import find_availability_sharers, scheduling_preferences
+    from backend.utils.availability import as_interval_arrays, find_free_slots, off_hours, union_sorted_busy
+    from backend.utils.recurrence import expand_recurring_events
+
 logger = logging.getLogger(__name__)
 
+CALENDAR_API_PATH = "/calendar/v3"
+CALENDAR_BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+# Google rejects batches with more than 50 sub-requests
+CALENDAR_BATCH_LIMIT = 50
+
+# Multi-calendar fan-out: requests in flight at once, and how long one calendar may take
+CALENDAR_FETCH_CONCURRENCY = 8
+CALENDAR_FETCH_TIMEOUT_SECONDS = 10.0
+
+# events.list page size (Google's default is 250, its maximum 2500) and partial-response mask
+EVENT_PAGE_SIZE = 250
+EVENT_LIST_FIELDS = f"nextPageToken,items({EVENT_ITEM_FIELDS})"
+# singleEvents=False responses also need the series rules and which instance an exception replaces
+RECURRING_LIST_FIELDS = f"nextPageToken,items({EVENT_ITEM_FIELDS},recurrence,originalStartTime)"
+# Ranges at least this long fetch recurring series once and expand them locally
+LOCAL_EXPANSION_MIN_DAYS = 28
+
 
 @dataclass
 class CalendarEvent:
@@ -31,6 +72,56 @@ class CalendarEvent:
     conference_data: Optional[Dict[str, str]] = None
 
 
+@dataclass
+class EventOperation:
+    """
+    One create, update or delete in a bulk calendar change.
+    """
+
+    action: str  # 'create', 'update' or 'delete'
+    calendar_id: str = "primary"
+    event_id: Optional[str] = None  # Required for update and delete
+    event: Optional[CalendarEvent] = None  # Required for create and update
+
+
+@dataclass
+class BatchRequest:
+    """
+    A single Calendar API call packed into a batch request.
+    """
+
+    method: str
+    endpoint: str
+    params: Optional[Dict[str, Any]] = None
+    json_data: Optional[Dict[str, Any]] = None
+
+
+def event_to_body(calendar_event: CalendarEvent) -> Dict[str, Any]:
+    """Convert a CalendarEvent to a Calendar API event resource"""
+    event = {
+        "summary": calendar_event.summary,
+        "location": calendar_event.location,
+        "description": calendar_event.description,
+        "start": calendar_event.start,
+        "end": calendar_event.end,
+        "reminders": calendar_event.reminders,
+    }
+
+    # Add optional fields
+    if calendar_event.recurrence:
+        event["recurrence"] = calendar_event.recurrence
+    if calendar_event.attendees:
+        event["attendees"] = [{"email": attendee} for attendee in calendar_event.attendees]
+    if calendar_event.conference_data:
+        event["conferenceData"] = calendar_event.conference_data
+    return event
+
+
+def get_config_user_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    """Extract the user_id from a RunnableConfig"""
+    return (config or {}).get("configurable", {}).get("user_id")
+
+
 # Helper function to get user's access token from config
 async def get_user_access_token(config: RunnableConfig) -> Optional[str]:
     """
@@ -53,11 +144,17 @@ async def get_user_access_token(config: RunnableConfig) -> Optional[str]:
             logger.error("No user_id found in config")
             return None
 
+        # Reuse the token for the rest of the turn instead of re-reading it per tool call
+        cached_token = access_token_cache.get(user_id)
+        if cached_token:
+            return cached_token
+
         # Get the OAuth service and retrieve token
         oauth_service = GoogleCalendarOAuthService()
         token_data = await oauth_service.get_user_google_token(user_id)
 
         if token_data and "access_token" in token_data:
+            access_token_cache.put(user_id, token_data["access_token"], token_data.get("token_expires_at"))
             return token_data["access_token"]
         else:
             logger.warning(f"No Google Calendar token found for user {user_id}")
@@ -79,6 +176,9 @@ async def call_calendar_api(
     """
     Make an authenticated call to Google Calendar API
 
+    GET responses are cached by ETag per user (see ResponseCache); the returned
+    dict may be shared with later calls and must not be modified.
+
     Args:
         endpoint: API endpoint (e.g., 'calendars/primary')
         access_token: User's access token
@@ -92,35 +192,383 @@ async def call_calendar_api(
     base_url = "https://www.googleapis.com/calendar/v3"
     url = f"{base_url}/{endpoint}"
 
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-    }
+    if method not in ("GET", "POST", "PUT", "DELETE"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
 
-    async with httpx.AsyncClient() as client:
-        if method == "GET":
-            response = await client.get(url, headers=headers, params=params)
-        elif method == "POST":
-            response = await client.post(url, headers=headers, params=params, json=json_data)
-        elif method == "PUT":
-            response = await client.put(url, headers=headers, params=params, json=json_data)
-        elif method == "DELETE":
-            response = await client.delete(url, headers=headers, params=params)
+    client = get_google_client()
+
+    # Repeat reads revalidate with the stored ETag; a 304 reuses the already-parsed body
+    # (event store syncs are never requested twice, so they're not worth caching)
+    if method == "GET" and not is_sync_request(params):
+        scope = calendar_response_cache.scope_for(access_token)
+        etag = calendar_response_cache.etag_for(scope, url, params)
+        response = await client.get(
+            url, params=params, headers={"If-None-Match": etag} if etag else None, auth=BearerAuth(access_token)
+        )
+        if response.status_code == 304 and etag:
+            return calendar_response_cache.not_modified(scope, url, params)
+        response.raise_for_status()
+        body = response.json()
+        calendar_response_cache.store(scope, url, params, response.headers.get("ETag"), body)
+        return body
+
+    response = await client.request(
+        method,
+        url,
+        params=params,
+        json=json_data if method in ("POST", "PUT") else None,
+        auth=BearerAuth(access_token),
+    )
+    response.raise_for_status()
+
+    # DELETE requests may not return JSON
+    if method == "DELETE":
+        return {"status": "deleted", "status_code": response.status_code}
+
+    return response.json()
+
+
+def _encode_batch(requests: List[BatchRequest], boundary: str) -> bytes:
+    parts = []
+    for index, request in enumerate(requests):
+        path = f"{CALENDAR_API_PATH}/{request.endpoint}"
+        if request.params:
+            path += "?" + urlencode(request.params, doseq=True)
+        lines = [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            f"Content-ID: <item{index}>",
+            "",
+            f"{request.method} {path} HTTP/1.1",
+        ]
+        if request.json_data is not None:
+            lines += ["Content-Type: application/json", "", json.dumps(request.json_data)]
         else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+            lines += [""]
+        parts.append("\r\n".join(lines))
+    return ("\r\n".join(parts) + f"\r\n--{boundary}--\r\n").encode("utf-8")
+
+
+def _split_head(text: str) -> Tuple[str, str]:
+    # Parts use CRLF, but tolerate bare LF
+    match = re.search(r"\r?\n\r?\n", text)
+    if not match:
+        return text, ""
+    return text[: match.start()], text[match.end() :]
+
+
+def _decode_batch(content_type: str, body: str, count: int) -> List[Dict[str, Any]]:
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise ValueError(f"Batch response is not multipart: {content_type}")
+    boundary = match.group(1)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    for part in body.split(f"--{boundary}")[1:]:
+        if part.startswith("--"):
+            break
+        part_headers, http_response = _split_head(part.strip("\r\n"))
+        content_id = re.search(r"Content-ID:\s*<response-item(\d+)>", part_headers, re.IGNORECASE)
+        if not content_id:
+            continue
+        index = int(content_id.group(1))
+
+        response_head, response_body = _split_head(http_response)
+        status_code = int(response_head.split("\n", 1)[0].split()[1])
+        response_body = response_body.strip()
+        data = json.loads(response_body) if response_body else None
+
+        if status_code < 400:
+            results[index] = {"status_code": status_code, "data": data, "error": None}
+        else:
+            message = (data or {}).get("error", {}).get("message") if isinstance(data, dict) else None
+            results[index] = {"status_code": status_code, "data": data, "error": message or f"HTTP {status_code}"}
+
+    return [
+        result if result is not None else {"status_code": None, "data": None, "error": "Missing from batch response"}
+        for result in results
+    ]
+
 
+async def call_calendar_batch(requests: List[BatchRequest], access_token: str) -> List[Dict[str, Any]]:
+    """
+    Send several Calendar API calls as multipart/mixed batch requests
+
+    Args:
+        requests: Calls to make; split into batches of CALENDAR_BATCH_LIMIT
+        access_token: User's access token (applies to every sub-request)
+
+    Returns:
+        One {"status_code", "data", "error"} dict per request, in input order.
+        A failed sub-request sets "error" without failing the others.
+    """
+    client = get_google_client()
+
+    async def send(chunk: List[BatchRequest]) -> List[Dict[str, Any]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        response = await client.post(
+            CALENDAR_BATCH_URL,
+            content=_encode_batch(chunk, boundary),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            auth=BearerAuth(access_token),
+        )
         response.raise_for_status()
+        return _decode_batch(response.headers.get("Content-Type", ""), response.text, len(chunk))
+
+    chunks = [requests[i : i + CALENDAR_BATCH_LIMIT] for i in range(0, len(requests), CALENDAR_BATCH_LIMIT)]
+    results: List[Dict[str, Any]] = []
+    for chunk_results in await asyncio.gather(*(send(chunk) for chunk in chunks)):
+        results.extend(chunk_results)
+    return results
+
 
-        # DELETE requests may not return JSON
-        if method == "DELETE":
-            return {"status": "deleted", "status_code": response.status_code}
+async def fetch_calendars(
+    calendar_ids: List[str],
+    fetch: Callable[[str], Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Tuple[str, Any, Optional[str]]]:
+    """
+    Run one request per calendar concurrently
+
+    Args:
+        calendar_ids: Calendars to fetch, in the order results should be returned
+        fetch: Coroutine function taking a calendar ID
+        max_concurrency: Requests in flight at once (defaults to CALENDAR_FETCH_CONCURRENCY)
+        timeout: Seconds allowed per calendar (defaults to CALENDAR_FETCH_TIMEOUT_SECONDS)
+
+    Returns:
+        (calendar_id, result, error) for every calendar in input order; result is
+        None and error is set for calendars that failed or timed out
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or CALENDAR_FETCH_CONCURRENCY)
+    timeout = timeout or CALENDAR_FETCH_TIMEOUT_SECONDS
+
+    async def fetch_one(calendar_id: str) -> Tuple[str, Any, Optional[str]]:
+        async with semaphore:
+            try:
+                return calendar_id, await asyncio.wait_for(fetch(calendar_id), timeout), None
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out fetching calendar {calendar_id} after {timeout}s")
+                return calendar_id, None, f"timed out after {timeout}s"
+            except Exception as e:
+                logger.warning(f"Error fetching calendar {calendar_id}: {str(e)}")
+                return calendar_id, None, str(e)
 
-        return response.json()
+    return await asyncio.gather(*(fetch_one(calendar_id) for calendar_id in calendar_ids))
 
 
 # Tool functions for the scheduler agent
 
 
+async def iter_event_pages(
+    calendar_id: str,
+    access_token: str,
+    params: Dict[str, Any],
+    page_size: int = EVENT_PAGE_SIZE,
+    fields: str = EVENT_LIST_FIELDS,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream a calendar's events page by page, following nextPageToken
+
+    Only the fields in the partial-response mask are requested. The next page is
+    fetched when the caller asks for it, so a caller that stops early saves the requests.
+
+    Args:
+        calendar_id: Google calendar ID
+        access_token: User's access token
+        params: events.list query parameters (timeMin, q, singleEvents, ...)
+        page_size: maxResults per page
+        fields: Partial-response mask
+
+    Yields:
+        Lists of event resources, one per non-empty page
+    """
+    query = {**params, "maxResults": page_size, "fields": fields}
+    while True:
+        result = await call_calendar_api(f"calendars/{calendar_id}/events", access_token, method="GET", params=query)
+        items = result.get("items", [])
+        if items:
+            yield items
+        if not result.get("nextPageToken"):
+            return
+        query["pageToken"] = result["nextPageToken"]
+
+
+def parse_range_bound(value: str) -> datetime:
+    """Parse an ISO range bound, treating naive values as UTC"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt_timezone.utc)
+
+
+async def query_stored_events(
+    calendar_id: str,
+    access_token: str,
+    config: Optional[RunnableConfig],
+    start_date: str,
+    end_date: str,
+    text: Optional[str] = None,
+):
+    """
+    Range query against the local event store for one calendar
+
+    Args:
+        calendar_id: Google calendar ID
+        access_token: User's access token
+        config: Runtime configuration containing user context
+        start_date: Range start (ISO format)
+        end_date: Range end (ISO format)
+        text: Fuzzy search text to filter events by
+
+    Returns:
+        EventRecords ordered by start (or relevance with text), or None if the range can't be served locally
+    """
+    user_id = get_config_user_id(config)
+    if not user_id:
+        return None
+
+    async def resolve_time_zone():
+        # First use of this store: also subscribe to push notifications when a webhook is configured
+        await calendar_watch_registry.ensure_watched(user_id, calendar_id, access_token)
+        return await calendar_metadata_cache.get_timezone(user_id, access_token, calendar_id)
+
+    return await query_events(
+        call_calendar_api,
+        access_token,
+        user_id,
+        calendar_id,
+        parse_range_bound(start_date),
+        parse_range_bound(end_date),
+        resolve_time_zone,
+        text,
+    )
+
+
+async def load_recurring_expanded(
+    calendar_id: str, access_token: str, config: Optional[RunnableConfig], start_date: str, end_date: str
+) -> List[Dict[str, Any]]:
+    """
+    Events of one calendar in a range, expanding recurring series locally
+
+    Fetches with singleEvents=False, so each series arrives once with its rules
+    plus its moved, edited and cancelled instances (showDeleted=True), instead of
+    one resource per instance.
+
+    Args:
+        calendar_id: Google calendar ID
+        access_token: User's access token
+        config: Runtime configuration containing user context
+        start_date: Range start (ISO format)
+        end_date: Range end (ISO format)
+
+    Returns:
+        The events singleEvents=True with orderBy=startTime would return
+    """
+    params = {"timeMin": start_date, "timeMax": end_date, "singleEvents": False, "showDeleted": True}
+    items = []
+    async for page in iter_event_pages(calendar_id, access_token, params, fields=RECURRING_LIST_FIELDS):
+        items.extend(page)
+
+    time_zone = None
+    user_id = get_config_user_id(config)
+    if user_id and any("date" in (item.get("start") or {}) for item in items):
+        # All-day dates are read in the calendar's zone, as Google does for timeMin/timeMax
+        time_zone = await calendar_metadata_cache.get_timezone(user_id, access_token, calendar_id)
+    return expand_recurring_events(items, parse_range_bound(start_date), parse_range_bound(end_date), time_zone)
+
+
+async def load_calendar_events(
+    calendar_id: str,
+    access_token: str,
+    config: Optional[RunnableConfig],
+    start_date: str,
+    end_date: str,
+    expand_locally: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Events of one calendar in a range, from the local store when it covers the range
+
+    Otherwise the events come from events.list. expand_locally chooses who expands
+    recurring events there: True for this process, False for Google, None for this
+    process when the range spans at least LOCAL_EXPANSION_MIN_DAYS. Ranges
+    expanded locally skip the store, which holds Google-expanded instances.
+    """
+    if expand_locally is None:
+        span = parse_range_bound(end_date) - parse_range_bound(start_date)
+        expand_locally = span >= timedelta(days=LOCAL_EXPANSION_MIN_DAYS)
+    if expand_locally:
+        return await load_recurring_expanded(calendar_id, access_token, config, start_date, end_date)
+
+    records = await query_stored_events(calendar_id, access_token, config, start_date, end_date)
+    if records is not None:
+        return [record.to_dict() for record in records]
+
+    params = {"timeMin": start_date, "timeMax": end_date, "singleEvents": True, "orderBy": "startTime"}
+    events = []
+    async for page in iter_event_pages(calendar_id, access_token, params):
+        events.extend(page)
+    return events
+
+
+def events_changed(config: Optional[RunnableConfig]) -> None:
+    """Make the next event query pick up the user's own writes"""
+    user_id = get_config_user_id(config)
+    if user_id:
+        mark_stores_stale(user_id)
+
+
+async def load_busy_intervals(
+    calendar_ids: List[str],
+    access_token: str,
+    config: Optional[RunnableConfig],
+    start_date: str,
+    end_date: str,
+    time_zone: str,
+) -> List[Tuple[float, float]]:
+    """
+    Busy intervals across calendars as (start, end) POSIX timestamps
+
+    Answered from the local event stores when they cover the range, otherwise
+    from the freeBusy endpoint.
+
+    Args:
+        calendar_ids: Calendars to check
+        access_token: User's access token
+        config: Runtime configuration containing user context
+        start_date: Range start (ISO format)
+        end_date: Range end (ISO format)
+        time_zone: Timezone for the freeBusy request
+
+    Returns:
+        Busy intervals, unsorted and possibly overlapping
+    """
+
+    async def fetch(cal_id):
+        return await query_stored_events(cal_id, access_token, config, start_date, end_date)
+
+    busy: Optional[List[Tuple[float, float]]] = []
+    for _, records, error in await fetch_calendars(calendar_ids, fetch):
+        if error or records is None:
+            busy = None
+            break
+        busy.extend((record.start_ts, record.end_ts) for record in records if record.busy)
+    if busy is not None:
+        return busy
+
+    body = {
+        "timeMin": start_date,
+        "timeMax": end_date,
+        "items": [{"id": cal_id} for cal_id in calendar_ids],
+        "timeZone": time_zone,
+    }
+    result = await call_calendar_api("freeBusy", access_token, method="POST", json_data=body)
+    return [
+        (parse_range_bound(interval["start"]).timestamp(), parse_range_bound(interval["end"]).timestamp())
+        for calendar_data in result.get("calendars", {}).values()
+        for interval in calendar_data.get("busy", [])
+    ]
+
+
 @tool
 async def get_calendar_timezone(calendar_id: str = "primary", config: RunnableConfig = None) -> str:
     """
@@ -138,6 +586,11 @@ async def get_calendar_timezone(calendar_id: str = "primary", config: RunnableCo
         if not access_token:
             return "Error: User not authenticated with Google Calendar"
 
+        time_zone = await calendar_metadata_cache.get_timezone(get_config_user_id(config), access_token, calendar_id)
+        if time_zone:
+            return time_zone
+
+        # Calendars outside the user's list (e.g. shared by ID) aren't cached
         result = await call_calendar_api(f"calendars/{calendar_id}", access_token, method="GET")
 
         return result.get("timeZone", "UTC")
@@ -219,12 +672,10 @@ async def get_calendar_mapping(config: RunnableConfig = None) -> Dict[str, str]:
         if not access_token:
             return {"error": "User not authenticated with Google Calendar"}
 
-        result = await call_calendar_api("users/me/calendarList", access_token, method="GET")
-
-        calendars = result.get("items", [])
+        calendars = await calendar_metadata_cache.get_calendars(get_config_user_id(config), access_token)
         calendar_mapping = {}
         for calendar in calendars:
-            calendar_mapping[calendar["summary"]] = calendar["id"]
+            calendar_mapping[calendar.summary] = calendar.id
 
         return calendar_mapping
 
@@ -235,7 +686,11 @@ async def get_calendar_mapping(config: RunnableConfig = None) -> Dict[str, str]:
 
 @tool
 async def get_events(
-    start_date: str, end_date: str, calendar_id: str = "primary", config: RunnableConfig = None
+    start_date: str,
+    end_date: str,
+    calendar_id: str = "primary",
+    expand_recurring_locally: Optional[bool] = None,
+    config: RunnableConfig = None,
 ) -> List[Dict[str, Any]]:
     """
     Gets all events on the user's Google Calendar within a specified time range.
@@ -244,6 +699,8 @@ async def get_events(
         start_date: Start date of the range (ISO format)
         end_date: End date of the range (ISO format)
         calendar_id: ID of the calendar to get events from (or "all" for all calendars)
+        expand_recurring_locally: Fetch each recurring series once and expand it here instead
+            of downloading every instance (default: only for ranges of four weeks or more)
         config: Runtime configuration containing user context
 
     Returns:
@@ -273,30 +730,24 @@ async def get_events(
             if "error" in calendar_map:
                 return [calendar_map]
 
+            async def fetch(cal_id):
+                return await load_calendar_events(cal_id, access_token, config, start_date, end_date, expand_recurring_locally)
+
+            calendar_names = {cal_id: name for name, cal_id in calendar_map.items()}
             all_events = []
-            for cal_id in calendar_map.values():
-                try:
-                    result = await call_calendar_api(
-                        f"calendars/{cal_id}/events",
-                        access_token,
-                        method="GET",
-                        params={"timeMin": start_date, "timeMax": end_date, "singleEvents": True, "orderBy": "startTime"},
-                    )
-                    all_events.extend(result.get("items", []))
-                except Exception:
-                    continue
+            warnings = []
+            for cal_id, result, error in await fetch_calendars(list(calendar_map.values()), fetch):
+                if error:
+                    warnings.append({"warning": f"Could not load calendar '{calendar_names[cal_id]}': {error}"})
+                else:
+                    all_events.extend(result)
 
-            return all_events
+            return all_events + warnings
         else:
-            result = await call_calendar_api(
-                f"calendars/{calendar_id}/events",
-                access_token,
-                method="GET",
-                params={"timeMin": start_date, "timeMax": end_date, "singleEvents": True, "orderBy": "startTime"},
+            return await load_calendar_events(
+                calendar_id, access_token, config, start_date, end_date, expand_recurring_locally
             )
 
-            return result.get("items", [])
-
     except Exception as e:
         logger.error(f"Error getting events: {str(e)}")
         return [{"error": f"Error getting events: {str(e)}"}]
@@ -327,25 +778,11 @@ async def create_event(calendar_event: CalendarEvent, calendar_id: str = "primar
             calendar_event.end["timeZone"] = timezone
 
         # Convert CalendarEvent to dictionary
-        event = {
-            "summary": calendar_event.summary,
-            "location": calendar_event.location,
-            "description": calendar_event.description,
-            "start": calendar_event.start,
-            "end": calendar_event.end,
-            "reminders": calendar_event.reminders,
-        }
-
-        # Add optional fields
-        if calendar_event.recurrence:
-            event["recurrence"] = calendar_event.recurrence
-        if calendar_event.attendees:
-            event["attendees"] = [{"email": attendee} for attendee in calendar_event.attendees]
-        if calendar_event.conference_data:
-            event["conferenceData"] = calendar_event.conference_data
+        event = event_to_body(calendar_event)
 
         # Create the event
         result = await call_calendar_api(f"calendars/{calendar_id}/events", access_token, method="POST", json_data=event)
+        events_changed(config)
 
         return f"Event created: {result.get('htmlLink', 'Success')}"
 
@@ -376,26 +813,13 @@ async def update_event(
             return "Error: User not authenticated with Google Calendar"
 
         # Build updated event
-        updated_event = {
-            "summary": event.summary,
-            "location": event.location,
-            "description": event.description,
-            "start": event.start,
-            "end": event.end,
-            "reminders": event.reminders,
-        }
-
-        if event.recurrence:
-            updated_event["recurrence"] = event.recurrence
-        if event.attendees:
-            updated_event["attendees"] = [{"email": attendee} for attendee in event.attendees]
-        if event.conference_data:
-            updated_event["conferenceData"] = event.conference_data
+        updated_event = event_to_body(event)
 
         # Update the event
         result = await call_calendar_api(
             f"calendars/{calendar_id}/events/{event_id}", access_token, method="PUT", json_data=updated_event
         )
+        events_changed(config)
 
         return f"Event updated: {result.get('htmlLink', 'Success')}"
 
@@ -425,6 +849,9 @@ async def delete_event(
         if not access_token:
             return "Error: User not authenticated with Google Calendar"
 
+        # Whatever happens below, the next query should re-check Google
+        events_changed(config)
+
         # Check if this is a recurring event instance
         if "_" in event_id and any(c.isdigit() for c in event_id.split("_")[1]):
             original_event_id = event_id.split("_")[0]
@@ -435,9 +862,11 @@ async def delete_event(
             else:
                 # Cancel single instance
                 event = await call_calendar_api(f"calendars/{calendar_id}/events/{event_id}", access_token, method="GET")
-                event["status"] = "cancelled"
                 await call_calendar_api(
-                    f"calendars/{calendar_id}/events/{event_id}", access_token, method="PUT", json_data=event
+                    f"calendars/{calendar_id}/events/{event_id}",
+                    access_token,
+                    method="PUT",
+                    json_data={**event, "status": "cancelled"},
                 )
                 return f"Instance of recurring event with ID {event_id} was successfully cancelled."
         else:
@@ -450,6 +879,81 @@ async def delete_event(
         return f"Error deleting event: {str(e)}"
 
 
+@tool
+async def bulk_update_events(operations: List[EventOperation], config: RunnableConfig = None) -> List[Dict[str, Any]]:
+    """
+    Creates, updates and/or deletes many calendar events in one request.
+    Use this instead of repeated create_event/update_event/delete_event calls,
+    e.g. when adding a multi-day study plan.
+
+    Args:
+        operations: List of EventOperation objects (action, calendar_id, event_id, event)
+        config: Runtime configuration containing user context
+
+    Returns:
+        One result per operation, in order, with "success" and either the event
+        ID/link or the error
+    """
+    try:
+        access_token = await get_user_access_token(config)
+        if not access_token:
+            return [{"error": "User not authenticated with Google Calendar"}]
+
+        # Fill in missing timezones once per calendar
+        timezones: Dict[str, str] = {}
+        for operation in operations:
+            if operation.event and "timeZone" not in operation.event.start:
+                if operation.calendar_id not in timezones:
+                    timezones[operation.calendar_id] = await get_calendar_timezone.ainvoke(
+                        {"calendar_id": operation.calendar_id}, config=config
+                    )
+                operation.event.start["timeZone"] = timezones[operation.calendar_id]
+                operation.event.end["timeZone"] = timezones[operation.calendar_id]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+        requests: List[BatchRequest] = []
+        positions: List[int] = []
+        for index, operation in enumerate(operations):
+            events_endpoint = f"calendars/{operation.calendar_id}/events"
+            if operation.action == "create" and operation.event:
+                request = BatchRequest("POST", events_endpoint, json_data=event_to_body(operation.event))
+            elif operation.action == "update" and operation.event and operation.event_id:
+                request = BatchRequest(
+                    "PUT", f"{events_endpoint}/{operation.event_id}", json_data=event_to_body(operation.event)
+                )
+            elif operation.action == "delete" and operation.event_id:
+                request = BatchRequest("DELETE", f"{events_endpoint}/{operation.event_id}")
+            else:
+                results[index] = {
+                    "action": operation.action,
+                    "success": False,
+                    "error": "Invalid operation: create needs an event, update needs event and event_id, delete needs event_id",
+                }
+                continue
+            requests.append(request)
+            positions.append(index)
+
+        responses = await call_calendar_batch(requests, access_token)
+        events_changed(config)
+        for index, response in zip(positions, responses):
+            operation = operations[index]
+            data = response["data"] or {}
+            result = {"action": operation.action, "success": response["error"] is None}
+            if response["error"]:
+                result["error"] = response["error"]
+            else:
+                result["event_id"] = data.get("id", operation.event_id)
+                if data.get("htmlLink"):
+                    result["htmlLink"] = data["htmlLink"]
+            results[index] = result
+
+        return results
+
+    except Exception as e:
+        logger.error(f"Error in bulk event update: {str(e)}")
+        return [{"error": f"Error in bulk event update: {str(e)}"}]
+
+
 @tool
 async def find_event(
     event_name: str, time_min: Optional[str] = None, time_max: Optional[str] = None, config: RunnableConfig = None
@@ -458,38 +962,43 @@ async def find_event(
     Finds events matching the specified name or keywords.
 
     Args:
-        event_name: Name of the event or keywords to search for
+        event_name: Name of the event or keywords to search for (typos are tolerated)
         time_min: Start time of the range (defaults to current time)
         time_max: End time of the range (defaults to one week from now)
         config: Runtime configuration containing user context
 
     Returns:
-        List of matching events
+        List of matching events, best match first within each calendar
     """
     try:
         access_token = await get_user_access_token(config)
         if not access_token:
             return [{"error": "User not authenticated with Google Calendar"}]
 
-        if time_min is None:
-            time_min = datetime.now().isoformat()
-        if time_max is None:
-            time_max = (datetime.now() + timedelta(days=7)).isoformat()
+        now = datetime.now(dt_timezone.utc)
+        time_min = parse_range_bound(time_min).isoformat() if time_min else now.isoformat()
+        time_max = parse_range_bound(time_max).isoformat() if time_max else (now + timedelta(days=7)).isoformat()
 
         # Get all calendars
         calendar_map = await get_calendar_mapping.ainvoke({}, config=config)
         if "error" in calendar_map:
             return [calendar_map]
 
+        async def fetch(cal_id):
+            # Search the local index first; only a miss goes to Google's full-text search
+            records = await query_stored_events(cal_id, access_token, config, time_min, time_max, text=event_name)
+            if records:
+                return [record.to_dict() for record in records]
+            events = []
+            params = {"q": event_name, "timeMin": time_min, "timeMax": time_max, "singleEvents": True}
+            async for page in iter_event_pages(cal_id, access_token, params):
+                events.extend(page)
+            return events
+
         matched_events = []
-        for cal_id in calendar_map.values():
-            try:
-                result = await call_calendar_api(
-                    f"calendars/{cal_id}/events", access_token, method="GET", params={"q": event_name}
-                )
-                matched_events.extend(result.get("items", []))
-            except Exception:
-                continue
+        for _, result, error in await fetch_calendars(list(calendar_map.values()), fetch):
+            if not error:
+                matched_events.extend(result)
 
         if not matched_events:
             return [{"message": f"No events matching '{event_name}' found."}]
@@ -503,8 +1012,17 @@ async def find_event(
 
 @tool
 async def find_available_time_slots(
-    start_date: str, end_date: str, duration_minutes: int = 60, exclude_early: bool = False, config: RunnableConfig = None
-) -> List[str]:
+    start_date: str,
+    end_date: str,
+    duration_minutes: int = 60,
+    exclude_early: bool = False,
+    durations_minutes: Optional[List[int]] = None,
+    within_work_hours: bool = False,
+    min_gap_minutes: Optional[int] = None,
+    top_k: Optional[int] = None,
+    rank: str = "earliest",
+    config: RunnableConfig = None,
+) -> List[Union[Dict[str, Any], str]]:
     """
     Finds available time slots in the user's calendar.
 
@@ -513,10 +1031,16 @@ async def find_available_time_slots(
         end_date: End date in ISO format
         duration_minutes: Minimum duration needed for the slot in minutes
         exclude_early: Whether to exclude hours between 12:00 AM and 6:00 AM
+        durations_minutes: Several candidate durations to check at once (overrides duration_minutes)
+        within_work_hours: Only return slots inside the user's configured work hours
+        min_gap_minutes: Free buffer to keep around existing events (defaults to the user's break duration)
+        top_k: Return at most this many slots per duration
+        rank: "earliest" (default), "longest" free window first, or "tightest" fit first
         config: Runtime configuration containing user context
 
     Returns:
-        List of available time slots
+        List of slots with start, end (ISO, user's timezone), duration_minutes,
+        free_minutes and a readable label
     """
     try:
         access_token = await get_user_access_token(config)
@@ -543,101 +1067,205 @@ async def find_available_time_slots(
 
         calendar_ids = list(calendar_map.values())
 
-        # Get user timezone
-        user_timezone = await get_calendar_timezone.ainvoke({"calendar_id": "primary"}, config=config)
-
-        # Query freebusy
-        body = {
-            "timeMin": start_date,
-            "timeMax": end_date,
-            "items": [{"id": cal_id} for cal_id in calendar_ids],
-            "timeZone": user_timezone,
-        }
-
-        result = await call_calendar_api("freeBusy", access_token, method="POST", json_data=body)
-
-        # Process busy slots
-        busy_slots = []
-
-        if exclude_early:
-            # Add 12 AM - 6 AM slots for each day
-            start_dt = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-            end_dt = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-            current_day = datetime(start_dt.year, start_dt.month, start_dt.day, tzinfo=start_dt.tzinfo)
-            end_day = datetime(end_dt.year, end_dt.month, end_dt.day, tzinfo=end_dt.tzinfo) + timedelta(days=1)
-
-            while current_day < end_day:
-                busy_slots.append({"start": current_day.isoformat(), "end": (current_day + timedelta(hours=6)).isoformat()})
-                current_day += timedelta(days=1)
-
-        # Add busy slots from calendars
-        for calendar_id, calendar_data in result.get("calendars", {}).items():
-            busy_slots.extend(calendar_data.get("busy", []))
-
-        # Sort and merge overlapping slots
-        busy_slots.sort(key=lambda x: x["start"])
-
-        if busy_slots:
-            merged_slots = []
-            current_slot = {
-                "start": datetime.fromisoformat(busy_slots[0]["start"].replace("Z", "+00:00")),
-                "end": datetime.fromisoformat(busy_slots[0]["end"].replace("Z", "+00:00")),
-            }
-
-            for busy in busy_slots[1:]:
-                busy_start = datetime.fromisoformat(busy["start"].replace("Z", "+00:00"))
-                busy_end = datetime.fromisoformat(busy["end"].replace("Z", "+00:00"))
-
-                if busy_start <= current_slot["end"]:
-                    current_slot["end"] = max(current_slot["end"], busy_end)
-                else:
-                    merged_slots.append(current_slot)
-                    current_slot = {"start": busy_start, "end": busy_end}
-
-            merged_slots.append(current_slot)
-            busy_slots = merged_slots
+        # Profile timezone when the user set one, otherwise the primary calendar's
+        preferences = await scheduling_preferences.get(get_config_user_id(config))
+        user_timezone = preferences.timezone
+        if user_timezone == "UTC" or user_timezone not in pytz.all_timezones_set:
+            user_timezone = await get_calendar_timezone.ainvoke({"calendar_id": "primary"}, config=config)
+        if user_timezone not in pytz.all_timezones_set:
+            user_timezone = "UTC"
+
+        busy = await load_busy_intervals(calendar_ids, access_token, config, start_date, end_date, user_timezone)
+        busy_starts, busy_ends = as_interval_arrays(busy)
+
+        if within_work_hours:
+            work_hours = preferences.work_hours
+        elif exclude_early:
+            # Block 12 AM - 6 AM: a "working day" from 6 AM to midnight
+            work_hours = (dt_time(6, 0), dt_time(0, 0))
         else:
-            busy_slots = []
-
-        # Find free slots
-        available_slots = []
-        current_time = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
-        end_time = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-
-        for busy in busy_slots:
-            busy_start = (
-                busy["start"]
-                if isinstance(busy["start"], datetime)
-                else datetime.fromisoformat(busy["start"].replace("Z", "+00:00"))
-            )
-            busy_end = (
-                busy["end"]
-                if isinstance(busy["end"], datetime)
-                else datetime.fromisoformat(busy["end"].replace("Z", "+00:00"))
-            )
+            work_hours = None
+
+        durations = durations_minutes or [duration_minutes]
+        slots = find_free_slots(
+            busy_starts,
+            busy_ends,
+            parse_range_bound(start_date),
+            parse_range_bound(end_date),
+            durations_minutes=durations,
+            time_zone=user_timezone,
+            work_hours=work_hours,
+            min_gap_minutes=preferences.break_duration_minutes if min_gap_minutes is None else min_gap_minutes,
+            top_k=top_k,
+            rank=rank,
+        )
 
-            if busy_start > current_time:
-                slot_duration = (busy_start - current_time).total_seconds() / 60
-                if slot_duration >= duration_minutes:
-                    available_slots.append(
-                        f"Available from {current_time.strftime('%A, %b %d, %I:%M %p')} "
-                        f"to {busy_start.strftime('%A, %b %d, %I:%M %p')}"
-                    )
+        available_slots = [slot.to_dict() for duration in durations for slot in slots[duration]]
+        return available_slots if available_slots else ["No available slots found that match your criteria."]
 
-            current_time = max(current_time, busy_end)
+    except Exception as e:
+        logger.error(f"Error finding available time slots: {str(e)}")
+        return [f"Error finding available time slots: {str(e)}"]
+
+
+async def compute_common_availability(
+    user_ids: List[str],
+    start_date: str,
+    end_date: str,
+    durations_minutes: List[int],
+    time_zone: str = "UTC",
+    within_work_hours: bool = False,
+    min_gap_minutes: int = 0,
+    top_k: Optional[int] = 5,
+    rank: str = "earliest",
+) -> Dict[str, Any]:
+    """
+    Find times when every participant is free
 
-        # Check remaining time after last busy slot
-        if (end_time - current_time).total_seconds() / 60 >= duration_minutes:
-            available_slots.append(
-                f"Available from {current_time.strftime('%A, %b %d, %I:%M %p')} "
-                f"to {end_time.strftime('%A, %b %d, %I:%M %p')}"
+    Each participant's busy time is loaded concurrently with their own token
+    (from their event store, or freeBusy), and the sorted busy lists are
+    combined with a k-way merge before taking the complement.
+
+    Args:
+        user_ids: FlowState user IDs of the participants
+        start_date: Range start (ISO format, with offset)
+        end_date: Range end (ISO format, with offset)
+        durations_minutes: Candidate meeting lengths
+        time_zone: Timezone the slots are reported in
+        within_work_hours: Only keep times inside every participant's work hours
+        min_gap_minutes: Free buffer to keep around everyone's events
+        top_k: At most this many slots per duration
+        rank: "earliest", "longest" or "tightest"
+
+    Returns:
+        Dict with "slots" (structured, as find_available_time_slots returns),
+        "participants" (users included) and "unavailable" (users whose calendars
+        couldn't be read, with the reason)
+    """
+    window_start, window_end = parse_range_bound(start_date), parse_range_bound(end_date)
+
+    async def fetch_busy(user_id: str) -> List[Tuple[float, float]]:
+        user_config = {"configurable": {"user_id": user_id}}
+        access_token = await get_user_access_token(user_config)
+        if not access_token:
+            raise RuntimeError("Google Calendar is not connected")
+        calendars = await calendar_metadata_cache.get_calendars(user_id, access_token)
+        busy = await load_busy_intervals(
+            [calendar.id for calendar in calendars], access_token, user_config, start_date, end_date, "UTC"
+        )
+        if within_work_hours:
+            preferences = await scheduling_preferences.get(user_id)
+            blocked_starts, blocked_ends = off_hours(
+                window_start.timestamp(), window_end.timestamp(), preferences.timezone, *preferences.work_hours
             )
+            busy.extend(zip(blocked_starts.tolist(), blocked_ends.tolist()))
+        busy.sort()
+        return busy
+
+    busy_by_participant = []
+    participants = []
+    unavailable = []
+    for user_id, busy, error in await fetch_calendars(user_ids, fetch_busy):
+        if error:
+            unavailable.append({"user_id": user_id, "error": error})
+        else:
+            participants.append(user_id)
+            busy_by_participant.append(busy)
+
+    busy_starts, busy_ends = union_sorted_busy(busy_by_participant)
+    slots = find_free_slots(
+        busy_starts,
+        busy_ends,
+        window_start,
+        window_end,
+        durations_minutes=durations_minutes,
+        time_zone=time_zone,
+        min_gap_minutes=min_gap_minutes,
+        top_k=top_k,
+        rank=rank,
+    )
+    return {
+        "slots": [slot.to_dict() for duration in durations_minutes for slot in slots[duration]],
+        "participants": participants,
+        "unavailable": unavailable,
+    }
 
-        return available_slots if available_slots else ["No available slots found that match your criteria."]
+
+@tool
+async def find_common_availability(
+    participant_emails: List[str],
+    start_date: str,
+    end_date: str,
+    duration_minutes: int = 60,
+    durations_minutes: Optional[List[int]] = None,
+    within_work_hours: bool = False,
+    min_gap_minutes: int = 0,
+    top_k: Optional[int] = 5,
+    rank: str = "earliest",
+    config: RunnableConfig = None,
+) -> Dict[str, Any]:
+    """
+    Finds times that work for the user and other FlowState users, in one call.
+
+    Only users who share their availability with the user are included. Everyone
+    else, whether unregistered, not sharing or with an unreadable calendar, is
+    listed under "unavailable" without a reason.
+
+    Args:
+        participant_emails: Email addresses of the other FlowState users
+        start_date: Start of the range (ISO format)
+        end_date: End of the range (ISO format)
+        duration_minutes: Meeting length in minutes
+        durations_minutes: Several candidate lengths to check at once (overrides duration_minutes)
+        within_work_hours: Only suggest times inside everyone's work hours
+        min_gap_minutes: Free buffer to keep around everyone's events
+        top_k: Maximum number of slots per duration
+        rank: "earliest" (default), "longest" free window first, or "tightest" fit first
+        config: Runtime configuration containing user context
+
+    Returns:
+        Common slots, the participant emails included, and the emails left out
+    """
+    try:
+        user_id = get_config_user_id(config)
+        if not user_id:
+            return {"error": "User not authenticated"}
+
+        sharers = await find_availability_sharers(participant_emails, user_id)
+        emails_by_id = {pid: email for email, pid in sharers.items() if pid and pid != user_id}
+        user_ids = [user_id, *emails_by_id]
+
+        preferences = await scheduling_preferences.get(user_id)
+        time_zone = preferences.timezone if preferences.timezone in pytz.all_timezones_set else "UTC"
+
+        def with_offset(date_str: str) -> str:
+            # Dates without an offset are in the user's timezone
+            value = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            if value.tzinfo is None:
+                value = pytz.timezone(time_zone).localize(value)
+            return value.isoformat()
+
+        result = await compute_common_availability(
+            user_ids,
+            with_offset(start_date),
+            with_offset(end_date),
+            durations_minutes or [duration_minutes],
+            time_zone=time_zone,
+            within_work_hours=within_work_hours,
+            min_gap_minutes=min_gap_minutes,
+            top_k=top_k,
+            rank=rank,
+        )
+        failed = {entry["user_id"]: entry["error"] for entry in result["unavailable"]}
+        if user_id in failed:
+            return {"error": f"Could not read your calendar: {failed[user_id]}"}
+        result["participants"] = [emails_by_id[pid] for pid in result["participants"] if pid != user_id]
+        result["unavailable"] = [email for email, pid in sharers.items() if pid != user_id and (pid is None or pid in failed)]
+        return result
 
     except Exception as e:
-        logger.error(f"Error finding available time slots: {str(e)}")
-        return [f"Error finding available time slots: {str(e)}"]
+        logger.error(f"Error finding common availability: {str(e)}")
+        return {"error": f"Error finding common availability: {str(e)}"}
 
 
 @tool
@@ -685,7 +1313,9 @@ tools = [
     get_relative_time,
     update_event,
     delete_event,
+    bulk_update_events,
     find_available_time_slots,
+    find_common_availability,
     validate_date_day_mapping,
 ]
 
@@ -718,7 +1348,8 @@ You are an agent specialized in managing academic schedules in Google Calendar.
 - Updating event properties (time, location, description)
 - Deleting or canceling events
 - Setting up event reminders
-- Finding available time slots for new events
+- Finding available time slots for new events (find_available_time_slots already applies the user's work hours when within_work_hours=True, keeps their break duration around existing events, and can check several durations and rank slots in one call)
+- Creating, moving or removing several events at once (e.g. a multi-day study plan) with bulk_update_events in a single call
 
 ## Critical Date Handling Requirements
 - Always validate date-day mappings before calendar operations
@@ -734,6 +1365,7 @@ You are an agent specialized in managing academic schedules in Google Calendar.
 - "Move my advisor meeting to 2pm" - Find meeting event and update its time
 - "Am I free next Tuesday afternoon?" - Check availability for specified time
 - "When can I schedule a 2-hour meeting this week?" - Find available time slots
+- "When are Sam and Priya free to study together?" - find_common_availability with their emails
 - "Delete my study group meeting" - Find and remove specified event
 
 ## Error Handling
@@ -23,6 +23,7 @@ from langgraph.prebuilt import ToolNode, tools_condition
 from agents.project_manager import (
     tools as project_management_tools,
     project_manager_prompt,
+    rank_next_assignments,
 )
 from agents.scheduler import (
     tools as scheduler_tools,
@@ -58,6 +59,7 @@ from langgraph_supervisor.handoff import create_forward_message_tool
 from langgraph.graph.message import add_messages
 
 import agents.configuration as configuration
+from services.notion_write_queue import format_failure_notice, get_write_queue, write_behind_enabled
 
 ## Utilities
 
@@ -303,6 +305,7 @@ AVAILABLE AGENTS:
 AGENT ROUTING RULES:
 - For calendar viewing, event creation/modification, availability checks, or scheduling → use Scheduler-Handoff-Tool
 - For assignments, tasks, exams, projects, Notion operations, subtasks, progress updates, or time estimates → use Project-Management-Handoff-Tool
+- For "what should I work on next?", "what's most urgent?" and similar → call rank_next_assignments yourself, then pass its ranked list to the Response Agent (no PMAgent handoff needed)
 - After gathering ALL necessary information from sub-agents → ALWAYS use Response-Agent-Handoff-Tool (MANDATORY FINAL STEP)
 
 You have access to long-term memory tracking the user's profile:
@@ -509,6 +512,7 @@ orchestrator_agent = create_supervisor(
         scheduler_handoff,
         project_manager_handoff,
         response_agent_handoff,
+        rank_next_assignments,
     ],
     output_mode="full_history",
     supervisor_name="Orchestrator Supervisor",
@@ -573,6 +577,20 @@ def update_user_instructions(
 app = orchestrator_agent.compile(name="Orchestrator Supervisor")
 
 
+def build_initial_state(user_input: str, config: dict) -> dict:
+    """Create the graph input for a turn, including any background Notion writes that failed since the last turn"""
+    content = user_input
+    if write_behind_enabled(config):
+        try:
+            user_id = configuration.Configuration.from_runnable_config(config).user_id
+            notice = format_failure_notice(get_write_queue().pop_failures(user_id))
+            if notice:
+                content = f"{user_input}\n\n{notice}"
+        except Exception as e:
+            print(f"Could not check Notion write queue: {e}")
+    return {"messages": [HumanMessage(content=content)]}
+
+
 async def stream_response(user_input: str, config: dict):
     """Stream agent steps and tool calls for AgentLoadingCard"""
 
@@ -580,7 +598,7 @@ async def stream_response(user_input: str, config: dict):
 
     try:
         # Create the initial state
-        initial_state = {"messages": [HumanMessage(content=user_input)]}
+        initial_state = build_initial_state(user_input, config)
 
         # Stream with updates mode and include subgraphs
         async for chunk in app.astream(
@@ -800,7 +818,7 @@ async def stream_events(user_input: str, config: dict):
     """Stream detailed events from the supervisor agent for debugging"""
 
     try:
-        initial_state = {"messages": [HumanMessage(content=user_input)]}
+        initial_state = build_initial_state(user_input, config)
 
         async for event in app.astream_events(initial_state, config=config, version="v2"):
             try:
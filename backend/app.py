@@ -8,7 +8,7 @@ from typing import Dict, List, Any, Optional
 from langchain_core.messages import HumanMessage
 from langgraph.store.memory import InMemoryStore
 from fastapi.responses import StreamingResponse
-from agents.supervisor import stream_response, stream_events
+from agents.supervisor import stream_response, stream_events, build_initial_state
 
 # Import your compiled agent
 try:
@@ -80,6 +80,50 @@ async def startup_db_client():
         # Don't raise the exception - let the app continue without database
         pass
 
+    # Open the pooled Google client up front so the first calendar call skips pool setup
+    from services.google_http import get_google_client
+
+    get_google_client()
+
+    # Drain Notion writes queued before a restart
+    from services.notion_write_queue import get_write_queue, write_behind_enabled
+
+    if write_behind_enabled():
+        get_write_queue().start()
+
+    # Keep Google Calendar push channels alive
+    from services.calendar_watch import calendar_watch_registry
+
+    if calendar_watch_registry.enabled:
+        from agents.scheduler import get_user_access_token
+
+        async def token_for(user_id):
+            return await get_user_access_token({"configurable": {"user_id": user_id}})
+
+        calendar_watch_registry.start(token_for)
+
+
+@app.on_event("shutdown")
+async def shutdown_write_queue():
+    from services.notion_write_queue import get_write_queue, write_behind_enabled
+
+    if write_behind_enabled():
+        get_write_queue().stop()
+
+
+@app.on_event("shutdown")
+async def stop_calendar_watch_renewal():
+    from services.calendar_watch import calendar_watch_registry
+
+    await calendar_watch_registry.stop()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    from services.google_http import close_google_clients
+
+    await close_google_clients()
+
 
 class Token(BaseModel):
     access_token: str
@@ -415,6 +459,65 @@ async def google_calendar_status(current_user=Depends(get_current_user_dependenc
         return {"connected": False, "token_valid": False, "error": str(e)}
 
 
+class CommonAvailabilityRequest(BaseModel):
+    participant_emails: List[EmailStr]
+    start_date: str
+    end_date: str
+    duration_minutes: int = 60
+    durations_minutes: Optional[List[int]] = None
+    within_work_hours: bool = False
+    min_gap_minutes: int = 0
+    top_k: Optional[int] = 5
+    rank: str = "earliest"
+
+
+@app.post("/api/calendar/common-availability")
+async def common_availability(request: CommonAvailabilityRequest, current_user=Depends(get_current_user_dependency)):
+    """Find times when the current user and the given FlowState users who share their availability are all free"""
+    from agents.scheduler import find_common_availability
+
+    result = await find_common_availability.ainvoke(
+        request.model_dump(), config={"configurable": {"user_id": current_user.id}}
+    )
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@app.get("/api/assignments/next")
+async def next_assignments(limit: int = 5, current_user=Depends(get_current_user_dependency)):
+    """Rank the current user's open assignments by what to work on next"""
+    from agents.project_manager import rank_next_assignments
+
+    result = await rank_next_assignments.ainvoke({"limit": limit}, config={"configurable": {"user_id": current_user.id}})
+    if "error" in result:
+        raise HTTPException(status_code=502, detail=result["error"])
+    return result
+
+
+@app.get("/api/courses/progress")
+async def course_progress(upcoming_days: int = 7, current_user=Depends(get_current_user_dependency)):
+    """Per-course assignment progress, overdue items and upcoming load for the current user"""
+    from agents.project_manager import get_course_progress
+
+    result = await get_course_progress.ainvoke(
+        {"upcoming_days": upcoming_days}, config={"configurable": {"user_id": current_user.id}}
+    )
+    if "error" in result:
+        raise HTTPException(status_code=502, detail=result["error"])
+    return result
+
+
+@app.post("/api/webhooks/google-calendar")
+async def google_calendar_notification(request: Request):
+    """Receive Google Calendar events.watch notifications (called by Google, authenticated by channel token)"""
+    from services.calendar_watch import calendar_watch_registry
+
+    if not calendar_watch_registry.handle_notification(request.headers):
+        raise HTTPException(status_code=404, detail="Unknown channel")
+    return {"status": "ok"}
+
+
 @app.post("/debug-agent")
 async def debug_agent(current_user=Depends(get_current_user_dependency)):
     try:
@@ -468,9 +571,6 @@ async def chat(request: ChatRequest, current_user=Depends(get_current_user_depen
             )
 
         try:
-            # Prepare the state with the user message
-            state = {"messages": [HumanMessage(content=request.message)]}
-
             # Create configuration for LangGraph - FIXED: Include thread_id
             config = {
                 "configurable": {
@@ -481,6 +581,9 @@ async def chat(request: ChatRequest, current_user=Depends(get_current_user_depen
                 "store": memory_store,
             }
 
+            # Prepare the state with the user message (and any failed background Notion writes)
+            state = build_initial_state(request.message, config)
+
             print(f"Invoking agent with state: {state}")
             print(f"Config: {config}")
 
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: numpy availability engine vs. the previous inline merge loop
+
+Usage:
+    python benchmarks/bench_availability.py
+    python benchmarks/bench_availability.py --intervals 10000 --repeat 20
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.availability import as_interval_arrays, find_free_slots
+
+WINDOW_START = datetime(2025, 9, 1, tzinfo=timezone.utc)
+WINDOW_END = WINDOW_START + timedelta(days=365)
+
+
+def make_busy(count: int, seed: int = 1):
+    """freeBusy-style busy intervals spread over a year, 15 minutes to 3 hours long"""
+    rng = random.Random(seed)
+    busy = []
+    for _ in range(count):
+        start = WINDOW_START + timedelta(minutes=15 * rng.randrange(0, 35_000))
+        busy.append({"start": start.isoformat(), "end": (start + timedelta(minutes=15 * rng.randint(1, 12))).isoformat()})
+    return busy
+
+
+def inline_free_slots(busy_slots, duration_minutes):
+    """The merge/complement loop find_available_time_slots used to run on freeBusy strings."""
+    busy_slots = sorted(busy_slots, key=lambda x: x["start"])
+    merged = []
+    current = {"start": datetime.fromisoformat(busy_slots[0]["start"]), "end": datetime.fromisoformat(busy_slots[0]["end"])}
+    for busy in busy_slots[1:]:
+        busy_start = datetime.fromisoformat(busy["start"])
+        busy_end = datetime.fromisoformat(busy["end"])
+        if busy_start <= current["end"]:
+            current["end"] = max(current["end"], busy_end)
+        else:
+            merged.append(current)
+            current = {"start": busy_start, "end": busy_end}
+    merged.append(current)
+
+    available = []
+    current_time = WINDOW_START
+    for busy in merged:
+        if busy["start"] > current_time and (busy["start"] - current_time).total_seconds() / 60 >= duration_minutes:
+            available.append((current_time, busy["start"]))
+        current_time = max(current_time, busy["end"])
+    if (WINDOW_END - current_time).total_seconds() / 60 >= duration_minutes:
+        available.append((current_time, WINDOW_END))
+    return available
+
+
+def engine_free_slots(busy_slots, duration_minutes):
+    starts, ends = as_interval_arrays(
+        (datetime.fromisoformat(b["start"]).timestamp(), datetime.fromisoformat(b["end"]).timestamp()) for b in busy_slots
+    )
+    return find_free_slots(starts, ends, WINDOW_START, WINDOW_END, durations_minutes=[duration_minutes])[duration_minutes]
+
+
+def engine_from_timestamps(starts, ends, durations):
+    """What the scheduler runs when the event store already holds timestamps."""
+    return find_free_slots(starts, ends, WINDOW_START, WINDOW_END, durations_minutes=durations, top_k=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--intervals", type=int, default=10_000, help="busy intervals in the window")
+    parser.add_argument("--repeat", type=int, default=10, help="calls per measurement")
+    args = parser.parse_args()
+
+    busy = make_busy(args.intervals)
+    expected = [(start.timestamp(), end.timestamp()) for start, end in inline_free_slots(busy, 60)]
+    actual = [(slot.start.timestamp(), slot.end.timestamp()) for slot in engine_free_slots(busy, 60)]
+    assert actual == expected
+
+    starts, ends = as_interval_arrays(
+        (datetime.fromisoformat(b["start"]).timestamp(), datetime.fromisoformat(b["end"]).timestamp()) for b in busy
+    )
+    cases = (
+        ("inline loop, ISO strings", lambda: inline_free_slots(busy, 60)),
+        ("engine, ISO strings", lambda: engine_free_slots(busy, 60)),
+        ("engine, timestamps", lambda: engine_from_timestamps(starts, ends, [60])),
+        ("engine, 3 durations", lambda: engine_from_timestamps(starts, ends, [30, 60, 120])),
+    )
+
+    print(f"{args.intervals} busy intervals over {(WINDOW_END - WINDOW_START).days} days")
+    print(f"{'case':<28}{'ms':>10}")
+    for label, run in cases:
+        best = min(timeit.repeat(run, number=args.repeat, repeat=3))
+        print(f"{label:<28}{best / args.repeat * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
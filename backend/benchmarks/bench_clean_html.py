@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: streaming HTML cleaner vs. the BeautifulSoup implementation
+
+Usage:
+    python benchmarks/bench_clean_html.py
+    python benchmarks/bench_clean_html.py --repeat 2000
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.html_text import html_to_text
+
+SHORT = "<p>Read <strong>Chapter 4</strong> and answer the questions&nbsp;below.</p>"
+
+MEDIUM = (
+    '<div class="description user_content"><h2>Lab 3 &ndash; Kinematics</h2>'
+    "<p>Submit your write-up as a PDF. Late penalty: 10%/day.</p>"
+    "<ol>" + "".join(f"<li>Question {i}: explain the result &amp; show work.</li>" for i in range(12)) + "</ol>"
+    '<p><a href="https://canvas.example.edu/courses/1/files/2?wrap=1" target="_blank">Lab handout</a></p></div>'
+)
+
+# Bulk imports often carry pasted syllabi far past Notion's 2000 character limit
+LONG = (
+    "<div>"
+    + "".join(
+        f'<p style="margin:0">Week {i}: <em>reading</em> &mdash; pages {i * 10}&ndash;{i * 10 + 9}. '
+        f'<a href="/files/{i}">Slides</a><br/>Discussion prompt &#8220;{i}&#8221;.</p>'
+        for i in range(400)
+    )
+    + "</div>"
+)
+
+
+def beautifulsoup_clean_html(html_content: str) -> str:
+    """The previous NotionAPI.clean_html implementation."""
+    text = BeautifulSoup(html_content, "html.parser").get_text()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text[:2000]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="calls per measurement")
+    args = parser.parse_args()
+
+    print(f"{'input':<8}{'chars':>8}{'bs4 µs':>12}{'stream µs':>12}{'speedup':>10}")
+    for label, html_content in (("short", SHORT), ("medium", MEDIUM), ("long", LONG)):
+        assert html_to_text(html_content) == beautifulsoup_clean_html(html_content)
+        old = min(timeit.repeat(lambda: beautifulsoup_clean_html(html_content), number=args.repeat, repeat=3))
+        new = min(timeit.repeat(lambda: html_to_text(html_content), number=args.repeat, repeat=3))
+        old_us = old / args.repeat * 1e6
+        new_us = new / args.repeat * 1e6
+        print(f"{label:<8}{len(html_content):>8}{old_us:>12.1f}{new_us:>12.1f}{old_us / new_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
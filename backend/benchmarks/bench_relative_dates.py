@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: relative date parsing, fast path against dateparser, and import time
+
+Usage:
+    python benchmarks/bench_relative_dates.py
+    python benchmarks/bench_relative_dates.py --repeat 2000
+"""
+
+import argparse
+import subprocess
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.relative_dates import parse_fast, parse_relative_date, plan_phrase
+
+BASE = datetime(2025, 9, 3, 14, 30, 15)
+PHRASES = ["today", "tomorrow at 5pm", "next Monday at 3pm", "Friday", "in 3 days", "at 9:30am", "2025-10-01"]
+BACKEND = Path(__file__).parent.parent
+
+
+def import_seconds(module: str, runs: int = 5) -> float:
+    """Best wall time of importing a module in a fresh interpreter"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    times = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True).stdout)
+        for _ in range(runs)
+    ]
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="parses per measurement")
+    args = parser.parse_args()
+
+    from dateparser import parse
+
+    print(f"{'phrase':<24}{'fast us':>10}{'uncached us':>14}{'dateparser us':>16}")
+    for phrase in PHRASES:
+        fast = min(timeit.repeat(lambda: parse_fast(phrase, BASE), number=args.repeat, repeat=3)) / args.repeat
+
+        def uncached():
+            plan_phrase.cache_clear()
+            return parse_fast(phrase, BASE)
+
+        cold = min(timeit.repeat(uncached, number=args.repeat, repeat=3)) / args.repeat
+        slow_repeat = max(args.repeat // 20, 5)
+        slow = (
+            min(timeit.repeat(lambda: parse(phrase, settings={"RELATIVE_BASE": BASE}), number=slow_repeat, repeat=3))
+            / slow_repeat
+        )
+        print(f"{phrase:<24}{fast * 1e6:>10.2f}{cold * 1e6:>14.2f}{slow * 1e6:>16.1f}")
+
+    fallback = min(timeit.repeat(lambda: parse_relative_date("end of week", BASE), number=args.repeat, repeat=3))
+    print(f"{'fallback, memoized':<24}{fallback / args.repeat * 1e6:>10.2f}")
+
+    print()
+    print(f"import utils.relative_dates: {import_seconds('utils.relative_dates') * 1e3:.1f} ms")
+    print(f"import dateparser:           {import_seconds('dateparser') * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
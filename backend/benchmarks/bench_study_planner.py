@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: study planner on a semester of assignments and free time
+
+Usage:
+    python benchmarks/bench_study_planner.py
+    python benchmarks/bench_study_planner.py --assignments 1000 --days 120 --repeat 20
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add the backend directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.availability import as_interval_arrays
+from utils.study_planner import PRIORITY_WEIGHTS, StudyTask, plan_study_sessions, session_blocks
+
+START = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+def make_free_time(days: int, seed: int = 1):
+    """Two to four free windows a day between classes, 30 minutes to 3 hours long"""
+    rng = random.Random(seed)
+    free = []
+    for day in range(days):
+        cursor = START + timedelta(days=day, hours=8)
+        for _ in range(rng.randint(2, 4)):
+            cursor += timedelta(minutes=15 * rng.randint(2, 8))
+            end = cursor + timedelta(minutes=15 * rng.randint(2, 12))
+            free.append((cursor.timestamp(), end.timestamp()))
+            cursor = end
+    return as_interval_arrays(free)
+
+
+def make_assignments(count: int, days: int, seed: int = 2):
+    rng = random.Random(seed)
+    priorities = list(PRIORITY_WEIGHTS)
+    return [
+        StudyTask(
+            f"a{i}",
+            f"Assignment {i}",
+            START + timedelta(hours=rng.randrange(24, 24 * days)),
+            15 * rng.randint(2, 16),
+            rng.choice(priorities),
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assignments", type=int, default=300, help="assignments to plan")
+    parser.add_argument("--days", type=int, default=120, help="planning horizon in days")
+    parser.add_argument("--repeat", type=int, default=10, help="calls per measurement")
+    args = parser.parse_args()
+
+    free_starts, free_ends = make_free_time(args.days)
+    tasks = make_assignments(args.assignments, args.days)
+    blocks = session_blocks(free_starts, free_ends, 25, 5)[0].size
+
+    print(f"{args.assignments} assignments, {len(free_starts)} free windows, {blocks} focus sessions over {args.days} days")
+    print(f"{'case':<28}{'ms':>10}{'scheduled':>12}")
+    for strategy in ("weighted", "edf"):
+        plan = plan_study_sessions(tasks, free_starts, free_ends, 25, 5, strategy)
+        scheduled = args.assignments - len(plan.unscheduled)
+        best = min(
+            timeit.repeat(
+                lambda: plan_study_sessions(tasks, free_starts, free_ends, 25, 5, strategy), number=args.repeat, repeat=3
+            )
+        )
+        print(f"{strategy:<28}{best / args.repeat * 1e3:>10.2f}{scheduled:>12}")
+    best = min(timeit.repeat(lambda: session_blocks(free_starts, free_ends, 25, 5), number=args.repeat, repeat=3))
+    print(f"{'session blocks only':<28}{best / args.repeat * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,11 @@ create table public.profiles (
   work_hours_start time default '09:00:00',
   work_hours_end time default '17:00:00',
   break_duration_minutes integer default 15,
-  focus_session_duration_minutes integer default 25
+  focus_session_duration_minutes integer default 25,
+
+  -- Who may see this user's busy times when finding common availability
+  share_availability boolean default false, -- everyone
+  availability_shared_with text[] default '{}' -- these emails only
 );
 
 -- Create user tasks table
@@ -22,12 +22,15 @@ class Assignment:
         group_name: Assignment group name in Canvas
         group_weight: Weight of assignment group in final grade (0-1.0)
         priority: Assignment priority ('Low', 'Medium', 'High') based on group weight
+
+    None means "not given": new pages get the defaults ('Not started', 'Low',
+    no due date, empty description) and updates leave the page's value as is.
     """
 
     name: str
-    description: str
-    due_date: datetime
+    description: Optional[str]
+    due_date: Optional[datetime]
     course_name: str
-    status: str = "Not started"
+    status: Optional[str] = None
     id: Optional[int] = None
-    priority: Optional[str] = "Low"
+    priority: Optional[str] = None
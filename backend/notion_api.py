@@ -4,6 +4,7 @@
 # All about making the Notion API work smoothly with our application and our PM agent super simple.
 
 from notion_client import Client
+from notion_client.errors import APIResponseError
 from datetime import datetime
 import pytz
 from typing import Dict, Optional, Any, List
@@ -12,14 +13,23 @@ from datetime import timezone
 try:
     # Try relative import (for CI/normal backend execution)
     from models.assignment import Assignment
+    from utils.html_text import html_to_text, NOTION_TEXT_LIMIT
+    from services.notion_throttle import get_request_controller
+    from services.page_snapshots import page_snapshots
+    from services.assignment_index import AssignmentNameIndex, assignment_indexes
+    from utils.fuzzy_index import tokenize
+    from services.course_dashboard import course_dashboards
 except ImportError:
     # Fall back to absolute import (for test scripts run from project root)
     from backend.models.assignment import Assignment
-from bs4 import BeautifulSoup
-import re
+    from backend.utils.html_text import html_to_text, NOTION_TEXT_LIMIT
+    from backend.services.notion_throttle import get_request_controller
+    from backend.services.page_snapshots import page_snapshots
+    from backend.services.assignment_index import AssignmentNameIndex, assignment_indexes
+    from backend.utils.fuzzy_index import tokenize
+    from backend.services.course_dashboard import course_dashboards
 import logging
-import backoff
-from ratelimit import limits, sleep_and_retry
+import re
 import dotenv
 import os
 import requests
@@ -33,6 +43,21 @@ NOTION_DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
 
 logger = logging.getLogger(__name__)
 
+# Relation Notion's sub-items feature uses to link a subtask to its parent assignment
+PARENT_ITEM_PROPERTY = "Parent item"
+
+# Notion page IDs are UUIDs, with or without dashes; Canvas assignment IDs are plain integers
+NOTION_ID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}")
+
+
+def is_missing_parent_item(error: Exception) -> bool:
+    """Whether Notion rejected a page because the data source has no "Parent item" relation (sub-items disabled)"""
+    if not isinstance(error, APIResponseError):
+        return False
+    code = getattr(error.code, "value", error.code)
+    return code == "validation_error" and PARENT_ITEM_PROPERTY in str(error)
+
+
 # NotionAPI: Handles integration between Canvas assignments and Notion database
 # Manages rate limiting, error handling, and data transformation
 
@@ -295,14 +320,29 @@ class NotionAPI:
             "has_system_fallback": bool(NOTION_TOKEN),
         }
 
-    @sleep_and_retry
-    @limits(calls=MAX_REQUESTS_PER_SECOND, period=ONE_SECOND)
-    @backoff.on_exception(backoff.expo, Exception, max_tries=5)
+    @property
+    def request_controller(self):
+        """Throttling/retry controller shared by every NotionAPI using the same token"""
+        return get_request_controller(self.user_token or NOTION_TOKEN)
+
+    def get_request_metrics(self) -> Dict[str, Any]:
+        """
+        Get retry, throttle and wait-time counters for this token
+
+        Returns:
+            Dictionary of request metrics and the current concurrency limit
+        """
+        return self.request_controller.metrics()
+
     def make_notion_request(self, operation_type: str, **kwargs):
         """
-        Rate-limited wrapper for Notion API calls with exponential backoff.
+        Rate-limited wrapper for Notion API calls with adaptive retries.
         Supports both legacy database operations and new data source operations.
 
+        429s wait out the Retry-After header and shrink the per-token concurrency;
+        timeouts, conflicts and 5xx errors retry with jittered exponential backoff;
+        validation and permission errors fail immediately.
+
         Args:
             operation_type: Type of Notion operation ('query_database', 'query_data_source', 'update_page', 'create_page', etc.)
             **kwargs: Arguments passed to the Notion API call
@@ -313,16 +353,25 @@ class NotionAPI:
         Raises:
             ValueError: If operation_type is invalid
         """
+        # Each attempt gets a fresh copy of kwargs since dispatch pops from them
+        return self.request_controller.call(lambda: self._dispatch_notion_request(operation_type, **kwargs))
+
+    def _dispatch_notion_request(self, operation_type: str, **kwargs):
         if operation_type == "query_database":
             return self.notion.databases.query(**kwargs)
         elif operation_type == "query_data_source":
             # Use the correct data source query endpoint
             data_source_id = kwargs.pop("data_source_id")
             filter_obj = kwargs.pop("filter", {})
+            body = {"filter": filter_obj} if filter_obj else {}
+            # Pagination and sorting pass straight through to the query body
+            for key in ("start_cursor", "page_size", "sorts"):
+                if kwargs.get(key):
+                    body[key] = kwargs.pop(key)
             return self.notion.request(
                 method="POST",
                 path=f"data_sources/{data_source_id}/query",
-                body={"filter": filter_obj},
+                body=body,
             )
         elif operation_type == "retrieve_data_source":
             # Retrieve data source schema/properties
@@ -372,31 +421,177 @@ class NotionAPI:
         if not html_content:
             return ""
         try:
-            # Parse HTML and get text
-            soup = BeautifulSoup(html_content, "html.parser")
-            text = soup.get_text()
-
-            # Clean up whitespace
-            text = re.sub(r"\s+", " ", text).strip()
-
-            return text[:2000]  # Notion's limit
+            # Streams over the markup and stops once the limit is reached
+            return html_to_text(html_content, limit=NOTION_TEXT_LIMIT)
         except Exception as e:
             logger.warning(f"Error cleaning HTML content: {e}")
-            return html_content[:2000]
+            return html_content[:NOTION_TEXT_LIMIT]
+
+    def format_due_date(self, due_date) -> Optional[str]:
+        """Format a due date the way it is stored in the Notion "Due date" property"""
+        if not due_date:
+            return None
+        if isinstance(due_date, str):
+            parsed = self.parse_date(due_date)
+            return parsed.strftime("%Y-%m-%d") if parsed else due_date[:10]
+        return due_date.strftime("%Y-%m-%d")
 
-    def create_assignment_page(self, assignment: Assignment) -> Optional[Dict[str, Any]]:
+    def assignment_fields(self, assignment: Assignment, given_only: bool = False) -> Dict[str, Any]:
+        """
+        Canonical values of the assignment properties FlowState writes to Notion.
+
+        Args:
+            assignment: Assignment object
+            given_only: Leave out the fields the assignment doesn't set (None)
+                instead of filling in what a new page would get
+
+        Returns:
+            Dictionary of field name to the value Notion would store
+        """
+        fields = {
+            "name": assignment.name,
+            "status": assignment.status or "Not started",
+            "due_date": self.format_due_date(assignment.due_date),
+            "priority": assignment.priority or "Low",
+            "description": self.clean_html(assignment.description),
+        }
+        if given_only:
+            given = {
+                "name": assignment.name,
+                "status": assignment.status,
+                "due_date": assignment.due_date,
+                "priority": assignment.priority,
+                "description": assignment.description,
+            }
+            fields = {key: value for key, value in fields.items() if given[key] is not None}
+        return fields
+
+    @staticmethod
+    def page_fields(page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Canonical values of an assignment page, comparable with assignment_fields().
+
+        Args:
+            page: Notion page dict from a query or create/update response
+
+        Returns:
+            Dictionary of field name to the value stored on the page
+        """
+        properties = page.get("properties", {})
+
+        def plain_text(prop: Dict[str, Any], key: str) -> str:
+            return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in (prop.get(key) or []))
+
+        due = (properties.get("Due date", {}).get("date") or {}).get("start")
+        return {
+            "name": plain_text(properties.get("Assignment Name", {}), "title"),
+            "status": (properties.get("Status", {}).get("status") or {}).get("name"),
+            "due_date": due[:10] if due else None,
+            "priority": (properties.get("Priority", {}).get("select") or {}).get("name"),
+            "description": plain_text(properties.get("Description", {}), "rich_text"),
+        }
+
+    @staticmethod
+    def build_assignment_properties(fields: Dict[str, Any], course_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the Notion properties payload for the given canonical fields.
+
+        Args:
+            fields: Subset of the keys returned by assignment_fields()
+            course_id: Optional course page ID to relate the assignment to
+
+        Returns:
+            Notion properties dict containing only the requested fields
+        """
+        properties: Dict[str, Any] = {}
+        if "name" in fields:
+            properties["Assignment Name"] = {"title": [{"text": {"content": fields["name"]}}]}
+        if "status" in fields:
+            properties["Status"] = {"status": {"name": fields["status"]}}
+        if "due_date" in fields:
+            properties["Due date"] = {"date": {"start": fields["due_date"]} if fields["due_date"] else None}
+        if "priority" in fields:
+            properties["Priority"] = {"select": {"name": fields["priority"]}}
+        if "description" in fields:
+            properties["Description"] = {"rich_text": [{"text": {"content": fields["description"]}}]}
+        if course_id is not None:
+            properties["Course"] = {"relation": [{"id": course_id}] if course_id else []}
+        return properties
+
+    def remember_pages(self, pages) -> None:
+        """
+        Record the current fields of assignment pages so later updates can send only what changed
+
+        Args:
+            pages: Iterable of Notion page dicts from a query or create/update response
+        """
+        scope = self.user_id or "system"
+        pages = [page for page in pages if page and page.get("id") and page.get("properties")]
+        for page in pages:
+            page_snapshots.put(scope, page["id"], self.page_fields(page))
+        index = assignment_indexes.peek(scope)
+        if index is not None and index.is_fresh():
+            index.update_pages(pages)
+
+    def note_write(self) -> None:
+        """Drop the user's cached views of the whole database after an assignment or course write"""
+        course_dashboards.invalidate(self.user_id or "system")
+
+    def assignment_index(self) -> Optional[AssignmentNameIndex]:
+        """
+        The user's assignment name index, rebuilt from Notion when it is stale.
+
+        Returns:
+            AssignmentNameIndex, or None if the assignments could not be listed
+        """
+        index = assignment_indexes.get(self.user_id or "system")
+        if not index.is_fresh():
+            pages = self.query_all_assignment_pages()
+            if pages is None:
+                return None
+            courses = self.get_all_course_pages() if self.courses_data_source_id else {}
+            index.rebuild(pages, {page["id"]: name for name, page in courses.items()})
+        return index
+
+    def resolve_assignment_page(self, assignment_name: str, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Resolve an assignment name, typos and paraphrases included, against the local index.
+
+        Args:
+            assignment_name: Assignment name as the user wrote it
+            fuzzy: Allow typo and paraphrase matches; otherwise only the exact title resolves
+
+        Returns:
+            Notion page dict of the best match, or None if nothing matches well enough
+        """
+        index = self.assignment_index()
+        return index.resolve(assignment_name, fuzzy=fuzzy) if index is not None else None
+
+    def create_assignment_page(
+        self,
+        assignment: Assignment,
+        course_page_id: Optional[str] = None,
+        parent_page_id: Optional[str] = None,
+        raise_errors: bool = False,
+    ) -> Optional[Dict[str, Any]]:
         """
         Create a new Notion page for the given assignment.
 
         Args:
             assignment: Assignment object
+            course_page_id: Course page ID when already known, skips the course lookup
+            parent_page_id: Assignment page this one is a subtask of (set as the "Parent item" relation)
+            raise_errors: Re-raise a failed request instead of returning None
 
         Returns:
             Notion page dict if created successfully, else None
         """
 
-        course_page = self.get_course_page(assignment.course_name) if assignment.course_name else None
-        course_id = course_page["id"] if course_page else None
+        if course_page_id is not None:
+            course_id = course_page_id
+        else:
+            course_page = self.get_course_page(assignment.course_name) if assignment.course_name else None
+            course_id = course_page["id"] if course_page else None
         properties = {
             "Assignment Name": {"title": [{"text": {"content": assignment.name}}]},
             "Status": {"status": {"name": assignment.status or "Not started"}},
@@ -405,6 +600,8 @@ class NotionAPI:
             "Description": {"rich_text": [{"text": {"content": self.clean_html(assignment.description)}}]},
             "Course": {"relation": [{"id": course_id}] if course_id else []},
         }
+        if parent_page_id:
+            properties[PARENT_ITEM_PROPERTY] = {"relation": [{"id": parent_page_id}]}
 
         # Use assignments data_source_id if available (new 2025-09-03 API), fallback to database_id
         if self.assignments_data_source_id:
@@ -424,8 +621,12 @@ class NotionAPI:
 
         try:
             response = self.make_notion_request("create_page", **payload)
+            self.note_write()
+            self.remember_pages([response])
             return response
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Error creating assignment page: {e}")
             return None
 
@@ -444,19 +645,32 @@ class NotionAPI:
             return course_page
         return self.get_or_create_course_page(course_name)
 
-    def find_assignment_page(self, assignment_name: str) -> Optional[Dict[str, Any]]:
+    def find_assignment_page(self, assignment_name: str, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
         """
         Find a Notion page for the given assignment name.
 
+        The name is resolved against the local assignment index first; Notion is
+        only queried when nothing there matches well enough. Writes pass
+        fuzzy=False so a near miss never edits a sibling assignment.
+
         Args:
             assignment_name: Name of the assignment to find
+            fuzzy: Allow typo and paraphrase matches in the local index
 
         Returns:
             Notion page dict if found, else None
         """
 
+        page = self.resolve_assignment_page(assignment_name, fuzzy=fuzzy)
+        if page is not None:
+            return page
+
         filters = {"name": assignment_name}
         pages = self.find_assignment_pages(filters=filters)
+        if pages and not fuzzy:
+            # Notion only offers a "contains" title filter; exact lookups need the whole title to match
+            wanted = tokenize(assignment_name)
+            pages = {page_id: page for page_id, page in pages.items() if tokenize(AssignmentNameIndex._title(page)) == wanted}
         if pages and len(pages) == 1:
             return pages[next(iter(pages))]  # Return the single page found
         elif pages and len(pages) > 1:
@@ -532,11 +746,38 @@ class NotionAPI:
                 for page in response["results"]:
                     # Since we're using proper filters, all returned pages should match
                     pages[page["id"]] = page
+            self.remember_pages(pages.values())
             return pages
         except Exception as e:
             logger.error(f"Error fetching assignment page: {e}")
         return None
 
+    def query_all_assignment_pages(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retrieve every page in the assignments data source, following pagination.
+
+        Returns:
+            List of Notion page dicts, or None if the query failed
+        """
+        pages: List[Dict[str, Any]] = []
+        cursor = None
+        try:
+            while True:
+                response = self.make_notion_request(
+                    "query_data_source",
+                    data_source_id=self.assignments_data_source_id,
+                    page_size=100,
+                    start_cursor=cursor,
+                )
+                pages.extend(response.get("results", []))
+                cursor = response.get("next_cursor")
+                if not response.get("has_more") or not cursor:
+                    self.remember_pages(pages)
+                    return pages
+        except Exception as e:
+            logger.error(f"Error listing assignment pages: {e}")
+            return None
+
     # Add optional argument for a dictionary of assignments to update
     # This allows you to update multiple assignments at once
     def update_assignment_page(
@@ -570,47 +811,52 @@ class NotionAPI:
 
     def _update_single_assignment(self, assignment: Assignment) -> Optional[Dict[str, Any]]:
         """
-        Update a single assignment page.
+        Update a single assignment page, sending only the properties that changed.
+
+        The page is addressed directly when assignment.id is a Notion page ID;
+        otherwise it is looked up by name. Properties are diffed against the last
+        known snapshot of the page and the request is skipped if nothing changed.
 
         Args:
             assignment: Assignment object with updated data
 
         Returns:
-            Updated Notion page dict if successful, else None
+            Updated Notion page dict if successful (or a stub with "unchanged": True
+            when no request was needed), else None
         """
-        cur_assignment = self.find_assignment_page(assignment.name)
-        if not cur_assignment:
-            logger.warning(f"No existing page found for assignment {assignment.name}")
-            return None
+        scope = self.user_id or "system"
+        page_id = str(assignment.id) if assignment.id and NOTION_ID_PATTERN.fullmatch(str(assignment.id)) else None
+        snapshot = page_snapshots.get(scope, page_id) if page_id else None
 
-        page_id = assignment.id or cur_assignment["id"]
+        if not page_id:
+            cur_assignment = self.find_assignment_page(assignment.name, fuzzy=False)
+            if not cur_assignment:
+                logger.warning(f"No existing page found for assignment {assignment.name}")
+                return None
+            page_id = cur_assignment["id"]
+            snapshot = self.page_fields(cur_assignment)
 
-        payload = {
-            "page_id": page_id,
-            "properties": {
-                "Assignment Name": {"title": [{"text": {"content": assignment.name}}]},
-                "Status": {
-                    "status": {
-                        "name": assignment.status
-                        or cur_assignment["properties"].get("Status", {}).get("status", {}).get("name", "Not started")
-                    }
-                },
-                "Due date": {"date": {"start": (assignment.due_date.strftime("%Y-%m-%d") if assignment.due_date else None)}},
-                "Priority": {
-                    "select": {
-                        "name": assignment.priority
-                        or cur_assignment["properties"].get("Priority", {}).get("select", {}).get("name", "Low")
-                    }
-                },
-                "Description": {"rich_text": [{"text": {"content": self.clean_html(assignment.description)}}]},
-                # Course relation is not updated here to avoid overwriting existing relations!
-            },
-        }
+        # Only fields the caller gave are written: None means "leave as is", not "clear" or "reset to the default"
+        fields = self.assignment_fields(assignment, given_only=True)
+
+        # Course relation is not updated here to avoid overwriting existing relations!
+        changed = {key: value for key, value in fields.items() if snapshot is None or snapshot.get(key) != value}
+        if not changed:
+            logger.info(f"No changes for assignment {assignment.name}, skipping update")
+            return {"object": "page", "id": page_id, "unchanged": True}
 
         try:
-            response = self.make_notion_request("update_page", **payload)
+            response = self.make_notion_request(
+                "update_page", page_id=page_id, properties=self.build_assignment_properties(changed)
+            )
+            self.note_write()
+            if response and response.get("properties"):
+                self.remember_pages([response])
+            elif snapshot is not None:
+                page_snapshots.put(scope, page_id, {**snapshot, **changed})
             return response
         except Exception as e:
+            page_snapshots.invalidate(scope, page_id)
             logger.error(f"Error updating assignment page: {e}")
             return None
 
@@ -704,6 +950,7 @@ class NotionAPI:
 
         try:
             response = self.make_notion_request("create_page", **payload)
+            self.note_write()
             return response
         except Exception as e:
             logger.error(f"Error creating course page for {course_name}: {e}")
@@ -0,0 +1,168 @@
+"""
+Assignment Name Index
+Per-user fuzzy index over assignment titles and course names, resolving names without a Notion query
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from utils.fuzzy_index import FuzzyIndex, tokenize
+except ImportError:
+    from backend.utils.fuzzy_index import FuzzyIndex, tokenize
+
+# Relative weight of a search hit in each field
+NAME_FIELD_WEIGHTS = {"name": 1.0, "course": 0.5}
+# Ranked score the best hit needs to count as the assignment the user meant
+MIN_RESOLVE_SCORE = 0.6
+# Filler words dropped from names before searching ("the essay for history")
+STOPWORDS = frozenset({"a", "an", "the", "my", "for", "of", "on", "in", "to", "and", "due"})
+
+
+class AssignmentNameIndex:
+    """
+    Assignment pages of one user, searchable by title and course name.
+
+    The index is rebuilt from a full listing of the assignments data source once
+    it is older than ttl_seconds; in between, pages NotionAPI reads or writes are
+    folded in as they pass through remember_pages.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._index = FuzzyIndex(NAME_FIELD_WEIGHTS)
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._titles: Dict[str, str] = {}  # normalized title -> page ID
+        self._course_names: Dict[str, str] = {}
+        self.refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def is_fresh(self) -> bool:
+        return self.refreshed_at is not None and self._clock() - self.refreshed_at <= self.ttl_seconds
+
+    @staticmethod
+    def _title(page: Dict[str, Any]) -> str:
+        parts = page.get("properties", {}).get("Assignment Name", {}).get("title") or []
+        return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in parts)
+
+    def _add(self, page: Dict[str, Any]) -> None:
+        title = self._title(page)
+        relations = page.get("properties", {}).get("Course", {}).get("relation") or []
+        course = " ".join(self._course_names.get(relation["id"], "") for relation in relations)
+        previous = self._pages.get(page["id"])
+        if previous is not None:
+            previous_title = " ".join(tokenize(self._title(previous)))
+            if self._titles.get(previous_title) == page["id"]:
+                del self._titles[previous_title]
+        self._pages[page["id"]] = page
+        self._titles.setdefault(" ".join(tokenize(title)), page["id"])
+        self._index.add(page["id"], {"name": title, "course": course})
+
+    def rebuild(self, pages: Iterable[Dict[str, Any]], course_names: Dict[str, str]) -> None:
+        """
+        Replace the index contents with a full listing
+
+        Args:
+            pages: Every assignment page of the user
+            course_names: Course page ID to course name
+        """
+        with self._lock:
+            self._index.clear()
+            self._pages.clear()
+            self._titles.clear()
+            self._course_names = dict(course_names)
+            for page in pages:
+                self._add(page)
+            self.refreshed_at = self._clock()
+
+    def update_pages(self, pages: Iterable[Dict[str, Any]]) -> None:
+        """Fold newly read, created or updated pages into the index"""
+        with self._lock:
+            for page in pages:
+                if page and page.get("id") and page.get("properties", {}).get("Assignment Name"):
+                    self._add(page)
+
+    def search(self, name: str, limit: Optional[int] = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Rank assignments against a name as the user wrote it
+
+        Args:
+            name: Assignment name, possibly misspelled or paraphrased
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            (page, score) pairs, best first; an exact title match scores 1.0 and comes first
+        """
+        tokens = tokenize(name)
+        meaningful = [token for token in tokens if token not in STOPWORDS] or tokens
+        with self._lock:
+            exact = self._titles.get(" ".join(tokens))
+            results = self._index.search(" ".join(meaningful), None, match_all=False)
+            if exact is not None:
+                results = [(exact, 1.0)] + [result for result in results if result[0] != exact]
+            return [(self._pages[doc_id], score) for doc_id, score in results[:limit]]
+
+    def resolve(self, name: str, fuzzy: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        The assignment page a name most likely refers to
+
+        Numbers must agree exactly: "Lab 4 Report" never resolves to "Lab 3 Report".
+
+        Args:
+            name: Assignment name, possibly misspelled or paraphrased
+            fuzzy: Allow typo and paraphrase matches; otherwise only the exact
+                title (ignoring case and punctuation) resolves
+
+        Returns:
+            Notion page dict, or None when nothing matches well enough
+        """
+        tokens = tokenize(name)
+        if not fuzzy:
+            with self._lock:
+                page_id = self._titles.get(" ".join(tokens))
+                return self._pages[page_id] if page_id is not None else None
+        numbers = {token for token in tokens if token.isdigit()}
+        for page, score in self.search(name, limit=None):
+            if score < MIN_RESOLVE_SCORE:
+                break
+            if {token for token in tokenize(self._title(page)) if token.isdigit()} == numbers:
+                return page
+        return None
+
+
+class AssignmentIndexRegistry:
+    """AssignmentNameIndex per user"""
+
+    def __init__(self, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._indexes: Dict[str, AssignmentNameIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str) -> AssignmentNameIndex:
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                index = self._indexes[scope] = AssignmentNameIndex(self.ttl_seconds, self._clock)
+            return index
+
+    def peek(self, scope: str) -> Optional[AssignmentNameIndex]:
+        """The user's index if one has been built, without creating it"""
+        with self._lock:
+            return self._indexes.get(scope)
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            self._indexes.pop(scope, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+assignment_indexes = AssignmentIndexRegistry()
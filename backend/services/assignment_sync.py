@@ -0,0 +1,320 @@
+"""
+Assignment Sync Service
+Bulk Canvas -> Notion synchronisation with content hashing and change detection
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    # Try relative import (for CI/normal backend execution)
+    from models.assignment import Assignment
+except ImportError:
+    # Fall back to absolute import (for test scripts run from project root)
+    from backend.models.assignment import Assignment
+
+logger = logging.getLogger(__name__)
+
+# Fields that decide whether an existing page needs rewriting. The course relation
+# is only set on creation, matching update_assignment_page which never overwrites it.
+# Fields a record leaves unset (Canvas has no status or priority) are neither compared
+# nor written, so edits made in Notion survive re-syncs; new pages get the defaults.
+SYNC_FIELDS = ("name", "status", "due_date", "priority", "description")
+# Course name -> page ID listings are reused across syncs of the same user for this long
+COURSE_IDS_TTL_SECONDS = 300
+
+
+def fingerprint(fields: Dict[str, Any]) -> str:
+    """
+    Stable content hash of the synced fields
+
+    Args:
+        fields: Canonical field values from NotionAPI.assignment_fields() or page_fields()
+
+    Returns:
+        Hex digest identifying the content
+    """
+    canonical = json.dumps({key: fields.get(key) for key in SYNC_FIELDS}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _name_key(name: Optional[str]) -> str:
+    return " ".join((name or "").split()).casefold()
+
+
+class CourseIdCache:
+    """Course name (normalized) to course page ID, per user"""
+
+    def __init__(self, ttl_seconds: float = COURSE_IDS_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            entry = self._entries.get(scope)
+            if entry is None:
+                return None
+            if self._clock() - entry[0] > self.ttl_seconds:
+                del self._entries[scope]
+                return None
+            return entry[1]
+
+    def put(self, scope: str, course_ids: Dict[str, str]) -> None:
+        with self._lock:
+            self._entries[scope] = (self._clock(), course_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+course_id_cache = CourseIdCache()
+
+
+@dataclass
+class SyncAction:
+    """Planned or executed change for a single assignment"""
+
+    action: str  # 'create', 'update', 'unchanged', 'duplicate'
+    name: str
+    course_name: Optional[str] = None
+    page_id: Optional[str] = None
+    changed_fields: List[str] = field(default_factory=list)
+    fingerprint: Optional[str] = None
+    success: Optional[bool] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class SyncReport:
+    """Outcome of a sync run; with dry_run=True nothing was written"""
+
+    dry_run: bool
+    actions: List[SyncAction] = field(default_factory=list)
+    queries: int = 0
+    writes: int = 0
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        counts = {"create": 0, "update": 0, "unchanged": 0, "duplicate": 0, "failed": 0}
+        for action in self.actions:
+            counts[action.action] += 1
+            if action.success is False:
+                counts["failed"] += 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "counts": self.counts,
+            "queries": self.queries,
+            "writes": self.writes,
+            "actions": [asdict(action) for action in self.actions if action.action != "unchanged"],
+        }
+
+
+class AssignmentSyncEngine:
+    """
+    Diffs a batch of Assignment records against the user's Notion assignment pages
+    and creates or updates only what changed.
+
+    A re-sync of an unchanged term costs one paginated query of the assignments
+    data source and no writes. Course pages are listed in a single query, which
+    later syncs of the same user reuse for COURSE_IDS_TTL_SECONDS.
+    """
+
+    def __init__(self, notion_api, max_workers: Optional[int] = None):
+        """
+        Args:
+            notion_api: NotionAPI instance for the user being synced
+            max_workers: Concurrent writes; defaults to the Notion rate limit so
+                requests queue on the limiter instead of tripping 429s
+        """
+        self.notion_api = notion_api
+        self.max_workers = max_workers or notion_api.MAX_REQUESTS_PER_SECOND
+        self._course_ids: Optional[Dict[str, str]] = None
+        self._course_ids_listed = False  # listed by this engine rather than taken from course_id_cache
+        self._queries = 0
+
+    def plan(self, assignments: Iterable[Assignment]) -> Tuple[SyncReport, Dict[int, Assignment]]:
+        """
+        Work out what sync() would do without writing anything.
+
+        Args:
+            assignments: Assignment records, typically a semester export from Canvas
+
+        Returns:
+            Tuple of the dry-run report and a mapping of action index to the
+            assignment that action applies to
+        """
+        report = SyncReport(dry_run=True)
+        targets: Dict[int, Assignment] = {}
+
+        self._queries = 0
+        pages = self.notion_api.query_all_assignment_pages()
+        self._queries += 1
+        if pages is None:
+            raise RuntimeError("Could not list existing Notion assignment pages")
+
+        pages_by_id = {page["id"]: page for page in pages}
+        pages_by_name: Dict[str, List[Dict[str, Any]]] = {}
+        for page in pages:
+            pages_by_name.setdefault(_name_key(self.notion_api.page_fields(page)["name"]), []).append(page)
+
+        seen: Dict[Tuple[str, str], int] = {}
+        for assignment in assignments:
+            key = (_name_key(assignment.name), _name_key(assignment.course_name))
+            fields = self.notion_api.assignment_fields(assignment, given_only=True)
+            digest = fingerprint(fields)
+
+            if key in seen:
+                # Later records for the same assignment replace earlier ones in the batch
+                earlier = report.actions[seen[key]]
+                report.actions.append(
+                    SyncAction(
+                        action="duplicate", name=earlier.name, course_name=earlier.course_name, fingerprint=earlier.fingerprint
+                    )
+                )
+                earlier.fingerprint = digest
+                self._reclassify(earlier, fields, pages_by_id.get(earlier.page_id) if earlier.page_id else None)
+                targets[seen[key]] = assignment
+                continue
+
+            page = self._match_page(assignment, pages_by_id, pages_by_name)
+            action = SyncAction(
+                action="create",
+                name=assignment.name,
+                course_name=assignment.course_name,
+                page_id=page["id"] if page else None,
+                fingerprint=digest,
+            )
+            self._reclassify(action, fields, page)
+            seen[key] = len(report.actions)
+            targets[len(report.actions)] = assignment
+            report.actions.append(action)
+
+        report.queries = self._queries
+        return report, targets
+
+    def sync(self, assignments: Iterable[Assignment], dry_run: bool = False) -> SyncReport:
+        """
+        Create or update the Notion pages for a batch of assignments.
+
+        Args:
+            assignments: Assignment records to sync
+            dry_run: Only report what would change
+
+        Returns:
+            SyncReport describing every create/update (and the unchanged count)
+        """
+        report, targets = self.plan(assignments)
+        if dry_run:
+            return report
+        report.dry_run = False
+
+        pending = [(index, report.actions[index]) for index in targets if report.actions[index].action in ("create", "update")]
+        if not pending:
+            return report
+
+        new_courses = {
+            _name_key(action.course_name) for _, action in pending if action.action == "create" and action.course_name
+        }
+        if new_courses:
+            if not new_courses <= set(self._load_course_ids()):
+                self._load_course_ids(refresh=True)
+            report.queries = self._queries
+
+        def write(item: Tuple[int, SyncAction]) -> None:
+            index, action = item
+            try:
+                if action.action == "create":
+                    result = self._create(targets[index])
+                    action.page_id = result["id"] if result else None
+                else:
+                    result = self._update(action.page_id, targets[index], action.changed_fields)
+                action.success = result is not None
+                if result is None:
+                    action.error = f"Notion did not accept the {action.action}"
+            except Exception as e:
+                logger.error(f"Error syncing assignment {action.name}: {e}")
+                action.success = False
+                action.error = str(e)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(write, pending))
+        report.writes = len(pending)
+
+        return report
+
+    def _reclassify(self, action: SyncAction, fields: Dict[str, Any], page: Optional[Dict[str, Any]]) -> None:
+        if page is None:
+            action.action = "create"
+            action.changed_fields = list(SYNC_FIELDS)
+            return
+        current = self.notion_api.page_fields(page)
+        action.changed_fields = [key for key in SYNC_FIELDS if key in fields and current.get(key) != fields[key]]
+        action.action = "update" if action.changed_fields else "unchanged"
+
+    def _match_page(
+        self,
+        assignment: Assignment,
+        pages_by_id: Dict[str, Dict[str, Any]],
+        pages_by_name: Dict[str, List[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        if assignment.id and str(assignment.id) in pages_by_id:
+            return pages_by_id[str(assignment.id)]
+
+        candidates = pages_by_name.get(_name_key(assignment.name), [])
+        if not candidates or not assignment.course_name:
+            return candidates[0] if candidates else None
+
+        # The same title in another course is a different assignment, even when it is the only page
+        course_ids = self._load_course_ids()
+        course_id = course_ids.get(_name_key(assignment.course_name))
+        if course_id is None and not self._course_ids_listed:
+            # Maybe a course added since the cached listing
+            course_ids = self._load_course_ids(refresh=True)
+            course_id = course_ids.get(_name_key(assignment.course_name))
+        other_courses = set(course_ids.values()) - {course_id}
+        for page in candidates:
+            relations = page.get("properties", {}).get("Course", {}).get("relation", [])
+            related = {relation.get("id") for relation in relations}
+            # A course missing from Notion can't be checked; only rule out pages of another listed course
+            if (course_id in related) if course_id else not related & other_courses:
+                return page
+        return None
+
+    def _load_course_ids(self, refresh: bool = False) -> Dict[str, str]:
+        scope = self.notion_api.user_id or "system"
+        if self._course_ids is None:
+            self._course_ids = course_id_cache.get(scope)
+        if self._course_ids is None or (refresh and not self._course_ids_listed):
+            courses = self.notion_api.get_all_course_pages()
+            self._queries += 1
+            self._course_ids = {_name_key(name): page["id"] for name, page in courses.items()}
+            self._course_ids_listed = True
+            course_id_cache.put(scope, self._course_ids)
+        return self._course_ids
+
+    def _create(self, assignment: Assignment) -> Optional[Dict[str, Any]]:
+        if not assignment.course_name:
+            course_id: Optional[str] = ""
+        else:
+            # None (course not listed) lets create_assignment_page look the course up itself
+            course_id = (self._course_ids or {}).get(_name_key(assignment.course_name))
+        return self.notion_api.create_assignment_page(assignment, course_page_id=course_id)
+
+    def _update(self, page_id: str, assignment: Assignment, changed_fields: List[str]) -> Optional[Dict[str, Any]]:
+        fields = self.notion_api.assignment_fields(assignment)
+        properties = self.notion_api.build_assignment_properties({key: fields[key] for key in changed_fields})
+        response = self.notion_api.make_notion_request("update_page", page_id=page_id, properties=properties)
+        self.notion_api.note_write()
+        return response
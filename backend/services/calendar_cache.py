@@ -0,0 +1,288 @@
+"""
+Calendar Metadata Cache
+Per-user caches of Google access tokens and calendar list metadata shared by the scheduler tools
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from services.google_http import BearerAuth, get_google_client
+except ImportError:
+    from backend.services.google_http import BearerAuth, get_google_client
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_LIST_URL = "https://www.googleapis.com/calendar/v3/users/me/calendarList"
+CALENDAR_URL = "https://www.googleapis.com/calendar/v3/calendars/{calendar_id}"
+
+# Refresh tokens this long before Google expires them (matches GoogleCalendarOAuthService)
+TOKEN_EXPIRY_MARGIN_SECONDS = 300
+# Tokens without a known expiry are re-read from the database after this long
+TOKEN_FALLBACK_TTL_SECONDS = 60
+# Conditional-request cache size (responses, across all users)
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+
+@dataclass
+class CalendarInfo:
+    """Calendar list entry fields the scheduler tools use"""
+
+    id: str
+    summary: str
+    time_zone: Optional[str] = None
+    access_role: Optional[str] = None
+    primary: bool = False
+
+
+@dataclass
+class _CalendarEntry:
+    calendars: List[CalendarInfo]
+    etag: Optional[str]
+    fetched_at: float
+    primary_timezone: Optional[str] = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0  # bodies served from cache after a 304
+    not_modified: int = 0  # 304 responses received
+    misses: int = 0  # full responses downloaded
+
+
+class AccessTokenCache:
+    """
+    Caches each user's Google access token until shortly before it expires,
+    so every tool call in an agent turn doesn't go back to Supabase.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._owners: Dict[str, str] = {}
+
+    def get(self, user_id: str) -> Optional[str]:
+        entry = self._tokens.get(user_id)
+        if entry is None:
+            return None
+        if self._clock() >= entry[1]:
+            del self._tokens[user_id]
+            return None
+        return entry[0]
+
+    def put(self, user_id: str, access_token: str, expires_at: Optional[str] = None) -> None:
+        """
+        Args:
+            user_id: Owner of the token
+            access_token: Google access token
+            expires_at: ISO timestamp the token expires at, if known
+        """
+        valid_until = self._clock() + TOKEN_FALLBACK_TTL_SECONDS
+        if expires_at:
+            try:
+                expiry = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+                if expiry.tzinfo is None:
+                    expiry = expiry.replace(tzinfo=timezone.utc)
+                valid_until = expiry.timestamp() - TOKEN_EXPIRY_MARGIN_SECONDS
+            except ValueError:
+                pass
+        if valid_until > self._clock():
+            previous = self._tokens.get(user_id)
+            if previous:
+                self._owners.pop(previous[0], None)
+            self._tokens[user_id] = (access_token, valid_until)
+            self._owners[access_token] = user_id
+
+    def owner_of(self, access_token: str) -> Optional[str]:
+        """User a cached access token belongs to"""
+        return self._owners.get(access_token)
+
+    def invalidate(self, user_id: str) -> None:
+        entry = self._tokens.pop(user_id, None)
+        if entry:
+            self._owners.pop(entry[0], None)
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._owners.clear()
+
+
+class CalendarMetadataCache:
+    """
+    Per-user TTL cache of the calendar list (IDs, names, timezones, access roles)
+    and the primary calendar's timezone.
+
+    Expired entries are revalidated with If-None-Match, so an unchanged calendar
+    list costs a 304 with no body instead of a full download.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[str, _CalendarEntry] = {}
+        self.stats = CacheStats()
+
+    async def get_calendars(self, user_id: str, access_token: str) -> List[CalendarInfo]:
+        """
+        Get the user's calendars, from cache when fresh
+
+        Args:
+            user_id: User the calendars belong to
+            access_token: User's Google access token
+
+        Returns:
+            Calendar list entries in the order Google returns them
+        """
+        return (await self._entry(user_id, access_token)).calendars
+
+    async def get_primary_timezone(self, user_id: str, access_token: str) -> str:
+        """
+        Get the timezone of the user's primary calendar
+
+        Args:
+            user_id: User the calendar belongs to
+            access_token: User's Google access token
+
+        Returns:
+            IANA timezone name, "UTC" if Google doesn't report one
+        """
+        entry = await self._entry(user_id, access_token)
+        if entry.primary_timezone is None:
+            client = get_google_client()
+            response = await client.get(CALENDAR_URL.format(calendar_id="primary"), auth=BearerAuth(access_token))
+            response.raise_for_status()
+            entry.primary_timezone = response.json().get("timeZone", "UTC")
+        return entry.primary_timezone
+
+    async def get_timezone(self, user_id: str, access_token: str, calendar_id: str = "primary") -> Optional[str]:
+        """Timezone of a calendar in the user's list, or None if it isn't listed"""
+        if calendar_id == "primary":
+            return await self.get_primary_timezone(user_id, access_token)
+        for calendar in await self.get_calendars(user_id, access_token):
+            if calendar.id == calendar_id:
+                return calendar.time_zone
+        return None
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats = CacheStats()
+
+    async def _entry(self, user_id: str, access_token: str) -> _CalendarEntry:
+        entry = self._entries.get(user_id)
+        now = self._clock()
+        if entry and now - entry.fetched_at < self.ttl_seconds:
+            self.stats.hits += 1
+            return entry
+
+        client = get_google_client()
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+        response = await client.get(CALENDAR_LIST_URL, headers=headers, auth=BearerAuth(access_token))
+        if response.status_code == 304 and entry:
+            self.stats.revalidated += 1
+            entry.fetched_at = now
+            return entry
+        response.raise_for_status()
+        self.stats.misses += 1
+
+        data = response.json()
+        etag = response.headers.get("ETag") or data.get("etag")
+        items = list(data.get("items", []))
+        while data.get("nextPageToken"):
+            response = await client.get(
+                CALENDAR_LIST_URL, params={"pageToken": data["nextPageToken"]}, auth=BearerAuth(access_token)
+            )
+            response.raise_for_status()
+            data = response.json()
+            items.extend(data.get("items", []))
+
+        calendars = [
+            CalendarInfo(
+                id=item["id"],
+                summary=item.get("summary", item["id"]),
+                time_zone=item.get("timeZone"),
+                access_role=item.get("accessRole"),
+                primary=bool(item.get("primary")),
+            )
+            for item in items
+        ]
+        primary = next((calendar for calendar in calendars if calendar.primary), None)
+        entry = _CalendarEntry(calendars, etag, now, primary.time_zone if primary else None)
+        self._entries[user_id] = entry
+        return entry
+
+
+class ResponseCache:
+    """
+    ETag-keyed cache of parsed Calendar API GET responses, scoped per user.
+
+    call_calendar_api sends the stored ETag as If-None-Match and, on 304,
+    returns the body parsed the first time. Cached bodies are shared, so
+    callers must not modify what they get back.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[str, Any]]" = OrderedDict()
+        self.stats = ResponseCacheStats()
+
+    @staticmethod
+    def scope_for(access_token: str) -> str:
+        """Cache scope of a request: the token's user if known, otherwise the token itself (hashed)"""
+        return access_token_cache.owner_of(access_token) or hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _key(scope: str, url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+        query = "&".join(f"{name}={value}" for name, value in sorted((params or {}).items()))
+        return scope, url, query
+
+    def etag_for(self, scope: str, url: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        entry = self._entries.get(self._key(scope, url, params))
+        return entry[0] if entry else None
+
+    def not_modified(self, scope: str, url: str, params: Optional[Dict[str, Any]]) -> Any:
+        """Cached body for a 304 response"""
+        key = self._key(scope, url, params)
+        self._entries.move_to_end(key)
+        self.stats.not_modified += 1
+        self.stats.hits += 1
+        return self._entries[key][1]
+
+    def store(self, scope: str, url: str, params: Optional[Dict[str, Any]], etag: Optional[str], body: Any) -> None:
+        """Remember a full response (responses without an ETag aren't cached)"""
+        self.stats.misses += 1
+        key = self._key(scope, url, params)
+        if not etag:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str) -> None:
+        for key in [key for key in self._entries if key[0] == scope]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats = ResponseCacheStats()
+
+
+access_token_cache = AccessTokenCache()
+calendar_metadata_cache = CalendarMetadataCache()
+calendar_response_cache = ResponseCache()
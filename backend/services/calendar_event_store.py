@@ -0,0 +1,414 @@
+"""
+Calendar Event Store
+Per-user, per-calendar local event store kept current with Google Calendar syncToken deltas
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import pytz
+
+try:
+    from utils.fuzzy_index import FuzzyIndex
+except ImportError:
+    from backend.utils.fuzzy_index import FuzzyIndex
+
+logger = logging.getLogger(__name__)
+
+# How far back and ahead the initial full sync reaches; ranges outside go straight to the API
+SYNC_LOOKBACK_DAYS = 30
+SYNC_LOOKAHEAD_DAYS = 180
+# Resync from scratch once the window reaches less than this far ahead
+MIN_LOOKAHEAD_DAYS = 90
+# Skip the delta request if the store was synced this recently (several tools run per turn)
+MIN_SYNC_INTERVAL_SECONDS = 15.0
+# With an events.watch channel open, push notifications mark the store stale, so
+# the delta request is only a safety net against lost notifications
+WATCHED_SYNC_INTERVAL_SECONDS = 600.0
+# Process-wide store limits: least recently used stores go first, and stores idle this long are dropped
+MAX_EVENT_STORES = 256
+EVENT_STORE_IDLE_SECONDS = 3600.0
+
+# Partial-response mask for event resources: just what EventRecord and the agent read
+EVENT_ITEM_FIELDS = (
+    "id,status,summary,description,location,htmlLink,start,end,transparency,recurringEventId,attendees(self,responseStatus)"
+)
+# Relative weight of a search hit in each field
+SEARCH_FIELD_WEIGHTS = {"summary": 1.0, "location": 0.8, "description": 0.6}
+
+SYNC_FIELDS = f"nextPageToken,nextSyncToken,items({EVENT_ITEM_FIELDS})"
+
+
+def is_sync_request(params: Optional[Dict[str, Any]]) -> bool:
+    """Whether events.list params belong to a store sync (full or delta), whose responses are never requested twice"""
+    return bool(params) and ("syncToken" in params or params.get("fields") == SYNC_FIELDS)
+
+
+# call_calendar_api(endpoint, access_token, method=..., params=...)
+CalendarCaller = Callable[..., Awaitable[Dict[str, Any]]]
+
+
+def parse_event_time(value: Dict[str, str], default_tz: str = "UTC") -> Tuple[float, bool]:
+    """
+    Convert an event start/end to a UTC timestamp
+
+    Args:
+        value: Event start or end ({"dateTime": ...} or {"date": ...} for all-day events)
+        default_tz: Timezone all-day dates are interpreted in
+
+    Returns:
+        Tuple of (POSIX timestamp, is_all_day)
+    """
+    if value.get("dateTime"):
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).timestamp(), False
+    day = datetime.strptime(value["date"], "%Y-%m-%d")
+    return pytz.timezone(value.get("timeZone") or default_tz).localize(day).timestamp(), True
+
+
+class EventRecord:
+    """Compact copy of the event fields the scheduler tools read"""
+
+    __slots__ = (
+        "id",
+        "start_ts",
+        "end_ts",
+        "all_day",
+        "summary",
+        "description",
+        "location",
+        "start",
+        "end",
+        "html_link",
+        "transparency",
+        "declined",
+        "recurring_event_id",
+    )
+
+    def __init__(self, item: Dict[str, Any], default_tz: str = "UTC"):
+        self.id: str = item["id"]
+        self.start: Dict[str, str] = item.get("start", {})
+        self.end: Dict[str, str] = item.get("end", self.start)
+        self.start_ts, self.all_day = parse_event_time(self.start, default_tz)
+        self.end_ts, _ = parse_event_time(self.end, default_tz)
+        self.summary: Optional[str] = item.get("summary")
+        self.description: Optional[str] = item.get("description")
+        self.location: Optional[str] = item.get("location")
+        self.html_link: Optional[str] = item.get("htmlLink")
+        self.transparency: str = item.get("transparency", "opaque")
+        self.declined: bool = any(
+            attendee.get("self") and attendee.get("responseStatus") == "declined" for attendee in item.get("attendees", ())
+        )
+        self.recurring_event_id: Optional[str] = item.get("recurringEventId")
+
+    @property
+    def busy(self) -> bool:
+        """Whether the event blocks time the way freeBusy counts it"""
+        return self.transparency != "transparent" and not self.declined
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Event in the Calendar API resource shape get_events returns"""
+        event: Dict[str, Any] = {"id": self.id, "status": "confirmed", "start": self.start, "end": self.end}
+        for key, value in (
+            ("summary", self.summary),
+            ("description", self.description),
+            ("location", self.location),
+            ("htmlLink", self.html_link),
+            ("recurringEventId", self.recurring_event_id),
+        ):
+            if value is not None:
+                event[key] = value
+        if self.transparency != "opaque":
+            event["transparency"] = self.transparency
+        return event
+
+
+class CalendarEventStore:
+    """
+    Events of one calendar, indexed by start time and by text.
+
+    The first query performs a full sync from SYNC_LOOKBACK_DAYS ago to
+    SYNC_LOOKAHEAD_DAYS ahead; later queries only request the delta since the
+    stored syncToken. A 410 from Google (token expired) drops the store and
+    resyncs, as does the window running out ahead of the current time.
+    """
+
+    def __init__(self, calendar_id: str, time_zone: str = "UTC", clock: Callable[[], float] = time.monotonic):
+        self.calendar_id = calendar_id
+        self.time_zone = time_zone or "UTC"
+        self._clock = clock
+        self._events: Dict[str, EventRecord] = {}
+        self._index: List[Tuple[float, str]] = []  # (start_ts, id), sorted
+        self._max_duration = 0.0
+        self._text_index = FuzzyIndex(SEARCH_FIELD_WEIGHTS)
+        self.sync_token: Optional[str] = None
+        self.window_start: Optional[float] = None
+        self.window_end: Optional[float] = None
+        self.last_synced: Optional[float] = None
+        self.watched = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    async def sync(self, call_api: CalendarCaller, access_token: str, force: bool = False) -> None:
+        """
+        Bring the store up to date with Google
+
+        Args:
+            call_api: call_calendar_api-compatible coroutine
+            access_token: User's access token
+            force: Sync even if the last sync was very recent
+        """
+        async with self._lock:
+            interval = WATCHED_SYNC_INTERVAL_SECONDS if self.watched else MIN_SYNC_INTERVAL_SECONDS
+            if not force and self.last_synced is not None and self._clock() - self.last_synced < interval:
+                return
+            if self.window_end is not None and self.window_end < self._horizon(MIN_LOOKAHEAD_DAYS):
+                self._reset()
+            try:
+                await self._sync(call_api, access_token)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 410:
+                    raise
+                logger.info(f"Sync token for calendar {self.calendar_id} expired, running a full sync")
+                self._reset()
+                await self._sync(call_api, access_token)
+            self.last_synced = self._clock()
+
+    async def _sync(self, call_api: CalendarCaller, access_token: str) -> None:
+        params: Dict[str, Any] = {"singleEvents": True, "maxResults": 2500, "fields": SYNC_FIELDS}
+        if self.sync_token:
+            params["syncToken"] = self.sync_token
+        else:
+            now = datetime.now(timezone.utc)
+            window_start, window_end = now - timedelta(days=SYNC_LOOKBACK_DAYS), now + timedelta(days=SYNC_LOOKAHEAD_DAYS)
+            params["timeMin"], params["timeMax"] = window_start.isoformat(), window_end.isoformat()
+            self.window_start, self.window_end = window_start.timestamp(), window_end.timestamp()
+
+        while True:
+            result = await call_api(f"calendars/{self.calendar_id}/events", access_token, method="GET", params=params)
+            for item in result.get("items", []):
+                self._apply(item)
+            if result.get("nextPageToken"):
+                params["pageToken"] = result["nextPageToken"]
+                continue
+            self.sync_token = result.get("nextSyncToken")
+            return
+
+    def _apply(self, item: Dict[str, Any]) -> None:
+        self._remove(item["id"])
+        if item.get("status") == "cancelled" or not item.get("start"):
+            return
+        record = EventRecord(item, self.time_zone)
+        if self.window_end is not None and not (record.start_ts < self.window_end and record.end_ts >= self.window_start):
+            # Deltas can report events moved outside the window; covers() never sends queries there
+            return
+        self._events[record.id] = record
+        insort(self._index, (record.start_ts, record.id))
+        self._max_duration = max(self._max_duration, record.end_ts - record.start_ts)
+        self._text_index.add(
+            record.id, {"summary": record.summary, "location": record.location, "description": record.description}
+        )
+
+    def _remove(self, event_id: str) -> None:
+        record = self._events.pop(event_id, None)
+        if record is not None:
+            position = bisect_left(self._index, (record.start_ts, record.id))
+            del self._index[position]
+            self._text_index.remove(event_id)
+
+    def _reset(self) -> None:
+        self._events.clear()
+        self._index.clear()
+        self._max_duration = 0.0
+        self._text_index.clear()
+        self.sync_token = None
+        self.window_start = None
+        self.window_end = None
+
+    @staticmethod
+    def _horizon(days: float) -> float:
+        return (datetime.now(timezone.utc) + timedelta(days=days)).timestamp()
+
+    def covers(self, time_min: float, time_max: float) -> bool:
+        """Whether [time_min, time_max) is inside the (possibly not yet) synced window"""
+        window_start, window_end = self.window_start, self.window_end
+        if window_end is None or window_end < self._horizon(MIN_LOOKAHEAD_DAYS):
+            # The next sync starts a fresh window
+            window_start, window_end = self._horizon(-SYNC_LOOKBACK_DAYS), self._horizon(SYNC_LOOKAHEAD_DAYS)
+        return window_start <= time_min and time_max <= window_end
+
+    def mark_stale(self) -> None:
+        """Make the next query fetch the delta even if the last sync was very recent"""
+        self.last_synced = None
+
+    def query(self, time_min: float, time_max: float) -> List[EventRecord]:
+        """
+        Events overlapping [time_min, time_max), ordered by start time
+
+        Args:
+            time_min: Range start (POSIX timestamp)
+            time_max: Range end (POSIX timestamp)
+
+        Returns:
+            Matching event records
+        """
+        # Anything starting before time_min - longest event cannot reach into the range
+        low = bisect_left(self._index, (time_min - self._max_duration,))
+        high = bisect_right(self._index, (time_max,))
+        records = (self._events[event_id] for _, event_id in self._index[low:high])
+        return [
+            record
+            for record in records
+            if record.start_ts < time_max and (record.end_ts > time_min or record.end_ts == record.start_ts == time_min)
+        ]
+
+    def search(self, text: str, time_min: float, time_max: float, limit: Optional[int] = None) -> List[EventRecord]:
+        """
+        Fuzzy text search over events overlapping [time_min, time_max)
+
+        Args:
+            text: Words to look for in summary, location and description (typos tolerated)
+            time_min: Range start (POSIX timestamp)
+            time_max: Range end (POSIX timestamp)
+            limit: Maximum number of results
+
+        Returns:
+            Matching event records, best match first
+        """
+        results = []
+        for event_id, _ in self._text_index.search(text, limit=None):
+            record = self._events[event_id]
+            if record.start_ts < time_max and record.end_ts > time_min:
+                results.append(record)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+
+class EventStoreRegistry:
+    """
+    Process-wide CalendarEventStores keyed by (user, calendar).
+
+    Bounded like the calendar caches: a store unused for idle_seconds is
+    dropped, and past max_entries the least recently used one goes. A dropped
+    store simply runs a full sync the next time it is asked for.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_EVENT_STORES,
+        idle_seconds: float = EVENT_STORE_IDLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        # Least recently used first
+        self._stores: "OrderedDict[Tuple[str, str], Tuple[CalendarEventStore, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    def get(self, user_id: str, calendar_id: str, time_zone: str = "UTC") -> CalendarEventStore:
+        now = self._clock()
+        self._evict_idle(now)
+        key = (user_id, calendar_id)
+        entry = self._stores.pop(key, None)
+        store = entry[0] if entry else CalendarEventStore(calendar_id, time_zone)
+        self._stores[key] = (store, now)
+        while len(self._stores) > self.max_entries:
+            self._stores.popitem(last=False)
+        return store
+
+    def mark_stale(self, user_id: str, calendar_id: Optional[str] = None) -> None:
+        for (owner, store_calendar_id), (store, _) in self._stores.items():
+            if owner == user_id and calendar_id in (None, store_calendar_id):
+                store.mark_stale()
+
+    def clear(self) -> None:
+        self._stores.clear()
+
+    def _evict_idle(self, now: float) -> None:
+        while self._stores:
+            _, last_used = next(iter(self._stores.values()))
+            if now - last_used < self.idle_seconds:
+                return
+            self._stores.popitem(last=False)
+
+
+event_stores = EventStoreRegistry()
+
+
+def get_event_store(user_id: str, calendar_id: str, time_zone: str = "UTC") -> CalendarEventStore:
+    """
+    Get the process-wide store for a user's calendar
+
+    Args:
+        user_id: Owner of the calendar
+        calendar_id: Google calendar ID
+        time_zone: Timezone used for all-day events
+
+    Returns:
+        The CalendarEventStore for that calendar
+    """
+    return event_stores.get(user_id, calendar_id, time_zone)
+
+
+def mark_stores_stale(user_id: str, calendar_id: Optional[str] = None) -> None:
+    """
+    Force a delta sync on the next query after the user changed events
+
+    Args:
+        user_id: Owner of the calendars
+        calendar_id: Calendar that changed, or None for all of the user's calendars
+    """
+    event_stores.mark_stale(user_id, calendar_id)
+
+
+def clear_event_stores() -> None:
+    event_stores.clear()
+
+
+async def query_events(
+    call_api: CalendarCaller,
+    access_token: str,
+    user_id: str,
+    calendar_id: str,
+    time_min: datetime,
+    time_max: datetime,
+    resolve_time_zone: Optional[Callable[[], Awaitable[Optional[str]]]] = None,
+    text: Optional[str] = None,
+) -> Optional[List[EventRecord]]:
+    """
+    Answer a range query from the local store, syncing deltas first
+
+    Args:
+        call_api: call_calendar_api-compatible coroutine
+        access_token: User's access token
+        user_id: Owner of the calendar
+        calendar_id: Google calendar ID
+        time_min: Range start (timezone-aware)
+        time_max: Range end (timezone-aware)
+        resolve_time_zone: Looks up the calendar's timezone before the first full sync
+        text: Only return events matching this search text, best match first
+
+    Returns:
+        Event records ordered by start (or relevance with text), or None if the
+        range reaches outside the synced window and must be fetched directly
+    """
+    store = get_event_store(user_id, calendar_id)
+    if not store.covers(time_min.timestamp(), time_max.timestamp()):
+        return None
+    if store.sync_token is None and resolve_time_zone is not None:
+        store.time_zone = await resolve_time_zone() or "UTC"
+    await store.sync(call_api, access_token)
+    if text is not None:
+        return store.search(text, time_min.timestamp(), time_max.timestamp())
+    return store.query(time_min.timestamp(), time_max.timestamp())
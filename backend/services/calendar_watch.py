@@ -0,0 +1,265 @@
+"""
+Calendar Watch Channels
+Google Calendar events.watch push notifications that keep the local event stores fresh
+"""
+
+import asyncio
+import hmac
+import logging
+import os
+import secrets
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+try:
+    from services.calendar_event_store import get_event_store, mark_stores_stale
+    from services.google_http import BearerAuth, get_google_client
+except ImportError:
+    from backend.services.calendar_event_store import get_event_store, mark_stores_stale
+    from backend.services.google_http import BearerAuth, get_google_client
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+
+# Public HTTPS address Google posts notifications to; watching is off without it
+WEBHOOK_URL_ENV = "GOOGLE_CALENDAR_WEBHOOK_URL"
+# Requested channel lifetime (Google caps events channels at about a week)
+CHANNEL_TTL_SECONDS = 7 * 24 * 3600
+# Channels are replaced when they have less than this left
+RENEW_BEFORE_SECONDS = 6 * 3600
+RENEW_INTERVAL_SECONDS = 15 * 60
+# After a failed watch request, don't retry for this long
+REGISTER_RETRY_SECONDS = 600
+
+# async (user_id) -> access token or None
+TokenProvider = Callable[[str], Awaitable[Optional[str]]]
+# (user_id, calendar_id) -> None, called when a calendar changed
+ChangeListener = Callable[[str, str], None]
+
+
+@dataclass
+class WatchChannel:
+    """An open events.watch channel"""
+
+    id: str
+    resource_id: str
+    user_id: str
+    calendar_id: str
+    token: str
+    expiration: float  # POSIX seconds
+
+
+class CalendarWatchRegistry:
+    """
+    Opens, tracks, renews and closes events.watch channels, and turns incoming
+    notifications into invalidations of the matching user's calendar data.
+
+    Each channel carries a random token that Google echoes back in
+    X-Goog-Channel-Token, so notifications for unknown channels or with the
+    wrong token are rejected.
+    """
+
+    def __init__(
+        self,
+        webhook_url: Optional[str] = None,
+        ttl_seconds: int = CHANNEL_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.webhook_url = webhook_url if webhook_url is not None else os.getenv(WEBHOOK_URL_ENV)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._channels: Dict[str, WatchChannel] = {}
+        self._by_calendar: Dict[Tuple[str, str], str] = {}
+        self._failed: Dict[Tuple[str, str], float] = {}
+        self._listeners: List[ChangeListener] = [mark_stores_stale]
+        self._renewal_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.webhook_url)
+
+    def channels(self) -> List[WatchChannel]:
+        return list(self._channels.values())
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """Also call listener(user_id, calendar_id) whenever a watched calendar changes"""
+        self._listeners.append(listener)
+
+    def is_watched(self, user_id: str, calendar_id: str) -> bool:
+        channel_id = self._by_calendar.get((user_id, calendar_id))
+        return channel_id is not None and self._channels[channel_id].expiration > self._clock()
+
+    async def ensure_watched(self, user_id: str, calendar_id: str, access_token: str) -> Optional[WatchChannel]:
+        """
+        Open a channel for a calendar unless one is already open (or recently failed)
+
+        Args:
+            user_id: Owner of the calendar
+            calendar_id: Google calendar ID
+            access_token: User's access token
+
+        Returns:
+            The open channel, or None if watching is disabled or unavailable
+        """
+        if not self.enabled:
+            return None
+        key = (user_id, calendar_id)
+        if self.is_watched(user_id, calendar_id):
+            return self._channels[self._by_calendar[key]]
+        if self._clock() - self._failed.get(key, float("-inf")) < REGISTER_RETRY_SECONDS:
+            return None
+        try:
+            return await self.register(user_id, calendar_id, access_token)
+        except Exception as e:
+            logger.warning(f"Could not watch calendar {calendar_id} for user {user_id}: {str(e)}")
+            self._failed[key] = self._clock()
+            return None
+
+    async def register(self, user_id: str, calendar_id: str, access_token: str) -> WatchChannel:
+        """
+        Open an events.watch channel, replacing any existing one for the calendar
+
+        Args:
+            user_id: Owner of the calendar
+            calendar_id: Google calendar ID
+            access_token: User's access token
+
+        Returns:
+            The new channel
+        """
+        body = {
+            "id": str(uuid.uuid4()),
+            "type": "web_hook",
+            "address": self.webhook_url,
+            "token": secrets.token_urlsafe(24),
+            "params": {"ttl": str(self.ttl_seconds)},
+        }
+        response = await get_google_client().post(
+            f"{CALENDAR_API_URL}/calendars/{calendar_id}/events/watch", json=body, auth=BearerAuth(access_token)
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        expiration = int(data["expiration"]) / 1000 if data.get("expiration") else self._clock() + self.ttl_seconds
+        channel = WatchChannel(body["id"], data["resourceId"], user_id, calendar_id, body["token"], expiration)
+        previous = self._by_calendar.get((user_id, calendar_id))
+        self._channels[channel.id] = channel
+        self._by_calendar[(user_id, calendar_id)] = channel.id
+        self._failed.pop((user_id, calendar_id), None)
+        get_event_store(user_id, calendar_id).watched = True
+        if previous and previous in self._channels:
+            await self._stop(self._channels.pop(previous), access_token)
+        logger.info(f"Watching calendar {calendar_id} for user {user_id} until {time.ctime(expiration)}")
+        return channel
+
+    async def unregister(self, channel_id: str, access_token: str) -> None:
+        """Close a channel and stop trusting push notifications for its calendar"""
+        channel = self._channels.pop(channel_id, None)
+        if channel is None:
+            return
+        key = (channel.user_id, channel.calendar_id)
+        if self._by_calendar.get(key) == channel_id:
+            del self._by_calendar[key]
+            get_event_store(*key).watched = False
+        await self._stop(channel, access_token)
+
+    async def _stop(self, channel: WatchChannel, access_token: str) -> None:
+        try:
+            response = await get_google_client().post(
+                f"{CALENDAR_API_URL}/channels/stop",
+                json={"id": channel.id, "resourceId": channel.resource_id},
+                auth=BearerAuth(access_token),
+            )
+            response.raise_for_status()
+        except Exception as e:
+            # The channel expires on its own; a failed stop only means a few ignored notifications
+            logger.warning(f"Could not stop watch channel {channel.id}: {str(e)}")
+
+    def handle_notification(self, headers: Mapping[str, str]) -> bool:
+        """
+        Process a push notification
+
+        Args:
+            headers: Request headers (X-Goog-Channel-ID, X-Goog-Channel-Token,
+                X-Goog-Resource-ID, X-Goog-Resource-State)
+
+        Returns:
+            True if the notification belongs to a known channel, False to reject it
+        """
+        channel = self._channels.get(headers.get("X-Goog-Channel-ID", ""))
+        if channel is None:
+            return False
+        if not hmac.compare_digest(headers.get("X-Goog-Channel-Token", ""), channel.token):
+            return False
+        if headers.get("X-Goog-Resource-ID", channel.resource_id) != channel.resource_id:
+            return False
+
+        # "sync" only confirms the channel was created; "exists"/"not_exists" mean events changed
+        if headers.get("X-Goog-Resource-State") != "sync":
+            for listener in self._listeners:
+                try:
+                    listener(channel.user_id, channel.calendar_id)
+                except Exception as e:
+                    logger.error(f"Calendar change listener failed: {str(e)}")
+        return True
+
+    async def renew_expiring(self, token_provider: TokenProvider, within_seconds: float = RENEW_BEFORE_SECONDS) -> int:
+        """
+        Replace channels that expire soon
+
+        Args:
+            token_provider: Returns a user's access token
+            within_seconds: Renew channels expiring within this long
+
+        Returns:
+            Number of channels renewed
+        """
+        renewed = 0
+        now = self._clock()
+        for channel in self.channels():
+            current = self._by_calendar.get((channel.user_id, channel.calendar_id)) == channel.id
+            if not current or channel.expiration - now > within_seconds:
+                continue
+            access_token = await token_provider(channel.user_id)
+            if not access_token:
+                # Without a token the channel can't be renewed; let it lapse and fall back to polling
+                self._channels.pop(channel.id, None)
+                self._by_calendar.pop((channel.user_id, channel.calendar_id), None)
+                get_event_store(channel.user_id, channel.calendar_id).watched = False
+                continue
+            try:
+                await self.register(channel.user_id, channel.calendar_id, access_token)
+                renewed += 1
+            except Exception as e:
+                logger.warning(f"Could not renew watch channel {channel.id}: {str(e)}")
+        return renewed
+
+    def start(self, token_provider: TokenProvider, interval: float = RENEW_INTERVAL_SECONDS) -> None:
+        """Start renewing channels in the background on the running event loop"""
+        if self._renewal_task is not None and not self._renewal_task.done():
+            return
+
+        async def renew_loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.renew_expiring(token_provider)
+                except Exception as e:
+                    logger.error(f"Watch channel renewal failed: {str(e)}")
+
+        self._renewal_task = asyncio.get_running_loop().create_task(renew_loop())
+
+    async def stop(self) -> None:
+        if self._renewal_task is not None:
+            self._renewal_task.cancel()
+            try:
+                await self._renewal_task
+            except asyncio.CancelledError:
+                pass
+            self._renewal_task = None
+
+
+calendar_watch_registry = CalendarWatchRegistry()
@@ -0,0 +1,273 @@
+"""
+Completion Time Estimates
+Batched LLM estimates of assignment work time, cached by content and saved to user_tasks
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+try:
+    from services.course_dashboard import course_dashboards
+except ImportError:
+    from backend.services.course_dashboard import course_dashboards
+
+try:
+    # Try relative import (for CI/normal backend execution)
+    from config.supabase import get_supabase_service_client
+except ImportError:
+    # Fall back to absolute import (for test scripts run from project root)
+    try:
+        from backend.config.supabase import get_supabase_service_client
+    except ImportError:
+        logging.warning("Could not import supabase config. Estimates will not be saved.")
+
+        def get_supabase_service_client():
+            return None
+
+
+logger = logging.getLogger(__name__)
+
+# Assignments per model call, and calls in flight at once
+ESTIMATE_BATCH_SIZE = 20
+ESTIMATE_CONCURRENCY = 4
+# Notes beyond this many characters are cut from the prompt
+MAX_NOTES_CHARS = 1500
+# Estimates are clamped to this range
+MIN_ESTIMATE_MINUTES = 5
+MAX_ESTIMATE_MINUTES = 100 * 60
+
+
+def page_revision(page: Dict[str, Any]) -> Optional[str]:
+    """Page ID and last_edited_time, which changes with any property or content edit"""
+    return f"{page['id']}@{page['last_edited_time']}" if page.get("id") and page.get("last_edited_time") else None
+
+
+@dataclass(frozen=True)
+class EstimateInput:
+    """What the estimate depends on"""
+
+    name: str
+    description: str = ""
+    status: str = ""
+    notes: str = ""
+    due_date: Optional[str] = None
+    revision: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """
+        Cache key; estimates are reused until the page's revision changes or,
+        without one, until one of the content fields does. A revision key is
+        known before the notes are fetched.
+        """
+        if self.revision:
+            content = json.dumps(["revision", self.revision])
+        else:
+            content = json.dumps([self.name, self.description or "", self.status or "", self.notes or ""])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def render(self, number: int) -> str:
+        notes = (self.notes or "")[:MAX_NOTES_CHARS]
+        return "\n".join(
+            [
+                f"[{number}] {self.name}",
+                f"Due date: {self.due_date or 'none'}",
+                f"Status: {self.status or 'unknown'}",
+                f"Description: {self.description or 'none'}",
+                f"Notes: {notes or 'none'}",
+            ]
+        )
+
+
+@dataclass(frozen=True)
+class CompletionEstimate:
+    minutes: int
+    explanation: str
+
+
+class ItemEstimate(BaseModel):
+    index: int = Field(description="Number of the assignment in the list")
+    minutes: int = Field(description="Estimated minutes of work left")
+    explanation: str = Field(description="One sentence on why")
+
+
+class EstimateBatch(BaseModel):
+    estimates: List[ItemEstimate]
+
+
+class CompletionEstimateCache:
+    """LRU cache of estimates keyed by EstimateInput.key"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompletionEstimate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CompletionEstimate]:
+        with self._lock:
+            estimate = self._entries.get(key)
+            if estimate is not None:
+                self._entries.move_to_end(key)
+            return estimate
+
+    def put(self, key: str, estimate: CompletionEstimate) -> None:
+        with self._lock:
+            self._entries[key] = estimate
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+completion_estimate_cache = CompletionEstimateCache()
+
+
+class CompletionTimeEstimator:
+    """
+    Estimates many assignments with a few structured-output model calls.
+
+    Cached estimates are returned without asking the model; the rest are sent
+    ESTIMATE_BATCH_SIZE at a time, numbered, and matched back by number.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        prompt: Any,
+        cache: CompletionEstimateCache = completion_estimate_cache,
+        batch_size: int = ESTIMATE_BATCH_SIZE,
+        max_concurrency: int = ESTIMATE_CONCURRENCY,
+    ):
+        self._model = llm.with_structured_output(EstimateBatch)
+        self.prompt = prompt
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+    async def estimate(
+        self, items: Sequence[EstimateInput], current_date: Optional[str] = None
+    ) -> List[Optional[CompletionEstimate]]:
+        """
+        Estimate the remaining work time of assignments
+
+        Args:
+            items: Assignments to estimate
+            current_date: Date shown to the model (defaults to today, UTC)
+
+        Returns:
+            One estimate per item in input order; None where the model gave none
+        """
+        current_date = current_date or datetime.now(timezone.utc).date().isoformat()
+        pending: Dict[str, EstimateInput] = {}
+        for item in items:
+            if self.cache.get(item.key) is None:
+                pending.setdefault(item.key, item)
+
+        batches = list(pending.values())
+        batches = [batches[i : i + self.batch_size] for i in range(0, len(batches), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: List[EstimateInput]) -> None:
+            async with semaphore:
+                try:
+                    assignments = "\n\n".join(item.render(number) for number, item in enumerate(batch, 1))
+                    result = await self._model.ainvoke(self.prompt.format(assignments=assignments, current_date=current_date))
+                except Exception as e:
+                    logger.error(f"Error estimating {len(batch)} assignments: {str(e)}")
+                    return
+            for estimate in result.estimates:
+                if 1 <= estimate.index <= len(batch):
+                    minutes = min(max(int(estimate.minutes), MIN_ESTIMATE_MINUTES), MAX_ESTIMATE_MINUTES)
+                    self.cache.put(batch[estimate.index - 1].key, CompletionEstimate(minutes, estimate.explanation))
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+        return [self.cache.get(item.key) for item in items]
+
+
+async def save_estimates(user_id: str, estimates: Sequence[Dict[str, Any]]) -> int:
+    """
+    Write estimates to user_tasks.estimated_duration_minutes
+
+    Rows are matched by notion_page_id; assignments without a row get one.
+
+    Args:
+        user_id: Owner of the tasks
+        estimates: Dicts with notion_page_id, title, minutes and optionally
+            description and due_date
+
+    Returns:
+        Number of rows written
+    """
+    if not estimates:
+        return 0
+    try:
+        supabase = get_supabase_service_client()
+        rows = await supabase.query("user_tasks", "GET", filters={"user_id": user_id}) if supabase else None
+    except Exception as e:
+        logger.error(f"Error loading tasks for user {user_id}: {str(e)}")
+        return 0
+    if rows is None:
+        return 0
+    row_ids = {row.get("notion_page_id"): row["id"] for row in rows if row.get("notion_page_id")}
+    now = datetime.now(timezone.utc).isoformat()
+
+    async def write(estimate: Dict[str, Any]) -> bool:
+        try:
+            row_id = row_ids.get(estimate["notion_page_id"])
+            if row_id:
+                data = {"estimated_duration_minutes": estimate["minutes"], "updated_at": now}
+                await supabase.query("user_tasks", "PATCH", data=data, filters={"id": row_id})
+            else:
+                data = {
+                    "user_id": user_id,
+                    "title": estimate["title"],
+                    "description": estimate.get("description") or None,
+                    "due_date": estimate.get("due_date"),
+                    "notion_page_id": estimate["notion_page_id"],
+                    "estimated_duration_minutes": estimate["minutes"],
+                }
+                await supabase.query("user_tasks", "POST", data=data)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving estimate for {estimate.get('title')}: {str(e)}")
+            return False
+
+    written = sum(await asyncio.gather(*(write(estimate) for estimate in estimates)))
+    # Dashboards include the estimated upcoming load
+    course_dashboards.invalidate(user_id)
+    return written
+
+
+async def load_estimates(user_id: str) -> Dict[str, int]:
+    """
+    Saved estimates of a user's assignments
+
+    Args:
+        user_id: Owner of the tasks
+
+    Returns:
+        Mapping of Notion page ID to estimated minutes
+    """
+    try:
+        supabase = get_supabase_service_client()
+        rows = await supabase.query("user_tasks", "GET", filters={"user_id": user_id}) if supabase else []
+    except Exception as e:
+        logger.error(f"Error loading estimates for user {user_id}: {str(e)}")
+        return {}
+    return {
+        row["notion_page_id"]: int(row["estimated_duration_minutes"])
+        for row in rows or []
+        if row.get("notion_page_id") and row.get("estimated_duration_minutes")
+    }
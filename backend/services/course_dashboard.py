@@ -0,0 +1,173 @@
+"""
+Course Progress Dashboard
+Per-course assignment counts, overdue items and upcoming load from one listing of courses and assignments
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import pytz
+
+# Statuses that count as finished
+COMPLETED_STATUSES = frozenset({"Done", "Submitted", "Mark received"})
+# Study minutes assumed for assignments without a saved estimate
+DEFAULT_ASSIGNMENT_MINUTES = 120
+# Bucket for assignments without a course, or related to a course that isn't listed
+NO_COURSE = "No course"
+
+
+def assignment_due(page: Dict[str, Any], tz: pytz.BaseTzInfo) -> Optional[datetime]:
+    """Due date of an assignment page; date-only due dates mean the end of that day in tz"""
+    due = ((page.get("properties", {}).get("Due date") or {}).get("date") or {}).get("start")
+    if not due:
+        return None
+    if len(due) == 10:
+        return tz.localize(datetime.fromisoformat(due).replace(hour=23, minute=59))
+    parsed = datetime.fromisoformat(due.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else tz.localize(parsed)
+
+
+def build_course_dashboard(
+    course_pages: Dict[str, Dict[str, Any]],
+    assignment_pages: Iterable[Dict[str, Any]],
+    now: datetime,
+    time_zone: str = "UTC",
+    estimates: Optional[Dict[str, int]] = None,
+    upcoming_days: int = 7,
+) -> Dict[str, Any]:
+    """
+    Join assignments to their courses by relation ID and summarize each course
+
+    Args:
+        course_pages: Course name to course page, as get_all_course_pages returns
+        assignment_pages: Every assignment page
+        now: Current time (timezone-aware)
+        time_zone: Timezone date-only due dates are read in
+        estimates: Saved study minutes per assignment page ID
+        upcoming_days: Window for the upcoming load
+
+    Returns:
+        Dictionary with "courses" (course, course_id, total, completed, completion_rate,
+        by_status, overdue, upcoming), overall "totals", "upcoming_days" and "generated_at"
+    """
+    tz = pytz.timezone(time_zone)
+    estimates = estimates or {}
+    horizon = now + timedelta(days=upcoming_days)
+    names = {page["id"]: name for name, page in course_pages.items()}
+    courses: Dict[Optional[str], Dict[str, Any]] = {
+        course_id: {"course": name, "course_id": course_id, "by_status": Counter(), "overdue": [], "upcoming": []}
+        for course_id, name in names.items()
+    }
+
+    for page in assignment_pages:
+        properties = page.get("properties", {})
+        relations = (properties.get("Course") or {}).get("relation") or []
+        course_id = next((relation["id"] for relation in relations if relation.get("id") in names), None)
+        if course_id not in courses:
+            courses[course_id] = {
+                "course": NO_COURSE,
+                "course_id": None,
+                "by_status": Counter(),
+                "overdue": [],
+                "upcoming": [],
+            }
+        course = courses[course_id]
+
+        title = "".join(part.get("plain_text", "") for part in (properties.get("Assignment Name") or {}).get("title") or [])
+        status = ((properties.get("Status") or {}).get("status") or {}).get("name") or "Not started"
+        course["by_status"][status] += 1
+        due = assignment_due(page, tz)
+        if status in COMPLETED_STATUSES or due is None:
+            continue
+        item = {"assignment": title, "assignment_id": page["id"], "due": due.isoformat(), "status": status}
+        if due < now:
+            course["overdue"].append({**item, "days_overdue": (now - due).days})
+        elif due <= horizon:
+            course["upcoming"].append(
+                {**item, "estimated_minutes": int(estimates.get(page["id"], DEFAULT_ASSIGNMENT_MINUTES))}
+            )
+
+    summaries = []
+    totals: Counter = Counter()
+    for course in courses.values():
+        total = sum(course["by_status"].values())
+        completed = sum(count for status, count in course["by_status"].items() if status in COMPLETED_STATUSES)
+        course["overdue"].sort(key=lambda item: item["due"])
+        course["upcoming"].sort(key=lambda item: item["due"])
+        summaries.append(
+            {
+                "course": course["course"],
+                "course_id": course["course_id"],
+                "total": total,
+                "completed": completed,
+                "completion_rate": round(completed / total, 3) if total else None,
+                "by_status": dict(course["by_status"]),
+                "overdue": course["overdue"],
+                "upcoming": {
+                    "count": len(course["upcoming"]),
+                    "estimated_minutes": sum(item["estimated_minutes"] for item in course["upcoming"]),
+                    "assignments": course["upcoming"],
+                },
+            }
+        )
+        totals.update(
+            total=total,
+            completed=completed,
+            overdue=len(course["overdue"]),
+            upcoming=len(course["upcoming"]),
+            upcoming_minutes=sum(item["estimated_minutes"] for item in course["upcoming"]),
+        )
+
+    # Most pressing courses first; the no-course bucket last
+    summaries.sort(key=lambda c: (c["course_id"] is None, -len(c["overdue"]), -c["upcoming"]["count"], c["course"]))
+    return {
+        "generated_at": now.isoformat(),
+        "upcoming_days": upcoming_days,
+        "courses": summaries,
+        "totals": dict(totals),
+    }
+
+
+class CourseDashboardCache:
+    """
+    Built dashboards per (user, upcoming_days).
+
+    NotionAPI invalidates a user's entries on every assignment or course write;
+    entries also expire after ttl_seconds so edits made directly in Notion and
+    newly overdue assignments show up.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, upcoming_days: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get((scope, upcoming_days))
+            if entry is None:
+                return None
+            if self._clock() - entry[0] > self.ttl_seconds:
+                del self._entries[(scope, upcoming_days)]
+                return None
+            return entry[1]
+
+    def put(self, scope: str, upcoming_days: int, dashboard: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[(scope, upcoming_days)] = (self._clock(), dashboard)
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == scope]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+course_dashboards = CourseDashboardCache()
@@ -15,6 +15,7 @@ from config.supabase import (
 )
 from models.user import UserCreate, UserLogin, UserResponse
 from utils.auth import get_password_hash, verify_password
+from services.user_profile import scheduling_preferences
 
 
 class DatabaseService:
@@ -54,7 +55,9 @@ class DatabaseService:
 
     async def update_user_preferences(self, user_id: str, preferences: Dict[str, Any]) -> bool:
         """Update user preferences"""
-        return await self._update_user_preferences_supabase(user_id, preferences)
+        updated = await self._update_user_preferences_supabase(user_id, preferences)
+        scheduling_preferences.invalidate(user_id)
+        return updated
 
     # Supabase Implementation Methods
 
@@ -5,13 +5,17 @@ Handles the complete OAuth flow for Google Calendar integration
 
 import os
 import secrets
-import httpx
 import logging
 from typing import Dict, Optional, Any
 from urllib.parse import urlencode
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
+try:
+    from services.google_http import BearerAuth, get_google_client
+except ImportError:
+    from backend.services.google_http import BearerAuth, get_google_client
+
 # Handle supabase import gracefully
 try:
     from config.supabase import get_supabase_service_client
@@ -133,33 +137,33 @@ class GoogleCalendarOAuthService:
                 "client_secret": self.client_secret,
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.token_endpoint,
-                    data=data,
-                    headers={
-                        "Accept": "application/json",
-                        "Content-Type": "application/x-www-form-urlencoded",
-                    },
-                )
+            client = get_google_client()
+            response = await client.post(
+                self.token_endpoint,
+                data=data,
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+            )
 
-                if response.status_code != 200:
-                    logger.error(f"Token exchange failed: {response.status_code} - {response.text}")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Failed to exchange code for token: {response.text}",
-                    )
+            if response.status_code != 200:
+                logger.error(f"Token exchange failed: {response.status_code} - {response.text}")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Failed to exchange code for token: {response.text}",
+                )
 
-                token_data = response.json()
+            token_data = response.json()
 
-                # Get user info from Google
-                user_info = await self._get_user_info(token_data["access_token"])
+            # Get user info from Google
+            user_info = await self._get_user_info(token_data["access_token"])
 
-                # Add user_id and user_info to response for easier handling
-                token_data["user_id"] = user_id
-                token_data["user_info"] = user_info
+            # Add user_id and user_info to response for easier handling
+            token_data["user_id"] = user_id
+            token_data["user_info"] = user_info
 
-                return token_data
+            return token_data
 
         except Exception as e:
             logger.error(f"Error exchanging code for token: {str(e)}")
@@ -176,19 +180,14 @@ class GoogleCalendarOAuthService:
             User info from Google
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.userinfo_endpoint,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                    },
-                )
+            client = get_google_client()
+            response = await client.get(self.userinfo_endpoint, auth=BearerAuth(access_token))
 
-                if response.status_code != 200:
-                    logger.error(f"Failed to get user info: {response.status_code} - {response.text}")
-                    return {}
+            if response.status_code != 200:
+                logger.error(f"Failed to get user info: {response.status_code} - {response.text}")
+                return {}
 
-                return response.json()
+            return response.json()
 
         except Exception as e:
             logger.error(f"Error getting user info: {str(e)}")
@@ -212,24 +211,24 @@ class GoogleCalendarOAuthService:
                 "client_secret": self.client_secret,
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.token_endpoint,
-                    data=data,
-                    headers={
-                        "Accept": "application/json",
-                        "Content-Type": "application/x-www-form-urlencoded",
-                    },
-                )
+            client = get_google_client()
+            response = await client.post(
+                self.token_endpoint,
+                data=data,
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+            )
 
-                if response.status_code != 200:
-                    logger.error(f"Token refresh failed: {response.status_code} - {response.text}")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Failed to refresh token: {response.text}",
-                    )
+            if response.status_code != 200:
+                logger.error(f"Token refresh failed: {response.status_code} - {response.text}")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Failed to refresh token: {response.text}",
+                )
 
-                return response.json()
+            return response.json()
 
         except Exception as e:
             logger.error(f"Error refreshing token: {str(e)}")
@@ -420,6 +419,7 @@ class GoogleCalendarOAuthService:
                             )
 
                             access_token = new_token_data["access_token"]
+                            token_expires_at = new_expires_at.isoformat()
                             logger.info(f"Successfully refreshed token for user {user_id}")
 
                         except Exception as refresh_error:
@@ -430,6 +430,7 @@ class GoogleCalendarOAuthService:
                 return {
                     "access_token": access_token,
                     "refresh_token": refresh_token,
+                    "token_expires_at": token_expires_at,
                 }
 
             return None
@@ -466,18 +467,15 @@ class GoogleCalendarOAuthService:
                 }
 
             # Test by fetching calendar list
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://www.googleapis.com/calendar/v3/users/me/calendarList",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                    },
-                )
+            client = get_google_client()
+            response = await client.get(
+                "https://www.googleapis.com/calendar/v3/users/me/calendarList", auth=BearerAuth(access_token)
+            )
 
-                if response.status_code == 200:
-                    return {"success": True, "data": response.json()}
-                else:
-                    return {"success": False, "error": response.text}
+            if response.status_code == 200:
+                return {"success": True, "data": response.json()}
+            else:
+                return {"success": False, "error": response.text}
 
         except Exception as e:
             logger.error(f"Error testing Google Calendar connection: {str(e)}")
@@ -0,0 +1,97 @@
+"""
+Google HTTP Client
+Shared, pooled HTTP/2 client for Google Calendar and OAuth endpoints
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from typing import Any, Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+GOOGLE_HTTP_TIMEOUT = float(os.getenv("GOOGLE_HTTP_TIMEOUT", "15"))
+GOOGLE_HTTP_CONNECT_TIMEOUT = float(os.getenv("GOOGLE_HTTP_CONNECT_TIMEOUT", "5"))
+GOOGLE_HTTP_MAX_CONNECTIONS = int(os.getenv("GOOGLE_HTTP_MAX_CONNECTIONS", "20"))
+GOOGLE_HTTP_MAX_KEEPALIVE = int(os.getenv("GOOGLE_HTTP_MAX_KEEPALIVE", "10"))
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip",
+    # Google only serves gzip to user agents that mention it
+    "User-Agent": "flowstate-backend (gzip)",
+}
+
+
+class BearerAuth(httpx.Auth):
+    """Per-request OAuth bearer token, so one pooled client can serve every user"""
+
+    def __init__(self, access_token: str):
+        self.access_token = access_token
+
+    def auth_flow(self, request: httpx.Request):
+        request.headers["Authorization"] = f"Bearer {self.access_token}"
+        yield request
+
+
+# httpx clients are bound to the event loop they were first used on, so keep one per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_overrides: Dict[str, Any] = {}
+
+
+def _build_client() -> httpx.AsyncClient:
+    options: Dict[str, Any] = {
+        "http2": HTTP2_AVAILABLE,
+        "headers": DEFAULT_HEADERS,
+        "timeout": httpx.Timeout(GOOGLE_HTTP_TIMEOUT, connect=GOOGLE_HTTP_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(
+            max_connections=GOOGLE_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=GOOGLE_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=30,
+        ),
+    }
+    options.update(_overrides)
+    return httpx.AsyncClient(**options)
+
+
+def get_google_client() -> httpx.AsyncClient:
+    """
+    Get the pooled client for the running event loop
+
+    Returns:
+        Shared httpx.AsyncClient; do not close it, the app lifespan does
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _build_client()
+    return client
+
+
+async def close_google_clients() -> None:
+    """Close the client for the running loop and drop clients of other loops"""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+    _clients.clear()
+
+
+def configure_google_client(**client_options: Any) -> None:
+    """
+    Override client options (e.g. transport=httpx.MockTransport(...) in tests).
+    Clients created afterwards use the new options; call with no arguments to reset.
+    """
+    _overrides.clear()
+    _overrides.update(client_options)
+    _clients.clear()
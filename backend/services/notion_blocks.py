@@ -0,0 +1,252 @@
+"""
+Notion Block Content Service
+Concurrent, depth-limited fetching of page bodies rendered as compact text
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Blocks whose children belong to another page or database, not to this page's body
+_OPAQUE_TYPES = {"child_page", "child_database"}
+
+_LINE_PREFIXES = {
+    "heading_1": "# ",
+    "heading_2": "## ",
+    "heading_3": "### ",
+    "bulleted_list_item": "- ",
+    "quote": "> ",
+}
+
+_MEDIA_TYPES = {"image", "file", "pdf", "video", "audio"}
+
+
+def rich_text_to_plain(rich_text: List[Dict[str, Any]]) -> str:
+    """Concatenate the plain_text of a Notion rich_text array"""
+    return "".join(part.get("plain_text", "") for part in rich_text or [])
+
+
+def block_to_text(block: Dict[str, Any], number: int = 1) -> Optional[str]:
+    """
+    Render a single block as one compact line (or a few, for code)
+
+    Args:
+        block: Notion block object
+        number: Position within a run of numbered_list_item siblings
+
+    Returns:
+        Text for the block, or None if it carries no readable content
+    """
+    block_type = block.get("type")
+    payload = block.get(block_type) or {}
+    text = rich_text_to_plain(payload.get("rich_text"))
+
+    if block_type in _LINE_PREFIXES:
+        return _LINE_PREFIXES[block_type] + text
+    if block_type in ("paragraph", "toggle"):
+        return text or None
+    if block_type == "numbered_list_item":
+        return f"{number}. {text}"
+    if block_type == "to_do":
+        return f"[{'x' if payload.get('checked') else ' '}] {text}"
+    if block_type == "callout":
+        icon = (payload.get("icon") or {}).get("emoji")
+        return f"{icon} {text}" if icon else text
+    if block_type == "code":
+        return f"```{payload.get('language', '')}\n{text}\n```"
+    if block_type == "equation":
+        return payload.get("expression")
+    if block_type == "divider":
+        return "---"
+    if block_type == "child_page":
+        return f"[page: {payload.get('title', '')}]"
+    if block_type == "child_database":
+        return f"[database: {payload.get('title', '')}]"
+    if block_type in ("bookmark", "embed", "link_preview"):
+        return payload.get("url")
+    if block_type in _MEDIA_TYPES:
+        caption = rich_text_to_plain(payload.get("caption"))
+        source = payload.get(payload.get("type", ""), {}).get("url", "")
+        return f"[{block_type}: {caption or source}]"
+    if block_type == "table_row":
+        return " | ".join(rich_text_to_plain(cell) for cell in payload.get("cells", []))
+    return text or None
+
+
+class BlockContentFetcher:
+    """
+    Walks a page's block tree with several children/list requests in flight at once.
+
+    Every block with children is fetched as soon as its parent level arrives
+    rather than level by level, so a page costs roughly (deepest chain) round
+    trips instead of (number of nested blocks). Pagination of each block's
+    children is followed, and nesting beyond max_depth is not fetched. Blocks
+    whose children could not be fetched are listed in failed_blocks after each
+    fetch.
+    """
+
+    def __init__(self, notion_api, max_workers: Optional[int] = None, max_depth: int = 3, max_blocks: int = 1000):
+        """
+        Args:
+            notion_api: NotionAPI instance for the user
+            max_workers: Concurrent requests; defaults to the Notion rate limit
+            max_depth: Deepest nesting level to fetch (top-level blocks are depth 1)
+            max_blocks: Stop scheduling fetches once this many blocks are loaded
+        """
+        self.notion_api = notion_api
+        self.max_workers = max_workers or notion_api.MAX_REQUESTS_PER_SECOND
+        self.max_depth = max_depth
+        self.max_blocks = max_blocks
+        self.failed_blocks: List[str] = []
+
+    def fetch_tree(self, page_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch a page's blocks with nested children attached under "children"
+
+        Args:
+            page_id: Notion page (or block) ID
+
+        Returns:
+            Top-level blocks of the page; subtrees that failed to load are left
+            out and their parents listed in failed_blocks
+        """
+        children: Dict[str, List[Dict[str, Any]]] = {}
+        loaded = 0
+        self.failed_blocks = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Dict[Future, Tuple[str, int]] = {executor.submit(self._list_children, page_id): (page_id, 1)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parent_id, depth = pending.pop(future)
+                    try:
+                        blocks = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching children of block {parent_id}: {e}")
+                        self.failed_blocks.append(parent_id)
+                        blocks = []
+                    children[parent_id] = blocks
+                    loaded += len(blocks)
+
+                    if depth >= self.max_depth:
+                        continue
+                    for block in blocks:
+                        if loaded >= self.max_blocks:
+                            break
+                        if block.get("has_children") and block.get("type") not in _OPAQUE_TYPES:
+                            pending[executor.submit(self._list_children, block["id"])] = (block["id"], depth + 1)
+
+        def attach(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            for block in blocks:
+                if block["id"] in children:
+                    block["children"] = attach(children[block["id"]])
+            return blocks
+
+        return attach(children.get(page_id, []))
+
+    def fetch_text(self, page_id: str) -> str:
+        """
+        Fetch a page body as compact, indented text
+
+        Args:
+            page_id: Notion page ID
+
+        Returns:
+            The page content, one block per line
+        """
+        lines: List[str] = []
+        self._render(self.fetch_tree(page_id), 0, lines)
+        return "\n".join(lines)
+
+    def _list_children(self, block_id: str) -> List[Dict[str, Any]]:
+        blocks: List[Dict[str, Any]] = []
+        kwargs: Dict[str, Any] = {"block_id": block_id, "page_size": 100}
+        while True:
+            response = self.notion_api.make_notion_request("blocks/children/list", **kwargs)
+            blocks.extend(response.get("results", []))
+            if not response.get("has_more") or not response.get("next_cursor"):
+                return blocks
+            kwargs["start_cursor"] = response["next_cursor"]
+
+    def _render(self, blocks: List[Dict[str, Any]], indent: int, lines: List[str]) -> None:
+        number = 0
+        for block in blocks:
+            number = number + 1 if block.get("type") == "numbered_list_item" else 0
+            text = block_to_text(block, number)
+            if text:
+                prefix = "  " * indent
+                lines.extend(prefix + line for line in text.split("\n"))
+            self._render(block.get("children", []), indent + 1 if text else indent, lines)
+
+
+class PageContentCache:
+    """
+    LRU cache of rendered page bodies keyed by page ID and last_edited_time.
+
+    Notion bumps a page's last_edited_time whenever its content changes, so an
+    entry is valid exactly as long as the timestamp matches.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, page_id: str, last_edited_time: Optional[str]) -> Optional[str]:
+        if not last_edited_time:
+            return None
+        with self._lock:
+            entry = self._entries.get(page_id)
+            if entry is None or entry[0] != last_edited_time:
+                return None
+            self._entries.move_to_end(page_id)
+            return entry[1]
+
+    def put(self, page_id: str, last_edited_time: Optional[str], text: str) -> None:
+        if not last_edited_time:
+            return
+        with self._lock:
+            self._entries[page_id] = (last_edited_time, text)
+            self._entries.move_to_end(page_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+page_content_cache = PageContentCache()
+
+
+def get_page_content(notion_api, page: Dict[str, Any], max_depth: int = 3) -> str:
+    """
+    Get a page body as text, reusing the cached copy if the page is unchanged
+
+    Text missing blocks that failed to load is returned but not cached, so the
+    next call fetches it again.
+
+    Args:
+        notion_api: NotionAPI instance for the user
+        page: Notion page object (needs "id" and ideally "last_edited_time")
+        max_depth: Deepest block nesting level to fetch
+
+    Returns:
+        The page content as compact text
+    """
+    page_id = page["id"]
+    last_edited_time = page.get("last_edited_time")
+    cached = page_content_cache.get(page_id, last_edited_time)
+    if cached is not None:
+        return cached
+
+    fetcher = BlockContentFetcher(notion_api, max_depth=max_depth)
+    text = fetcher.fetch_text(page_id)
+    if not fetcher.failed_blocks:
+        page_content_cache.put(page_id, last_edited_time, text)
+    return text
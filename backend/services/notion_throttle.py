@@ -0,0 +1,237 @@
+"""
+Notion Request Throttling
+Adaptive, per-token concurrency control and retry policy for Notion API calls
+"""
+
+import hashlib
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+from notion_client.errors import APIResponseError, HTTPResponseError, RequestTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Error classes
+THROTTLED = "throttled"
+RETRYABLE = "retryable"
+FATAL = "fatal"
+
+# Notion error codes worth retrying; everything else in the 4xx range is a caller bug
+_RETRYABLE_CODES = {"conflict_error", "internal_server_error", "service_unavailable"}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: Exception) -> Tuple[str, Optional[float]]:
+    """
+    Decide how a failed Notion request should be handled
+
+    Args:
+        error: Exception raised by the Notion client
+
+    Returns:
+        Tuple of (THROTTLED | RETRYABLE | FATAL, Retry-After seconds if given)
+    """
+    if isinstance(error, HTTPResponseError):
+        retry_after = parse_retry_after(error.headers.get("Retry-After")) if error.headers else None
+        code = getattr(error.code, "value", error.code) if isinstance(error, APIResponseError) else None
+        if error.status == 429 or code == "rate_limited":
+            return THROTTLED, retry_after
+        if error.status >= 500 or error.status == 409 or code in _RETRYABLE_CODES:
+            return RETRYABLE, retry_after
+        return FATAL, None
+    if isinstance(error, (RequestTimeoutError, httpx.TimeoutException, httpx.TransportError)):
+        return RETRYABLE, None
+    return FATAL, None
+
+
+class AdaptiveRequestController:
+    """
+    Paces and retries requests made with one Notion token.
+
+    Concurrency follows AIMD: each success adds 1/limit to the concurrency limit
+    (about +1 per round of requests) and each throttle halves it. Request starts
+    are additionally spaced to the average rate Notion allows per integration, and
+    a Retry-After from a 429 pauses every request on the token, not just the one
+    that was throttled.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 3,
+        initial_limit: float = 3,
+        min_limit: float = 1,
+        max_limit: float = 10,
+        max_tries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = rate_per_second
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_tries = max_tries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._clock = clock
+
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._next_start = 0.0
+        self._blocked_until = 0.0
+
+        self._metrics = {
+            "requests": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "throttles": 0,
+            "wait_time_seconds": 0.0,
+        }
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(int(self._limit), 1)
+
+    def call(self, request: Callable[[], Any]) -> Any:
+        """
+        Run a request with pacing, concurrency control and retries
+
+        Args:
+            request: Zero-argument callable performing one Notion API call
+
+        Returns:
+            Whatever the request returns
+
+        Raises:
+            The last error once it is fatal or retries are exhausted
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self._acquire()
+            try:
+                result = request()
+            except Exception as error:
+                self._release()
+                kind, retry_after = classify_error(error)
+                with self._condition:
+                    if kind == THROTTLED:
+                        self._metrics["throttles"] += 1
+                        self._limit = max(self.min_limit, self._limit / 2)
+                        if retry_after is not None:
+                            self._blocked_until = max(self._blocked_until, self._clock() + retry_after)
+                    if kind == FATAL or attempt >= self.max_tries:
+                        self._metrics["failures"] += 1
+                        raise
+                    self._metrics["retries"] += 1
+
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                logger.warning(f"Notion request {kind} ({error}); retry {attempt}/{self.max_tries - 1} in {delay:.2f}s")
+                self._wait(delay)
+                continue
+
+            with self._condition:
+                self._metrics["successes"] += 1
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._release()
+            return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of request counters and the current concurrency state"""
+        with self._condition:
+            snapshot: Dict[str, Any] = dict(self._metrics)
+            snapshot["wait_time_seconds"] = round(snapshot["wait_time_seconds"], 3)
+            snapshot["concurrency_limit"] = self.concurrency_limit
+            snapshot["in_flight"] = self._in_flight
+            return snapshot
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter exponential backoff
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _wait(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._condition:
+            self._metrics["wait_time_seconds"] += seconds
+        self._sleep(seconds)
+
+    def _acquire(self) -> None:
+        started = self._clock()
+        with self._condition:
+            while self._in_flight >= self.concurrency_limit:
+                self._condition.wait()
+            self._in_flight += 1
+            self._metrics["requests"] += 1
+
+            # Reserve the next start slot so concurrent callers stay within the rate
+            now = self._clock()
+            start = max(now, self._next_start, self._blocked_until)
+            self._next_start = start + 1 / self.rate_per_second
+            self._metrics["wait_time_seconds"] += now - started
+        self._wait(start - now)
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+
+_controllers: Dict[str, AdaptiveRequestController] = {}
+_controllers_lock = threading.Lock()
+
+
+def _token_key(token: Optional[str]) -> str:
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+
+
+def get_request_controller(token: Optional[str]) -> AdaptiveRequestController:
+    """
+    Get the process-wide controller for a Notion token
+
+    Args:
+        token: Notion access token the requests are made with
+
+    Returns:
+        Shared AdaptiveRequestController for that token
+    """
+    key = _token_key(token)
+    with _controllers_lock:
+        controller = _controllers.get(key)
+        if controller is None:
+            controller = _controllers[key] = AdaptiveRequestController()
+        return controller
+
+
+def get_request_metrics(token: Optional[str]) -> Dict[str, Any]:
+    """Metrics for the controller of a Notion token"""
+    return get_request_controller(token).metrics()
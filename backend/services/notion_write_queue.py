@@ -0,0 +1,365 @@
+"""
+Notion Write-Behind Queue
+Durable (SQLite) queue that lets agent tools return before Notion acknowledges a write
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    # Try relative import (for CI/normal backend execution)
+    from models.assignment import Assignment
+except ImportError:
+    # Fall back to absolute import (for test scripts run from project root)
+    from backend.models.assignment import Assignment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "notion_write_queue.db")
+
+# How long acknowledged writes are kept around for inspection
+DONE_RETENTION_SECONDS = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notion_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    write_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    page_id TEXT,
+    reported INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notion_writes_due ON notion_writes (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_notion_writes_key ON notion_writes (user_id, write_key, status);
+"""
+
+
+def write_behind_enabled(config: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Whether Notion writes should be queued instead of awaited
+
+    Args:
+        config: RunnableConfig; configurable["write_behind"] overrides the
+            NOTION_WRITE_BEHIND environment variable
+
+    Returns:
+        True if write-behind mode is on
+    """
+    configurable = (config or {}).get("configurable", {}) if isinstance(config, dict) else {}
+    if configurable.get("write_behind") is not None:
+        return bool(configurable["write_behind"])
+    return os.environ.get("NOTION_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+
+
+def _write_key(assignment: Assignment) -> str:
+    return " ".join((assignment.name or "").split()).casefold()
+
+
+def _serialize(assignment: Assignment) -> Dict[str, Any]:
+    data = asdict(assignment)
+    if isinstance(data.get("due_date"), datetime):
+        data["due_date"] = data["due_date"].isoformat()
+    return data
+
+
+def _deserialize(data: Dict[str, Any]) -> Assignment:
+    data = {f.name: data.get(f.name) for f in fields(Assignment) if f.name in data}
+    if data.get("due_date"):
+        data["due_date"] = datetime.fromisoformat(data["due_date"])
+    return Assignment(**data)
+
+
+def _default_notion_api_factory(user_id: str):
+    try:
+        from notion_api import NotionAPI
+    except ImportError:
+        from backend.notion_api import NotionAPI
+    return NotionAPI(user_id=user_id)
+
+
+class NotionWriteQueue:
+    """
+    Durable write-behind queue for assignment creates and updates.
+
+    Writes are stored in SQLite before the tool returns and flushed by a
+    background thread with exponential backoff. A write that is still waiting
+    absorbs later writes to the same assignment, so several edits in one
+    conversation become a single Notion request; it keeps its attempt count and
+    backoff. A write arriving while an earlier one for the same assignment is
+    being sent waits until that one is done or has failed for good. Writes that
+    exhaust their retries are kept until pop_failures() reports them to the user.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        notion_api_factory: Callable[[str], Any] = _default_notion_api_factory,
+        max_attempts: int = 5,
+        base_delay: float = 2.0,
+        poll_interval: float = 1.0,
+        autostart: bool = True,
+    ):
+        self.path = path or os.environ.get("NOTION_WRITE_QUEUE_PATH", DEFAULT_QUEUE_PATH)
+        self.notion_api_factory = notion_api_factory
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.poll_interval = poll_interval
+        self.autostart = autostart
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            # Writes interrupted by a restart are retried
+            self._conn.execute("UPDATE notion_writes SET status = 'pending' WHERE status = 'in_flight'")
+
+    def enqueue(self, user_id: str, operation: str, assignment: Assignment) -> Dict[str, Any]:
+        """
+        Durably queue a create or update and return a provisional result
+
+        Args:
+            user_id: Owner of the Notion workspace
+            operation: 'create' or 'update'
+            assignment: Assignment data to write
+
+        Returns:
+            Provisional result with the queued write id
+        """
+        if operation not in ("create", "update"):
+            raise ValueError(f"Unknown write operation: {operation}")
+
+        key = _write_key(assignment)
+        payload = _serialize(assignment)
+        now = time.time()
+        coalesced = False
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, operation, payload FROM notion_writes "
+                    "WHERE user_id = ? AND write_key = ? AND status = 'pending' ORDER BY id DESC LIMIT 1",
+                    (user_id, key),
+                ).fetchone()
+                if row:
+                    # Fold into the waiting write; a pending create stays a create and retries stay on schedule
+                    merged = json.loads(row["payload"])
+                    merged.update({name: value for name, value in payload.items() if value is not None})
+                    self._conn.execute(
+                        "UPDATE notion_writes SET payload = ?, updated_at = ? WHERE id = ?",
+                        (json.dumps(merged), now, row["id"]),
+                    )
+                    write_id, operation, coalesced = row["id"], row["operation"], True
+                else:
+                    cursor = self._conn.execute(
+                        "INSERT INTO notion_writes (user_id, operation, write_key, payload, next_attempt_at, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (user_id, operation, key, json.dumps(payload), now, now, now),
+                    )
+                    write_id = cursor.lastrowid
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if self.autostart:
+            self.start()
+        self._wakeup.set()
+        return {
+            "status": "queued",
+            "write_id": write_id,
+            "operation": operation,
+            "coalesced": coalesced,
+            "assignment": payload,
+            "message": "Saved. The change will sync to Notion in the background.",
+        }
+
+    def flush(self) -> int:
+        """
+        Send every write that is due
+
+        Returns:
+            Number of writes attempted
+        """
+        now = time.time()
+        with self._lock:
+            # Writes wait for earlier unfinished writes to the same assignment (an update behind its create)
+            rows = self._conn.execute(
+                "SELECT * FROM notion_writes AS w WHERE status = 'pending' AND next_attempt_at <= ? AND NOT EXISTS ("
+                "SELECT 1 FROM notion_writes AS e WHERE e.user_id = w.user_id AND e.write_key = w.write_key "
+                "AND e.id < w.id AND e.status IN ('pending', 'in_flight')) ORDER BY id",
+                (now,),
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE notion_writes SET status = 'in_flight', updated_at = ? WHERE id = ?",
+                    [(now, row["id"]) for row in rows],
+                )
+            self._conn.execute(
+                "DELETE FROM notion_writes WHERE status = 'done' AND updated_at < ?", (now - DONE_RETENTION_SECONDS,)
+            )
+
+        apis: Dict[str, Any] = {}
+        for row in rows:
+            self._send(row, apis)
+        return len(rows)
+
+    def _send(self, row: sqlite3.Row, apis: Dict[str, Any]) -> None:
+        error = None
+        page_id = None
+        try:
+            if row["user_id"] not in apis:
+                apis[row["user_id"]] = self.notion_api_factory(row["user_id"])
+            notion_api = apis[row["user_id"]]
+            assignment = _deserialize(json.loads(row["payload"]))
+            if row["operation"] == "create":
+                result = notion_api.create_assignment_page(assignment)
+            else:
+                result = notion_api.update_assignment_page(assignment)
+            if result is None:
+                error = f"Notion did not accept the {row['operation']} of '{assignment.name}'"
+            else:
+                page_id = result.get("id")
+        except Exception as e:
+            error = str(e)
+
+        now = time.time()
+        with self._lock:
+            if error is None:
+                self._conn.execute(
+                    "UPDATE notion_writes SET status = 'done', page_id = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                    (page_id, now, row["id"]),
+                )
+                return
+
+            attempts = row["attempts"] + 1
+            if attempts >= self.max_attempts:
+                logger.error(f"Giving up on Notion write {row['id']} after {attempts} attempts: {error}")
+                status, next_attempt_at = "failed", now
+            else:
+                logger.warning(f"Notion write {row['id']} failed (attempt {attempts}): {error}")
+                delay = self.base_delay * 2 ** (attempts - 1)
+                status, next_attempt_at = "pending", now + random.uniform(delay / 2, delay)
+            self._conn.execute(
+                "UPDATE notion_writes SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, attempts, error, next_attempt_at, now, row["id"]),
+            )
+
+    def pending(self, user_id: str) -> List[Dict[str, Any]]:
+        """Writes for a user that have not reached Notion yet"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM notion_writes WHERE user_id = ? AND status IN ('pending', 'in_flight') ORDER BY id", (user_id,)
+            ).fetchall()
+        return [self._describe(row) for row in rows]
+
+    def pop_failures(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Failed writes not yet shown to the user; each is returned only once
+
+        Args:
+            user_id: User whose failures to report
+
+        Returns:
+            List of failed write descriptions
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM notion_writes WHERE user_id = ? AND status = 'failed' AND reported = 0 ORDER BY id", (user_id,)
+            ).fetchall()
+            if rows:
+                self._conn.executemany("UPDATE notion_writes SET reported = 1 WHERE id = ?", [(row["id"],) for row in rows])
+        return [self._describe(row) for row in rows]
+
+    @staticmethod
+    def _describe(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "write_id": row["id"],
+            "operation": row["operation"],
+            "name": json.loads(row["payload"]).get("name"),
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "error": row["last_error"],
+        }
+
+    def start(self) -> None:
+        """Start the background flush thread if it is not running"""
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="notion-write-behind", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the background thread after its current flush"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._worker:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing Notion write queue: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+
+_queue: Optional[NotionWriteQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> NotionWriteQueue:
+    """Get the process-wide write queue"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = NotionWriteQueue()
+        return _queue
+
+
+def format_failure_notice(failures: List[Dict[str, Any]]) -> str:
+    """
+    Describe failed background writes so the agent can tell the user
+
+    Args:
+        failures: Output of NotionWriteQueue.pop_failures()
+
+    Returns:
+        Notice text, or an empty string if there were no failures
+    """
+    if not failures:
+        return ""
+    lines = [f"- {failure['operation']} '{failure['name']}': {failure['error']}" for failure in failures]
+    return (
+        "[System notice] These Notion changes from earlier could not be saved after several retries. "
+        "Let the user know and offer to try again:\n" + "\n".join(lines)
+    )
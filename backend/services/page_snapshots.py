@@ -0,0 +1,68 @@
+"""
+Assignment Page Snapshots
+Short-lived cache of the last known field values of Notion assignment pages
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class PageSnapshotCache:
+    """
+    LRU cache of canonical assignment fields per (user, page ID).
+
+    Snapshots are recorded whenever a page is read or written through NotionAPI
+    and let an update send only the properties that differ. They expire after
+    ttl_seconds so edits made directly in Notion are not masked for long.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 4096, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, page_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the snapshot of a page if it is still fresh
+
+        Args:
+            scope: Owner of the page (user ID)
+            page_id: Notion page ID
+
+        Returns:
+            Copy of the cached fields, or None
+        """
+        key = (scope, page_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._clock() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+
+    def put(self, scope: str, page_id: str, fields: Dict[str, Any]) -> None:
+        """Store the current fields of a page"""
+        key = (scope, page_id)
+        with self._lock:
+            self._entries[key] = (self._clock(), dict(fields))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str, page_id: str) -> None:
+        with self._lock:
+            self._entries.pop((scope, page_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+page_snapshots = PageSnapshotCache()
@@ -0,0 +1,212 @@
+"""
+Subtask Tree Service
+Generates subtasks for many assignments in one model call and creates their pages concurrently
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+try:
+    # Try relative import (for CI/normal backend execution)
+    from models.assignment import Assignment
+    from notion_api import is_missing_parent_item
+except ImportError:
+    # Fall back to absolute import (for test scripts run from project root)
+    from backend.models.assignment import Assignment
+    from backend.notion_api import is_missing_parent_item
+
+logger = logging.getLogger(__name__)
+
+MAX_SUBTASKS = 5
+# Subtasks of assignments without a due date are spread over this many days
+UNDATED_SPAN_DAYS = 14
+MAX_NOTES_CHARS = 1500
+
+
+class SubtaskDraft(BaseModel):
+    name: str = Field(description="Short, specific subtask name")
+    due_date: Optional[str] = Field(default=None, description="Due date, YYYY-MM-DD")
+
+
+class AssignmentSubtasks(BaseModel):
+    index: int = Field(description="Number of the assignment in the list")
+    subtasks: List[SubtaskDraft] = Field(description=f"At most {MAX_SUBTASKS} subtasks, in the order to do them")
+
+
+class SubtaskBatch(BaseModel):
+    assignments: List[AssignmentSubtasks]
+
+
+@dataclass
+class SubtaskNode:
+    name: str
+    due_date: str
+    page_id: Optional[str] = None
+    success: Optional[bool] = None
+    parent_linked: bool = True
+    error: Optional[str] = None
+
+
+@dataclass
+class AssignmentNode:
+    assignment: str
+    page_id: str
+    due_date: Optional[str]
+    subtasks: List[SubtaskNode] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def schedule_due_dates(drafts: Sequence[Optional[str]], today: date, parent_due: Optional[date]) -> List[date]:
+    """
+    Due dates for subtasks: the model's where they fall between today and the
+    parent's due date, otherwise evenly spread over that span, never decreasing
+
+    Args:
+        drafts: Due dates proposed by the model (YYYY-MM-DD or None), in order
+        today: Current date
+        parent_due: Parent assignment's due date
+
+    Returns:
+        One date per draft
+    """
+    upper = parent_due or today + timedelta(days=UNDATED_SPAN_DAYS)
+    upper = max(upper, today)
+    span = (upper - today).days
+    dates = []
+    for position, draft in enumerate(drafts, 1):
+        try:
+            proposed = date.fromisoformat(draft[:10]) if draft else None
+        except ValueError:
+            proposed = None
+        if proposed is None or not today <= proposed <= upper:
+            proposed = today + timedelta(days=round(span * position / len(drafts)))
+        if dates and proposed < dates[-1]:
+            proposed = dates[-1]
+        dates.append(proposed)
+    return dates
+
+
+class SubtaskTreeBuilder:
+    """
+    Breaks assignments down into subtasks and creates them as Notion pages.
+
+    Every assignment goes into a single structured-output model call. The child
+    pages are then created concurrently (as many workers as the Notion rate limit
+    allows, so requests queue on the throttle rather than tripping 429s), each
+    related to its parent and to the parent's course, with no course lookups.
+    """
+
+    def __init__(self, notion_api, llm: Any = None, prompt: Any = None, max_workers: Optional[int] = None):
+        self.notion_api = notion_api
+        self._model = llm.with_structured_output(SubtaskBatch) if llm is not None else None
+        self.prompt = prompt
+        self.max_workers = max_workers or notion_api.MAX_REQUESTS_PER_SECOND
+
+    @staticmethod
+    def render(number: int, fields: Dict[str, Any], notes: str) -> str:
+        return "\n".join(
+            [
+                f"[{number}] {fields['name']}",
+                f"Due date: {fields.get('due_date') or 'none'}",
+                f"Current progress: {fields.get('status') or 'unknown'}",
+                f"Description: {fields.get('description') or 'none'}",
+                f"Assignment Notes: {(notes or '')[:MAX_NOTES_CHARS] or 'none'}",
+            ]
+        )
+
+    async def generate(self, parents: Sequence[Tuple[Dict[str, Any], str]], today: date) -> List[List[SubtaskDraft]]:
+        """
+        Ask the model for the subtasks of every assignment at once
+
+        Args:
+            parents: (assignment page, notes text) pairs
+            today: Current date shown to the model
+
+        Returns:
+            Subtask drafts per parent, in input order (empty where the model gave none)
+        """
+        assignments = "\n\n".join(
+            self.render(number, self.notion_api.page_fields(page), notes) for number, (page, notes) in enumerate(parents, 1)
+        )
+        result = await self._model.ainvoke(self.prompt.format(assignments=assignments, current_date=today.isoformat()))
+        drafts: List[List[SubtaskDraft]] = [[] for _ in parents]
+        for item in result.assignments:
+            if 1 <= item.index <= len(parents):
+                drafts[item.index - 1] = [draft for draft in item.subtasks if draft.name.strip()][:MAX_SUBTASKS]
+        return drafts
+
+    def materialize(
+        self, parents: Sequence[Dict[str, Any]], drafts: Sequence[Sequence[SubtaskDraft]], today: date
+    ) -> List[AssignmentNode]:
+        """
+        Create the subtask pages for every parent concurrently
+
+        Args:
+            parents: Parent assignment pages
+            drafts: Subtask drafts per parent
+            today: Earliest allowed due date
+
+        Returns:
+            The tree: one node per parent with its created subtasks
+        """
+        tree: List[AssignmentNode] = []
+        jobs: List[Tuple[SubtaskNode, Assignment, str, str]] = []
+        for page, parent_drafts in zip(parents, drafts):
+            fields = self.notion_api.page_fields(page)
+            parent_due = date.fromisoformat(fields["due_date"]) if fields["due_date"] else None
+            node = AssignmentNode(fields["name"], page["id"], fields["due_date"])
+            relations = page.get("properties", {}).get("Course", {}).get("relation") or []
+            course_id = relations[0]["id"] if relations else ""
+            due_dates = schedule_due_dates([draft.due_date for draft in parent_drafts], today, parent_due)
+            for draft, due in zip(parent_drafts, due_dates):
+                subtask = SubtaskNode(draft.name.strip(), due.isoformat())
+                node.subtasks.append(subtask)
+                assignment = Assignment(
+                    name=subtask.name,
+                    description=f"Subtask of {fields['name']}",
+                    due_date=datetime.combine(due, datetime.min.time()),
+                    course_name="",
+                    priority=fields["priority"] or "Low",
+                )
+                jobs.append((subtask, assignment, course_id, page["id"]))
+            tree.append(node)
+
+        # Once Notion rejects the "Parent item" relation, the rest of the batch is created without it
+        parent_supported = threading.Event()
+        parent_supported.set()
+
+        def create(job: Tuple[SubtaskNode, Assignment, str, str]) -> None:
+            subtask, assignment, course_id, parent_id = job
+            try:
+                page = None
+                if parent_supported.is_set():
+                    try:
+                        page = self.notion_api.create_assignment_page(
+                            assignment, course_page_id=course_id, parent_page_id=parent_id, raise_errors=True
+                        )
+                    except Exception as e:
+                        if not is_missing_parent_item(e):
+                            raise
+                        logger.warning(f"Sub-items are not enabled, creating subtasks without a parent: {e}")
+                        parent_supported.clear()
+                if not parent_supported.is_set():
+                    page = self.notion_api.create_assignment_page(assignment, course_page_id=course_id, raise_errors=True)
+                    subtask.parent_linked = False
+                subtask.page_id = page["id"]
+                subtask.success = True
+            except Exception as e:
+                logger.error(f"Error creating subtask {subtask.name}: {e}")
+                subtask.success = False
+                subtask.error = str(e)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(create, jobs))
+        return tree
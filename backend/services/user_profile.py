@@ -0,0 +1,165 @@
+"""
+User Profile Service
+Scheduling preferences from the profiles table, cached per user
+"""
+
+import asyncio
+import logging
+import time as clock_time
+from dataclasses import dataclass
+from datetime import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    # Try relative import (for CI/normal backend execution)
+    from config.supabase import get_supabase_service_client
+except ImportError:
+    # Fall back to absolute import (for test scripts run from project root)
+    try:
+        from backend.config.supabase import get_supabase_service_client
+    except ImportError:
+        logging.warning("Could not import supabase config. Profile preferences will use defaults.")
+
+        def get_supabase_service_client():
+            return None
+
+
+logger = logging.getLogger(__name__)
+
+# Profiles change rarely; re-read them after this long
+PREFERENCES_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class SchedulingPreferences:
+    """Scheduling columns of public.profiles, with the schema defaults"""
+
+    timezone: str = "UTC"
+    work_hours_start: time = time(9, 0)
+    work_hours_end: time = time(17, 0)
+    break_duration_minutes: int = 15
+    focus_session_duration_minutes: int = 25
+
+    @property
+    def work_hours(self) -> Tuple[time, time]:
+        return self.work_hours_start, self.work_hours_end
+
+    @classmethod
+    def from_profile(cls, profile: Dict[str, object]) -> "SchedulingPreferences":
+        defaults = cls()
+
+        def parse_time(value, default: time) -> time:
+            try:
+                return time.fromisoformat(str(value)) if value else default
+            except ValueError:
+                return default
+
+        return cls(
+            timezone=profile.get("timezone") or defaults.timezone,
+            work_hours_start=parse_time(profile.get("work_hours_start"), defaults.work_hours_start),
+            work_hours_end=parse_time(profile.get("work_hours_end"), defaults.work_hours_end),
+            break_duration_minutes=int(profile.get("break_duration_minutes") or defaults.break_duration_minutes),
+            focus_session_duration_minutes=int(
+                profile.get("focus_session_duration_minutes") or defaults.focus_session_duration_minutes
+            ),
+        )
+
+
+class SchedulingPreferencesCache:
+    """Per-user TTL cache in front of the profiles table"""
+
+    def __init__(self, ttl_seconds: float = PREFERENCES_TTL_SECONDS, clock: Callable[[], float] = clock_time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[str, Tuple[SchedulingPreferences, float]] = {}
+
+    async def get(self, user_id: Optional[str]) -> SchedulingPreferences:
+        """
+        Get a user's scheduling preferences
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The user's preferences, or the schema defaults if they can't be loaded
+        """
+        if not user_id:
+            return SchedulingPreferences()
+        entry = self._entries.get(user_id)
+        if entry and self._clock() - entry[1] < self.ttl_seconds:
+            return entry[0]
+
+        preferences = SchedulingPreferences()
+        try:
+            supabase = get_supabase_service_client()
+            if supabase:
+                result = await supabase.query("profiles", "GET", filters={"id": user_id})
+                if result and len(result) > 0:
+                    preferences = SchedulingPreferences.from_profile(result[0])
+        except Exception as e:
+            logger.error(f"Error loading scheduling preferences for user {user_id}: {str(e)}")
+            return preferences
+
+        self._entries[user_id] = (preferences, self._clock())
+        return preferences
+
+    def put(self, user_id: str, preferences: SchedulingPreferences) -> None:
+        self._entries[user_id] = (preferences, self._clock())
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+scheduling_preferences = SchedulingPreferencesCache()
+
+
+async def find_availability_sharers(emails: Iterable[str], requester_id: str) -> Dict[str, Optional[str]]:
+    """
+    Look up the FlowState users among emails who share their availability with the requester
+
+    A profile shares with everyone when share_availability is set, and with the
+    users whose emails it lists in availability_shared_with otherwise.
+
+    Args:
+        emails: Email addresses to resolve
+        requester_id: User ID of the user asking
+
+    Returns:
+        Mapping of each (lower-cased) email to its user ID, or None if no profile
+        matches or it doesn't share with the requester; the two cases look the same
+    """
+    emails = list(dict.fromkeys(email.strip().lower() for email in emails))
+    try:
+        supabase = get_supabase_service_client()
+    except Exception as e:
+        logger.error(f"Error looking up users by email: {str(e)}")
+        supabase = None
+    if not supabase:
+        return {email: None for email in emails}
+
+    try:
+        requester = await supabase.query("profiles", "GET", filters={"id": requester_id})
+        requester_email = (requester[0].get("email") or "").lower() if requester else ""
+    except Exception as e:
+        logger.error(f"Error loading profile of user {requester_id}: {str(e)}")
+        requester_email = ""
+
+    async def lookup(email: str) -> Optional[str]:
+        try:
+            result = await supabase.query("profiles", "GET", filters={"email": email})
+        except Exception as e:
+            logger.error(f"Error looking up user {email}: {str(e)}")
+            return None
+        if not result:
+            return None
+        profile = result[0]
+        shared_with = {address.lower() for address in profile.get("availability_shared_with") or []}
+        if profile.get("share_availability") or (requester_email and requester_email in shared_with):
+            return profile.get("id")
+        return None
+
+    user_ids = await asyncio.gather(*(lookup(email) for email in emails))
+    return dict(zip(emails, user_ids))
@@ -31,3 +31,138 @@ def test_user_data():
         "password": "testpassword123",
         "username": "testuser",
     }
+
+
+class FakeNotionBackend:
+    """In-memory stand-in for the Notion endpoints NotionAPI.make_notion_request calls."""
+
+    def __init__(self):
+        self.assignment_pages = {}
+        self.course_pages = {}
+        self.blocks = {}
+        self._block_index = {}
+        self.calls = []
+        self._next_id = 0
+        self._edits = 0
+
+    def new_id(self):
+        # Shaped like Notion's UUID IDs
+        self._next_id += 1
+        return f"00000000-0000-4000-8000-{self._next_id:012d}"
+
+    def touch(self, page_id):
+        """Bump a page's last_edited_time, as any property or content edit does"""
+        self._edits += 1
+        if page_id in self.assignment_pages:
+            self.assignment_pages[page_id]["last_edited_time"] = f"2025-01-02T00:00:00.{self._edits:03d}Z"
+
+    def add_course(self, name):
+        page_id = self.new_id()
+        self.course_pages[page_id] = {
+            "id": page_id,
+            "properties": {
+                "Course Name": {"title": [{"plain_text": name, "text": {"content": name}}]},
+                "Currently Enrolled?": {"checkbox": True},
+            },
+        }
+        return page_id
+
+    def add_assignment(self, name, status="Not started", due_date=None, priority="Low", description="", course_id=None):
+        page_id = self.new_id()
+        self.assignment_pages[page_id] = {
+            "id": page_id,
+            "last_edited_time": "2025-01-01T00:00:00.000Z",
+            "properties": {
+                "Assignment Name": {"title": [{"plain_text": name}]},
+                "Status": {"status": {"name": status}},
+                "Due date": {"date": {"start": due_date} if due_date else None},
+                "Priority": {"select": {"name": priority}},
+                "Description": {"rich_text": [{"plain_text": description}] if description else []},
+                "Course": {"relation": [{"id": course_id}] if course_id else []},
+            },
+        }
+        return page_id
+
+    def add_block(self, parent_id, block_type, text="", **payload):
+        block_id = self.new_id()
+        if text:
+            payload["rich_text"] = [{"plain_text": text}]
+        block = {"id": block_id, "type": block_type, block_type: payload, "has_children": False}
+        self.blocks.setdefault(parent_id, []).append(block)
+        self._block_index[block_id] = block
+        self.touch(parent_id)
+        if parent_id in self._block_index:
+            self._block_index[parent_id]["has_children"] = True
+        return block_id
+
+    @staticmethod
+    def _to_stored(properties):
+        # Notion echoes written text back as plain_text
+        stored = {}
+        for key, value in properties.items():
+            value = dict(value)
+            for kind in ("title", "rich_text"):
+                if kind in value:
+                    value[kind] = [{"plain_text": part["text"]["content"]} for part in value[kind]]
+            stored[key] = value
+        return stored
+
+    def __call__(self, operation_type, **kwargs):
+        self.calls.append((operation_type, kwargs))
+        if operation_type == "query_data_source":
+            source = kwargs["data_source_id"]
+            pages = list((self.course_pages if source == "courses-ds" else self.assignment_pages).values())
+            contains = (kwargs.get("filter") or {}).get("title", {}).get("contains")
+            if contains:
+                # Case-insensitive, like Notion's title filter
+                pages = [
+                    page
+                    for page in pages
+                    if contains.lower()
+                    in "".join(part["plain_text"] for part in page["properties"]["Assignment Name"]["title"]).lower()
+                ]
+            return {"results": pages, "has_more": False, "next_cursor": None}
+        if operation_type == "blocks/children/list":
+            blocks = self.blocks.get(kwargs["block_id"], [])
+            start = int(kwargs.get("start_cursor", 0))
+            end = start + kwargs.get("page_size", 100)
+            has_more = end < len(blocks)
+            return {"results": blocks[start:end], "has_more": has_more, "next_cursor": str(end) if has_more else None}
+        if operation_type == "create_page":
+            page_id = self.new_id()
+            page = {"id": page_id, "properties": self._to_stored(kwargs["properties"])}
+            self.assignment_pages[page_id] = page
+            self.touch(page_id)
+            return page
+        if operation_type == "update_page":
+            page = self.assignment_pages[kwargs["page_id"]]
+            page["properties"].update(self._to_stored(kwargs["properties"]))
+            self.touch(kwargs["page_id"])
+            return page
+        raise ValueError(f"Unknown operation type: {operation_type}")
+
+    def writes(self):
+        return [call for call in self.calls if call[0] in ("create_page", "update_page")]
+
+
+@pytest.fixture
+def fake_notion():
+    """Provide a NotionAPI wired to an in-memory Notion backend."""
+    from notion_api import NotionAPI
+    from services.assignment_index import assignment_indexes
+    from services.assignment_sync import course_id_cache
+    from services.course_dashboard import course_dashboards
+
+    assignment_indexes.clear()
+    course_dashboards.clear()
+    course_id_cache.clear()
+    backend = FakeNotionBackend()
+    api = NotionAPI.__new__(NotionAPI)
+    api.user_id = "test-user-123"
+    api.user_token = None
+    api.database_id = "db"
+    api.assignments_data_source_id = "assignments-ds"
+    api.courses_data_source_id = "courses-ds"
+    api.data_source_id = "assignments-ds"
+    api.make_notion_request = backend
+    return api, backend
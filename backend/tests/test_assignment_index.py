@@ -0,0 +1,85 @@
+"""
+Test local resolution of assignment names through the per-user name index.
+"""
+
+from datetime import datetime
+
+from models.assignment import Assignment
+from services.assignment_index import AssignmentNameIndex
+
+
+def populate(backend):
+    physics = backend.add_course("Physics 101")
+    history = backend.add_course("History 210")
+    return {
+        "lab": backend.add_assignment("Lab report 2", course_id=physics),
+        "essay": backend.add_assignment("Essay", course_id=history),
+        "problems": backend.add_assignment("Thermodynamics problem set", course_id=physics),
+        "lab 1": backend.add_assignment("Lab report", course_id=physics),
+    }
+
+
+def test_typos_and_paraphrases_resolve_without_notion_queries(fake_notion):
+    api, backend = fake_notion
+    ids = populate(backend)
+
+    assert api.find_assignment_page("Essay")["id"] == ids["essay"]
+    backend.calls.clear()
+
+    assert api.find_assignment_page("the history essay")["id"] == ids["essay"]
+    assert api.find_assignment_page("thermodynamcis problems")["id"] == ids["problems"]
+    assert api.find_assignment_page("lab report")["id"] == ids["lab 1"]
+    assert api.find_assignment_page("physics lab report 2")["id"] == ids["lab"]
+    assert backend.calls == []
+
+
+def test_unmatched_names_fall_back_to_notion(fake_notion):
+    api, backend = fake_notion
+    populate(backend)
+    api.assignment_index()
+    backend.calls.clear()
+
+    assert api.resolve_assignment_page("calculus midterm") is None
+    api.find_assignment_page("calculus midterm")
+
+    ((operation, kwargs),) = backend.calls
+    assert kwargs["filter"] == {"property": "Assignment Name", "title": {"contains": "calculus midterm"}}
+
+
+def test_created_pages_join_the_index_and_stale_indexes_rebuild(fake_notion):
+    api, backend = fake_notion
+    populate(backend)
+    index = api.assignment_index()
+
+    page = api.create_assignment_page(
+        Assignment(name="Reading response", description="", due_date=datetime(2025, 9, 3), course_name="History 210")
+    )
+    assert index.resolve("reading respnse")["id"] == page["id"]
+
+    clock = [0.0]
+    stale = AssignmentNameIndex(ttl_seconds=60, clock=lambda: clock[0])
+    stale.rebuild(backend.assignment_pages.values(), {})
+    assert stale.is_fresh()
+    clock[0] = 61.0
+    assert not stale.is_fresh()
+
+
+def test_numbered_siblings_never_resolve_to_each_other(fake_notion):
+    api, backend = fake_notion
+    lab3 = backend.add_assignment("Lab 3 Report", due_date="2025-09-10")
+    problems = backend.add_assignment("Problem Set 4", due_date="2025-09-12")
+
+    assert api.resolve_assignment_page("Lab 4 Report") is None
+    assert api.resolve_assignment_page("Problem Set 5") is None
+    assert api.resolve_assignment_page("lab 3 reprot")["id"] == lab3
+    assert api.resolve_assignment_page("problem set 4", fuzzy=False)["id"] == problems
+    assert api.resolve_assignment_page("problem set four", fuzzy=False) is None
+
+    # Updating a sibling that doesn't exist must not touch Lab 3
+    backend.calls.clear()
+    result = api.update_assignment_page(
+        Assignment(name="Lab 4 Report", description="", due_date=datetime(2025, 9, 20), course_name="")
+    )
+    assert result is None
+    assert not any(operation == "update_page" for operation, _ in backend.calls)
+    assert backend.assignment_pages[lab3]["properties"]["Assignment Name"]["title"][0]["plain_text"] == "Lab 3 Report"
@@ -0,0 +1,81 @@
+"""
+Test the deterministic "what should I work on next" ranking.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import agents.project_manager as project_manager
+from utils.assignment_ranking import OpenAssignment, rank_assignments
+from utils.auth import UserDict, get_current_user_dependency
+
+NOW = datetime(2025, 9, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def due_in(hours):
+    return NOW + timedelta(hours=hours)
+
+
+def test_urgency_priority_and_effort_order_the_list():
+    ranked = rank_assignments(
+        [
+            OpenAssignment("reading", "Reading", due_in(30), 30, "Low"),
+            OpenAssignment("project", "Project", due_in(40), 36 * 60, "Medium"),
+            OpenAssignment("essay", "Essay", due_in(24 * 7), 120, "High"),
+            OpenAssignment("quiz", "Quiz", due_in(-5), 60, "Low"),
+            OpenAssignment("someday", "Reading list", None, 60, "High"),
+            OpenAssignment("far", "Final paper", due_in(24 * 30), 600, "Medium"),
+        ],
+        NOW,
+    )
+
+    # The project needs 36 of its 40 hours, so it beats the reading due sooner
+    assert [item.assignment.id for item in ranked] == ["project", "quiz", "reading", "someday", "essay", "far"]
+    assert ranked[1].overdue and ranked[1].to_dict()["reason"] == "Low priority, needs about 1.0h, overdue by 5h"
+    assert ranked[3].hours_left is None and ranked[3].to_dict()["due"] is None
+    assert [item.rank for item in rank_assignments([item.assignment for item in ranked], NOW, limit=2)] == [1, 2]
+    assert rank_assignments([], NOW) == []
+
+
+@pytest.mark.asyncio
+async def test_tool_ranks_open_assignments_with_saved_estimates(fake_notion, monkeypatch):
+    api, backend = fake_notion
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).date().isoformat()
+    next_week = (datetime.now(timezone.utc) + timedelta(days=7)).date().isoformat()
+    essay = backend.add_assignment("Essay", due_date=next_week, priority="High")
+    backend.add_assignment("Worksheet", due_date=tomorrow, priority="Low")
+    backend.add_assignment("Lab", status="Done", due_date=tomorrow, priority="High")
+
+    async def saved_estimates(user_id):
+        return {essay: 90}
+
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "load_estimates", saved_estimates)
+
+    result = await project_manager.rank_next_assignments.ainvoke({}, config={"configurable": {"user_id": "test-user-123"}})
+
+    assert [(item["assignment"], item["estimated_minutes"]) for item in result["assignments"]] == [
+        ("Worksheet", project_manager.DEFAULT_ASSIGNMENT_MINUTES),
+        ("Essay", 90),
+    ]
+    assert [call[0] for call in backend.calls] == ["query_data_source"]
+
+
+def test_endpoint(client, fake_notion, monkeypatch):
+    api, backend = fake_notion
+    backend.add_assignment("Worksheet", due_date="2025-09-02")
+
+    async def no_estimates(user_id):
+        return {}
+
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "load_estimates", no_estimates)
+    client.app.dependency_overrides[get_current_user_dependency] = lambda: UserDict({"id": "test-user-123"})
+    try:
+        response = client.get("/api/assignments/next", params={"limit": 3})
+    finally:
+        client.app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["assignments"][0]["assignment"] == "Worksheet"
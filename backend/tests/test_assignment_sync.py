@@ -0,0 +1,136 @@
+"""
+Test the bulk Canvas -> Notion assignment sync engine.
+"""
+
+from datetime import datetime
+
+from models.assignment import Assignment
+from services.assignment_sync import AssignmentSyncEngine
+
+
+def make_term():
+    return [
+        Assignment(
+            name="Lab 1",
+            description="<p>Measure <b>g</b></p>",
+            due_date=datetime(2025, 9, 10, 17, 0),
+            course_name="Physics 101",
+            priority="Medium",
+        ),
+        Assignment(name="Essay 1", description="Reading response", due_date=datetime(2025, 9, 12), course_name="English 103"),
+    ]
+
+
+def test_initial_sync_creates_pages_with_one_course_lookup(fake_notion):
+    """Test that new assignments are created and courses are resolved in a single query."""
+    api, backend = fake_notion
+    physics = backend.add_course("Physics 101")
+    backend.add_course("English 103")
+
+    report = AssignmentSyncEngine(api).sync(make_term())
+
+    assert report.counts["create"] == 2
+    assert report.queries == 2
+    assert report.writes == 2
+    assert all(action.success for action in report.actions)
+    lab = next(page for page in backend.assignment_pages.values() if page["properties"]["Course"]["relation"])
+    assert {"id": physics} in lab["properties"]["Course"]["relation"]
+
+
+def test_unchanged_resync_costs_one_query_and_no_writes(fake_notion):
+    """Test that re-syncing an unchanged term only lists pages once."""
+    api, backend = fake_notion
+    backend.add_course("Physics 101")
+    backend.add_course("English 103")
+    AssignmentSyncEngine(api).sync(make_term())
+    backend.calls.clear()
+
+    report = AssignmentSyncEngine(api).sync(make_term())
+
+    assert report.counts["unchanged"] == 2
+    # Courses listed by the first sync confirm each page belongs to its course
+    assert report.queries == 1
+    assert len(backend.calls) == 1
+    assert backend.writes() == []
+
+
+def test_resync_keeps_status_and_priority_edited_in_notion(fake_notion):
+    """Test that records without status or priority never reset what the user set in Notion."""
+    api, backend = fake_notion
+    physics = backend.add_course("Physics 101")
+    [lab] = make_term()[:1]
+    lab.priority = None
+    page_id = backend.add_assignment(
+        "Lab 1", status="Done", due_date="2025-09-10", priority="High", description="Measure g", course_id=physics
+    )
+
+    report = AssignmentSyncEngine(api).sync([lab])
+
+    assert report.counts["unchanged"] == 1 and report.actions[0].changed_fields == []
+    assert backend.writes() == []
+
+    lab.due_date = datetime(2025, 9, 11)
+    report = AssignmentSyncEngine(api).sync([lab])
+
+    assert report.actions[0].changed_fields == ["due_date"]
+    fields = api.page_fields(backend.assignment_pages[page_id])
+    assert (fields["status"], fields["priority"], fields["due_date"]) == ("Done", "High", "2025-09-11")
+
+
+def test_same_title_in_another_course_is_created(fake_notion):
+    """Test that a lone page with the same title but another course is never updated."""
+    api, backend = fake_notion
+    math = backend.add_course("Math 120")
+    physics = backend.add_course("Physics 101")
+    homework = backend.add_assignment("Homework 1", due_date="2025-09-05", course_id=math)
+    homework_before = backend.assignment_pages[homework]["properties"]
+
+    report = AssignmentSyncEngine(api).sync(
+        [Assignment(name="Homework 1", description="Kinematics", due_date=datetime(2025, 9, 8), course_name="Physics 101")]
+    )
+
+    assert report.counts["create"] == 1
+    assert report.actions[0].page_id != homework
+    assert backend.assignment_pages[homework]["properties"] == homework_before
+    [created] = [page for page_id, page in backend.assignment_pages.items() if page_id != homework]
+    assert created["properties"]["Course"]["relation"] == [{"id": physics}]
+
+
+def test_changed_assignment_sends_only_changed_properties(fake_notion):
+    """Test that only the fields that differ are written."""
+    api, backend = fake_notion
+    backend.add_assignment("Lab 1", due_date="2025-09-10", priority="Medium", description="Measure g")
+    term = make_term()[:1]
+    term[0].status = "In progress"
+
+    report = AssignmentSyncEngine(api).sync(term)
+
+    assert report.counts["update"] == 1
+    assert report.actions[0].changed_fields == ["status"]
+    ((operation, kwargs),) = backend.writes()
+    assert operation == "update_page"
+    assert list(kwargs["properties"]) == ["Status"]
+
+
+def test_dry_run_reports_without_writing(fake_notion):
+    """Test that a dry run plans creates but never writes."""
+    api, backend = fake_notion
+
+    report = AssignmentSyncEngine(api).sync(make_term(), dry_run=True)
+
+    assert report.dry_run is True
+    assert report.counts["create"] == 2
+    assert backend.writes() == []
+    assert report.to_dict()["counts"]["create"] == 2
+
+
+def test_duplicates_in_batch_are_collapsed(fake_notion):
+    """Test that repeated records for the same assignment produce one write."""
+    api, backend = fake_notion
+    term = make_term()
+    newer = Assignment(name="lab 1", description="Updated", due_date=datetime(2025, 9, 11), course_name="Physics 101")
+
+    report = AssignmentSyncEngine(api).sync(term + [newer])
+
+    assert report.counts == {"create": 2, "update": 0, "unchanged": 0, "duplicate": 1, "failed": 0}
+    assert len(backend.writes()) == 2
@@ -0,0 +1,121 @@
+"""
+Test diff-only single assignment updates.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from models.assignment import Assignment
+from services.page_snapshots import page_snapshots
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshots():
+    page_snapshots.clear()
+    yield
+    page_snapshots.clear()
+
+
+def lab(**changes):
+    values = dict(
+        name="Lab 1",
+        description="<p>Measure <b>g</b></p>",
+        due_date=datetime(2025, 9, 10, 17, 0),
+        course_name="Physics 101",
+        priority="Medium",
+    )
+    values.update(changes)
+    return Assignment(**values)
+
+
+def test_known_id_sends_one_small_patch(fake_notion):
+    """Test that a status flip on a retrieved page costs one PATCH with only Status."""
+    api, backend = fake_notion
+    page_id = backend.add_assignment("Lab 1", due_date="2025-09-10", priority="Medium", description="Measure g")
+    api.find_assignment_pages({"name": "Lab 1"})
+    backend.calls.clear()
+
+    result = api.update_assignment_page(lab(id=page_id, status="Done"))
+
+    assert result["id"] == page_id
+    ((operation, kwargs),) = backend.calls
+    assert operation == "update_page"
+    assert list(kwargs["properties"]) == ["Status"]
+
+
+def test_unchanged_update_skips_the_request(fake_notion):
+    """Test that an update matching the snapshot makes no request."""
+    api, backend = fake_notion
+    page_id = backend.add_assignment("Lab 1", due_date="2025-09-10", priority="Medium", description="Measure g")
+    api.update_assignment_page(lab(status="Done"))
+    backend.calls.clear()
+
+    result = api.update_assignment_page(lab(id=page_id, status="Done"))
+
+    assert result == {"object": "page", "id": page_id, "unchanged": True}
+    assert backend.calls == []
+
+
+def test_name_lookup_still_diffs(fake_notion):
+    """Test that without an id the page is found by name and only changes are sent."""
+    api, backend = fake_notion
+    backend.add_assignment("Lab 1", due_date="2025-09-10", priority="Medium", description="Measure g")
+
+    api.update_assignment_page(lab(due_date=datetime(2025, 9, 12)))
+
+    # The first lookup lists assignments and courses for the name index
+    operations = [(call[0], call[1].get("data_source_id")) for call in backend.calls]
+    assert operations == [("query_data_source", "assignments-ds"), ("query_data_source", "courses-ds"), ("update_page", None)]
+    assert list(backend.calls[-1][1]["properties"]) == ["Due date"]
+
+    backend.calls.clear()
+    api.update_assignment_page(lab(due_date=datetime(2025, 9, 14)))
+    assert [call[0] for call in backend.calls] == ["update_page"]
+
+
+def test_fields_left_out_leave_the_page_untouched(fake_notion):
+    """Test that None fields and the model's unset status and priority are never written."""
+    api, backend = fake_notion
+    page_id = backend.add_assignment(
+        "Lab 1", status="In progress", due_date="2025-09-10", priority="High", description="Measure g"
+    )
+
+    result = api.update_assignment_page(Assignment(name="Lab 1", description=None, due_date=None, course_name="Physics 101"))
+
+    assert result["unchanged"] is True
+    assert backend.writes() == []
+
+    backend.calls.clear()
+    api.update_assignment_page(lab(description=None, due_date=None, priority=None, status="Done"))
+
+    ((operation, kwargs),) = backend.calls
+    assert operation == "update_page" and list(kwargs["properties"]) == ["Status"]
+    assert api.page_fields(backend.assignment_pages[page_id]) == {
+        "name": "Lab 1",
+        "status": "Done",
+        "due_date": "2025-09-10",
+        "priority": "High",
+        "description": "Measure g",
+    }
+
+
+def test_id_without_snapshot_skips_lookup(fake_notion):
+    """Test that a known page id is patched directly even with no snapshot."""
+    api, backend = fake_notion
+    page_id = backend.add_assignment("Lab 1")
+
+    api.update_assignment_page(lab(id=page_id, status=None, priority=None))
+
+    ((operation, kwargs),) = backend.calls
+    assert operation == "update_page"
+    assert set(kwargs["properties"]) == {"Assignment Name", "Due date", "Description"}
+
+
+def test_canvas_ids_fall_back_to_name_lookup(fake_notion):
+    api, backend = fake_notion
+    backend.add_assignment("Lab 1", due_date="2025-09-10", priority="Medium", description="Measure g")
+
+    api.update_assignment_page(lab(id=12345, status="Done"))
+
+    assert [call[0] for call in backend.calls] == ["query_data_source", "query_data_source", "update_page"]
@@ -0,0 +1,118 @@
+"""
+Test the numpy interval engine behind find_available_time_slots.
+"""
+
+import random
+from datetime import datetime, time
+
+import numpy as np
+import pytest
+import pytz
+
+from utils.availability import as_interval_arrays, complement, find_free_slots, merge_intervals, union_sorted_busy
+
+NY = pytz.timezone("America/New_York")
+
+
+def local(day, hour, minute=0):
+    return NY.localize(datetime(2025, 11, day, hour, minute))
+
+
+def brute_force_merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def test_merge_and_complement_match_a_linear_scan():
+    rng = random.Random(3)
+    intervals = []
+    for _ in range(2000):
+        start = rng.randrange(0, 100_000)
+        intervals.append((float(start), float(start + rng.randrange(1, 500))))
+
+    merged_starts, merged_ends = merge_intervals(*as_interval_arrays(intervals))
+    expected = brute_force_merge(intervals)
+    assert list(zip(merged_starts, merged_ends)) == expected
+
+    free_starts, free_ends = complement(merged_starts, merged_ends, 10_000.0, 20_000.0)
+    assert np.all(free_ends > free_starts)
+    for start, end in zip(free_starts, free_ends):
+        assert not any(s < end and e > start for s, e in intervals)
+
+
+def test_work_hours_respect_local_time_across_dst():
+    """Test that 9-5 stays 9-5 local on both sides of the November DST change."""
+    slots = find_free_slots(
+        np.array([]), np.array([]), local(1, 0), local(4, 0), time_zone="America/New_York", work_hours=(time(9), time(17))
+    )[60]
+
+    assert [(slot.start.hour, slot.end.hour) for slot in slots] == [(9, 17)] * 3
+    assert slots[0].start.utcoffset() != slots[-1].start.utcoffset()
+
+
+def test_overnight_work_hours_wrap_past_midnight():
+    slots = find_free_slots(
+        np.array([]), np.array([]), local(3, 0), local(4, 0), time_zone="America/New_York", work_hours=(time(6), time(0))
+    )[60]
+
+    assert [(slot.start, slot.end) for slot in slots] == [(local(3, 6), local(4, 0))]
+
+
+def test_gaps_durations_and_ranking():
+    """Test min gap padding, multiple durations and top-k ranking."""
+    busy = [(local(3, 10), local(3, 11)), (local(3, 13), local(3, 13, 30))]
+    starts, ends = as_interval_arrays((s.timestamp(), e.timestamp()) for s, e in busy)
+
+    slots = find_free_slots(
+        starts,
+        ends,
+        local(3, 9),
+        local(3, 17),
+        durations_minutes=[30, 120],
+        time_zone="America/New_York",
+        min_gap_minutes=15,
+    )
+    assert [(s.start.strftime("%H:%M"), s.end.strftime("%H:%M")) for s in slots[30]] == [
+        ("09:00", "09:45"),
+        ("11:15", "12:45"),
+        ("13:45", "17:00"),
+    ]
+    assert [s.free_minutes for s in slots[120]] == [195]
+
+    longest = find_free_slots(starts, ends, local(3, 9), local(3, 17), durations_minutes=[30], top_k=2, rank="longest")
+    assert [s.free_minutes for s in longest[30]] == [210, 120]
+    tightest = find_free_slots(starts, ends, local(3, 9), local(3, 17), durations_minutes=[30], top_k=1, rank="tightest")
+    assert tightest[30][0].free_minutes == 60
+
+    with pytest.raises(ValueError):
+        find_free_slots(starts, ends, local(3, 9), local(3, 17), rank="random")
+
+
+def test_slots_serialize_for_the_agent():
+    slot = find_free_slots(np.array([]), np.array([]), local(3, 9), local(3, 10), time_zone="America/New_York")[60][0]
+    data = slot.to_dict()
+
+    assert data["start"] == "2025-11-03T09:00:00-05:00"
+    assert data["duration_minutes"] == 60 and data["free_minutes"] == 60
+    assert data["label"] == "Available from Monday, Nov 03, 09:00 AM to Monday, Nov 03, 10:00 AM"
+
+
+def test_k_way_union_matches_a_full_merge():
+    rng = random.Random(11)
+    per_participant = []
+    for _ in range(40):
+        intervals = []
+        for _ in range(50):
+            start = float(rng.randrange(0, 50_000))
+            intervals.append((start, start + rng.randrange(1, 300)))
+        per_participant.append(sorted(intervals))
+
+    starts, ends = union_sorted_busy(per_participant)
+
+    everything = [interval for intervals in per_participant for interval in intervals]
+    assert list(zip(starts, ends)) == brute_force_merge(everything)
@@ -0,0 +1,137 @@
+"""
+Test Google Calendar batch requests against a local fake of the batch endpoint.
+"""
+
+import email
+import json
+
+import httpx
+import pytest
+
+import agents.scheduler as scheduler
+from agents.scheduler import BatchRequest, call_calendar_batch
+from services.google_http import configure_google_client
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+
+class FakeBatchEndpoint:
+    """Parses multipart/mixed batches like Google does and answers each part."""
+
+    def __init__(self):
+        self.events = {"existing": {"id": "existing", "summary": "Old"}}
+        self.batches = []
+
+    def __call__(self, request):
+        assert request.url == scheduler.CALENDAR_BATCH_URL
+        message = email.message_from_bytes(
+            b"Content-Type: " + request.headers["Content-Type"].encode() + b"\r\n\r\n" + request.content
+        )
+        parts = message.get_payload()
+        self.batches.append((request.headers["Authorization"], len(parts)))
+
+        boundary = "response_boundary"
+        chunks = []
+        for part in parts:
+            content_id = part["Content-ID"].strip("<>")
+            status, body = self.handle(part.get_payload())
+            http = f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n{json.dumps(body) if body else ''}"
+            chunks.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n{http}\r\n"
+            )
+        return httpx.Response(
+            200,
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+            content="".join(chunks) + f"--{boundary}--\r\n",
+        )
+
+    def handle(self, http_request):
+        head, _, body = http_request.replace("\r\n", "\n").partition("\n\n")
+        method, path, _ = head.split("\n")[0].split()
+        event_id = path.split("?")[0].rstrip("/").split("/")[-1]
+        if method == "POST":
+            event = json.loads(body)
+            event["id"] = f"event-{len(self.events)}"
+            event["htmlLink"] = f"https://calendar.google.com/event?eid={event['id']}"
+            self.events[event["id"]] = event
+            return 200, event
+        if event_id not in self.events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        if method == "DELETE":
+            del self.events[event_id]
+            return 204, None
+        self.events[event_id].update(json.loads(body))
+        return 200, self.events[event_id]
+
+
+@pytest.fixture
+def batch_endpoint(monkeypatch):
+    endpoint = FakeBatchEndpoint()
+    configure_google_client(transport=httpx.MockTransport(endpoint))
+
+    async def fake_token(config):
+        return "token"
+
+    monkeypatch.setattr(scheduler, "get_user_access_token", fake_token)
+    yield endpoint
+    configure_google_client()
+
+
+def study_block(day):
+    return {
+        "summary": f"Study session {day}",
+        "location": "Library",
+        "description": "",
+        "start": {"dateTime": f"2025-10-{day:02d}T15:00:00", "timeZone": "America/New_York"},
+        "end": {"dateTime": f"2025-10-{day:02d}T17:00:00", "timeZone": "America/New_York"},
+        "reminders": {"useDefault": True},
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_demultiplexes_results_and_errors(batch_endpoint):
+    """Test that each sub-request gets its own result, including failures."""
+    requests = [
+        BatchRequest("POST", "calendars/primary/events", json_data={"summary": "A"}),
+        BatchRequest("DELETE", "calendars/primary/events/missing"),
+        BatchRequest("PUT", "calendars/primary/events/existing", params={"sendUpdates": "none"}, json_data={"summary": "B"}),
+    ]
+
+    results = await call_calendar_batch(requests, "token")
+
+    assert [result["status_code"] for result in results] == [200, 404, 200]
+    assert results[0]["data"]["summary"] == "A"
+    assert results[1]["error"] == "Not Found"
+    assert results[2]["data"]["summary"] == "B"
+    assert batch_endpoint.batches == [("Bearer token", 3)]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_the_limit(batch_endpoint):
+    """Test that more than 50 sub-requests are sent as several batches."""
+    requests = [BatchRequest("POST", "calendars/primary/events", json_data={"summary": str(i)}) for i in range(120)]
+
+    results = await call_calendar_batch(requests, "token")
+
+    assert [result["data"]["summary"] for result in results] == [str(i) for i in range(120)]
+    assert sorted(size for _, size in batch_endpoint.batches) == [20, 50, 50]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_events_tool(batch_endpoint):
+    """Test that a multi-day plan is created with a single HTTP request."""
+    operations = [{"action": "create", "event": study_block(day)} for day in (6, 7, 8)]
+    operations += [
+        {"action": "delete", "event_id": "existing"},
+        {"action": "update", "event_id": "nope", "event": study_block(9)},
+        {"action": "delete"},
+    ]
+
+    results = await scheduler.bulk_update_events.ainvoke({"operations": operations}, config=CONFIG)
+
+    assert [result["success"] for result in results] == [True, True, True, True, False, False]
+    assert results[0]["htmlLink"].startswith("https://calendar.google.com/")
+    assert results[4]["error"] == "Not Found"
+    assert "Invalid operation" in results[5]["error"]
+    assert len(batch_endpoint.batches) == 1
+    assert "existing" not in batch_endpoint.events
@@ -0,0 +1,123 @@
+"""
+Test the per-user calendar metadata and access token caches.
+"""
+
+import httpx
+import pytest
+
+import agents.scheduler as scheduler
+from services.calendar_cache import AccessTokenCache, CalendarMetadataCache, access_token_cache, calendar_metadata_cache
+from services.google_calendar_oauth import GoogleCalendarOAuthService
+from services.google_http import configure_google_client
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def calendar_list():
+    """Serve calendarList with an ETag and honor If-None-Match."""
+    requests = []
+    state = {"etag": '"v1"'}
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == state["etag"]:
+            return httpx.Response(304)
+        items = [
+            {"id": "me@example.com", "summary": "Me", "timeZone": "America/New_York", "accessRole": "owner", "primary": True},
+            {"id": "cs101", "summary": "CS 101", "timeZone": "America/Chicago", "accessRole": "reader"},
+        ]
+        return httpx.Response(200, headers={"ETag": state["etag"]}, json={"items": items})
+
+    configure_google_client(transport=httpx.MockTransport(handler))
+    calendar_metadata_cache.clear()
+    access_token_cache.clear()
+    yield requests, state
+    configure_google_client()
+    calendar_metadata_cache.clear()
+    access_token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_from_memory(calendar_list):
+    """Test that repeated lookups in a turn cost one calendarList request."""
+    requests, _ = calendar_list
+    cache = CalendarMetadataCache()
+
+    calendars = await cache.get_calendars("user-1", "token")
+    assert await cache.get_primary_timezone("user-1", "token") == "America/New_York"
+    assert await cache.get_timezone("user-1", "token", "cs101") == "America/Chicago"
+
+    assert [calendar.access_role for calendar in calendars] == ["owner", "reader"]
+    assert len(requests) == 1
+    assert cache.stats.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_revalidate_with_etag(calendar_list):
+    """Test that an expired entry sends If-None-Match and keeps its data on 304."""
+    requests, state = calendar_list
+    clock = FakeClock()
+    cache = CalendarMetadataCache(ttl_seconds=60, clock=clock)
+    await cache.get_calendars("user-1", "token")
+
+    clock.now += 61
+    assert len(await cache.get_calendars("user-1", "token")) == 2
+    assert requests[-1].headers["If-None-Match"] == '"v1"'
+    assert cache.stats.revalidated == 1
+
+    state["etag"] = '"v2"'
+    clock.now += 61
+    await cache.get_calendars("user-1", "token")
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_are_per_user(calendar_list):
+    requests, _ = calendar_list
+    cache = CalendarMetadataCache()
+    await cache.get_calendars("user-1", "token-1")
+    await cache.get_calendars("user-2", "token-2")
+    assert [request.headers["Authorization"] for request in requests] == ["Bearer token-1", "Bearer token-2"]
+
+
+def test_access_tokens_expire_before_google_does():
+    clock = FakeClock()
+    cache = AccessTokenCache(clock=clock)
+    cache.put("user-1", "token", expires_at="1970-01-01T00:30:00+00:00")
+
+    assert cache.get("user-1") == "token"
+    clock.now = 1800 - 299
+    assert cache.get("user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_tools_share_the_cache(calendar_list, monkeypatch):
+    """Test that a turn's metadata lookups hit the network and token store once."""
+    requests, _ = calendar_list
+    token_reads = []
+
+    async def fake_get_token(self, user_id):
+        token_reads.append(user_id)
+        return {"access_token": "token", "token_expires_at": "2999-01-01T00:00:00+00:00"}
+
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "client-id")
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "client-secret")
+    monkeypatch.setattr(GoogleCalendarOAuthService, "get_user_google_token", fake_get_token)
+
+    mapping = await scheduler.get_calendar_mapping.ainvoke({}, config=CONFIG)
+    await scheduler.get_calendar_mapping.ainvoke({}, config=CONFIG)
+    time_zone = await scheduler.get_calendar_timezone.ainvoke({"calendar_id": "primary"}, config=CONFIG)
+
+    assert mapping == {"Me": "me@example.com", "CS 101": "cs101"}
+    assert time_zone == "America/New_York"
+    assert len(requests) == 1
+    assert token_reads == ["test-user-123"]
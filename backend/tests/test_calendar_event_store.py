@@ -0,0 +1,241 @@
+"""
+Test the syncToken-backed local calendar event store.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+import agents.scheduler as scheduler
+from services.calendar_cache import calendar_metadata_cache
+from services.calendar_event_store import (
+    SYNC_LOOKAHEAD_DAYS,
+    CalendarEventStore,
+    EventRecord,
+    EventStoreRegistry,
+    clear_event_stores,
+)
+from services.google_http import configure_google_client
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+NOW = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def event(event_id, start, hours=1, **fields):
+    return {
+        "id": event_id,
+        "summary": fields.pop("summary", event_id),
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(hours=hours)).isoformat()},
+        **fields,
+    }
+
+
+class FakeEventsEndpoint:
+    """Google's events.list with full and incremental sync semantics."""
+
+    def __init__(self, events, page_size=2):
+        self.events = {item["id"]: item for item in events}
+        self.changed = []
+        self.page_size = page_size
+        self.requests = []
+        self.expired = False
+
+    def change(self, item):
+        if item.get("status") != "cancelled":
+            self.events[item["id"]] = item
+        else:
+            self.events.pop(item["id"], None)
+        self.changed.append(item)
+
+    async def __call__(self, endpoint, access_token, method="GET", params=None, json_data=None):
+        params = dict(params or {})
+        self.requests.append((endpoint, params))
+        if endpoint == "freeBusy":
+            raise AssertionError("freeBusy should not be called when the store covers the range")
+        if method != "GET":
+            return {}
+        if "syncToken" in params:
+            if self.expired:
+                self.expired = False
+                request = httpx.Request("GET", "https://www.googleapis.com/calendar/v3/" + endpoint)
+                raise httpx.HTTPStatusError("Gone", request=request, response=httpx.Response(410, request=request))
+            items, self.changed = self.changed, []
+        else:
+            assert "timeMin" in params
+            items, self.changed = list(self.events.values()), []
+        start = int(params.get("pageToken", 0))
+        page = {"items": items[start : start + self.page_size]}
+        if start + self.page_size < len(items):
+            page["nextPageToken"] = str(start + self.page_size)
+        else:
+            page["nextSyncToken"] = f"sync-{len(self.requests)}"
+        return page
+
+
+@pytest.mark.asyncio
+async def test_full_sync_then_deltas():
+    """Test that later syncs send the syncToken and apply updates and cancellations."""
+    endpoint = FakeEventsEndpoint([event("a", NOW), event("b", NOW + timedelta(hours=2)), event("c", NOW + timedelta(days=1))])
+    store = CalendarEventStore("primary")
+
+    await store.sync(endpoint, "token")
+    assert len(store) == 3 and len(endpoint.requests) == 2  # two pages
+    assert "syncToken" not in endpoint.requests[0][1] and "timeMax" in endpoint.requests[0][1]
+
+    endpoint.change(event("b", NOW + timedelta(hours=5), summary="moved"))
+    endpoint.change({"id": "c", "status": "cancelled"})
+    await store.sync(endpoint, "token")
+    assert len(endpoint.requests) == 2  # synced moments ago, no request
+
+    token = store.sync_token
+    await store.sync(endpoint, "token", force=True)
+    assert endpoint.requests[-1][1]["syncToken"] == token
+    assert [record.summary for record in store.query(NOW.timestamp(), (NOW + timedelta(days=2)).timestamp())] == ["a", "moved"]
+
+
+@pytest.mark.asyncio
+async def test_expired_sync_token_triggers_full_resync():
+    """Test that a 410 drops local state and downloads the calendar again."""
+    endpoint = FakeEventsEndpoint([event("a", NOW), event("b", NOW + timedelta(hours=2))])
+    store = CalendarEventStore("primary")
+    await store.sync(endpoint, "token")
+
+    endpoint.events.pop("a")  # deleted while the token was expired; no delta will mention it
+    endpoint.expired = True
+    await store.sync(endpoint, "token", force=True)
+
+    assert [record.id for record in store.query(NOW.timestamp(), (NOW + timedelta(days=1)).timestamp())] == ["b"]
+    assert "timeMin" in endpoint.requests[-1][1]
+
+
+def test_range_query_matches_a_linear_scan():
+    """Test the bisect index against brute force, including long events that start before the range."""
+    rng = random.Random(7)
+    store = CalendarEventStore("primary")
+    records = []
+    for i in range(500):
+        start = NOW + timedelta(minutes=15 * rng.randrange(0, 4000))
+        item = event(f"e{i}", start, hours=rng.choice([0.5, 1, 2, 72]))
+        store._apply(item)
+        records.append(EventRecord(item))
+    assert EventRecord.__slots__ and not hasattr(records[0], "__dict__")
+
+    for _ in range(50):
+        low = (NOW + timedelta(hours=rng.randrange(0, 1000))).timestamp()
+        high = low + rng.randrange(1, 100) * 3600
+        expected = sorted((r.start_ts, r.id) for r in records if r.start_ts < high and r.end_ts > low)
+        assert [(r.start_ts, r.id) for r in store.query(low, high)] == expected
+
+
+@pytest.fixture
+def calendar_account(monkeypatch):
+    """One calendar served by the fake events endpoint, with calendarList over the shared client."""
+    endpoint = FakeEventsEndpoint(
+        [
+            event("lecture", NOW + timedelta(hours=1)),
+            event("gym", NOW + timedelta(hours=3), transparency="transparent"),
+            event("meeting", NOW + timedelta(hours=5), attendees=[{"self": True, "responseStatus": "declined"}]),
+        ],
+        page_size=50,
+    )
+
+    async def fake_token(config):
+        return "token"
+
+    def calendar_list(request):
+        items = [{"id": "me@example.com", "summary": "Me", "timeZone": "UTC", "primary": True}]
+        return httpx.Response(200, json={"items": items})
+
+    monkeypatch.setattr(scheduler, "get_user_access_token", fake_token)
+    monkeypatch.setattr(scheduler, "call_calendar_api", endpoint)
+    configure_google_client(transport=httpx.MockTransport(calendar_list))
+    calendar_metadata_cache.clear()
+    clear_event_stores()
+    yield endpoint
+    configure_google_client()
+    calendar_metadata_cache.clear()
+    clear_event_stores()
+
+
+@pytest.mark.asyncio
+async def test_tools_answer_from_the_store(calendar_account):
+    """Test that get_events and find_available_time_slots share one sync and skip freeBusy."""
+    window = {"start_date": NOW.isoformat(), "end_date": (NOW + timedelta(hours=8)).isoformat()}
+
+    events = await scheduler.get_events.ainvoke({**window, "calendar_id": "all"}, config=CONFIG)
+    slots = await scheduler.find_available_time_slots.ainvoke(
+        {**window, "duration_minutes": 60, "min_gap_minutes": 0}, config=CONFIG
+    )
+
+    assert [item["id"] for item in events] == ["lecture", "gym", "meeting"]
+    assert len(calendar_account.requests) == 1
+    # Only the lecture blocks time: transparent and declined events are free
+    assert len(slots) == 2 and slots[0]["label"].startswith("Available from")
+
+
+@pytest.mark.asyncio
+async def test_writes_make_the_next_query_fetch_a_delta(calendar_account):
+    window = {"start_date": NOW.isoformat(), "end_date": (NOW + timedelta(hours=8)).isoformat(), "calendar_id": "all"}
+    await scheduler.get_events.ainvoke(window, config=CONFIG)
+
+    await scheduler.delete_event.ainvoke({"event_id": "gym", "calendar_id": "me@example.com"}, config=CONFIG)
+    calendar_account.change({"id": "gym", "status": "cancelled"})
+    events = await scheduler.get_events.ainvoke(window, config=CONFIG)
+
+    assert [item["id"] for item in events] == ["lecture", "meeting"]
+    assert "syncToken" in calendar_account.requests[-1][1]
+
+
+@pytest.mark.asyncio
+async def test_ranges_before_the_sync_window_go_to_the_api(calendar_account):
+    start = NOW - timedelta(days=365)
+    await scheduler.get_events.ainvoke(
+        {"start_date": start.isoformat(), "end_date": (start + timedelta(days=1)).isoformat()}, config=CONFIG
+    )
+    assert len(calendar_account.requests) == 1
+    assert calendar_account.requests[0][1]["orderBy"] == "startTime"
+
+
+@pytest.mark.asyncio
+async def test_ranges_past_the_sync_window_go_to_the_api(calendar_account):
+    """Test that the full sync is bounded ahead, so far-future ranges are fetched directly."""
+    start = NOW + timedelta(days=SYNC_LOOKAHEAD_DAYS + 10)
+    await scheduler.get_events.ainvoke(
+        {"start_date": start.isoformat(), "end_date": (start + timedelta(days=1)).isoformat()}, config=CONFIG
+    )
+    assert len(calendar_account.requests) == 1
+    assert calendar_account.requests[0][1]["orderBy"] == "startTime"
+
+
+@pytest.mark.asyncio
+async def test_find_event_searches_locally_with_typos(calendar_account):
+    events = await scheduler.find_event.ainvoke({"event_name": "lectrue"}, config=CONFIG)
+
+    assert [item["id"] for item in events] == ["lecture"]
+    assert len(calendar_account.requests) == 1 and "q" not in calendar_account.requests[0][1]
+
+
+@pytest.mark.asyncio
+async def test_find_event_falls_back_to_the_api_on_a_miss(calendar_account):
+    await scheduler.find_event.ainvoke({"event_name": "dentist"}, config=CONFIG)
+
+    params = calendar_account.requests[-1][1]
+    assert params["q"] == "dentist" and "timeMin" in params and "timeMax" in params
+
+
+def test_registry_drops_idle_and_least_recently_used_stores():
+    now = [0.0]
+    stores = EventStoreRegistry(max_entries=2, idle_seconds=60, clock=lambda: now[0])
+    first = stores.get("user-1", "cal-a")
+    stores.get("user-1", "cal-b")
+
+    assert stores.get("user-1", "cal-a") is first
+    stores.get("user-2", "cal-a")  # over the limit: cal-b was used least recently
+    assert len(stores) == 2 and stores.get("user-1", "cal-a") is first
+
+    now[0] += 61
+    assert stores.get("user-1", "cal-a") is not first
+    assert len(stores) == 1
@@ -0,0 +1,69 @@
+"""
+Test paginated, field-projected event listing in the scheduler tools.
+"""
+
+import pytest
+
+import agents.scheduler as scheduler
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+
+class PagedEventsEndpoint:
+    """events.list returning numbered events in pages of maxResults."""
+
+    def __init__(self, total):
+        self.total = total
+        self.requests = []
+
+    async def __call__(self, endpoint, access_token, method="GET", params=None, json_data=None):
+        self.requests.append(dict(params))
+        start = int(params.get("pageToken", 0))
+        stop = min(start + params["maxResults"], self.total)
+        page = {"items": [{"id": f"event-{i}", "summary": f"Lab {i}"} for i in range(start, stop)]}
+        if stop < self.total:
+            page["nextPageToken"] = str(stop)
+        return page
+
+
+@pytest.fixture
+def paged_events(monkeypatch):
+    endpoint = PagedEventsEndpoint(600)
+
+    async def fake_token(config):
+        return "token"
+
+    monkeypatch.setattr(scheduler, "get_user_access_token", fake_token)
+    monkeypatch.setattr(scheduler, "call_calendar_api", endpoint)
+    return endpoint
+
+
+@pytest.mark.asyncio
+async def test_iterator_follows_page_tokens_with_a_field_mask(paged_events):
+    """Test that every page is requested with maxResults and a partial-response mask."""
+    pages = [page async for page in scheduler.iter_event_pages("primary", "token", {"singleEvents": True})]
+
+    assert [len(page) for page in pages] == [250, 250, 100]
+    assert [request.get("pageToken") for request in paged_events.requests] == [None, "250", "500"]
+    assert all(request["maxResults"] == 250 for request in paged_events.requests)
+    assert paged_events.requests[0]["fields"].startswith("nextPageToken,items(id,")
+
+
+@pytest.mark.asyncio
+async def test_iterator_is_lazy(paged_events):
+    """Test that a caller that stops after one page doesn't fetch the rest."""
+    async for page in scheduler.iter_event_pages("primary", "token", {}):
+        break
+
+    assert len(paged_events.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_events_is_no_longer_truncated(paged_events):
+    """Test that a busy calendar returns every event in the window, not just the first page."""
+    events = await scheduler.get_events.ainvoke(
+        {"start_date": "2020-01-01", "end_date": "2020-12-31", "calendar_id": "team", "expand_recurring_locally": False},
+        config=CONFIG,
+    )
+
+    assert len(events) == 600 and events[-1]["id"] == "event-599"
@@ -0,0 +1,83 @@
+"""
+Test ETag / If-None-Match revalidation in call_calendar_api.
+"""
+
+import httpx
+import pytest
+
+from agents.scheduler import call_calendar_api
+from services.calendar_cache import access_token_cache, calendar_response_cache
+from services.calendar_event_store import SYNC_FIELDS
+from services.google_http import configure_google_client
+
+
+@pytest.fixture
+def calendar_api():
+    """A Calendar API stand-in that honours If-None-Match."""
+    state = {"version": 1, "requests": []}
+
+    def handler(request):
+        state["requests"].append(request)
+        etag = f'"v{state["version"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        body = {"etag": etag, "summary": f"Calendar v{state['version']}", "timeZone": "America/Chicago"}
+        return httpx.Response(200, json=body, headers={"ETag": etag})
+
+    configure_google_client(transport=httpx.MockTransport(handler))
+    calendar_response_cache.clear()
+    access_token_cache.clear()
+    yield state
+    configure_google_client()
+    calendar_response_cache.clear()
+    access_token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_repeat_reads_are_served_from_cache_on_304(calendar_api):
+    first = await call_calendar_api("calendars/primary", "token")
+    second = await call_calendar_api("calendars/primary", "token")
+
+    assert second is first
+    assert calendar_api["requests"][1].headers["If-None-Match"] == '"v1"'
+    stats = calendar_response_cache.stats
+    assert (stats.misses, stats.not_modified, stats.hits) == (1, 1, 1)
+
+    calendar_api["version"] = 2
+    third = await call_calendar_api("calendars/primary", "token")
+    assert third["summary"] == "Calendar v2" and calendar_response_cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_scoped_per_user_and_survives_token_refresh(calendar_api):
+    access_token_cache.put("user-a", "token-a1")
+    access_token_cache.put("user-b", "token-b")
+    await call_calendar_api("calendars/primary", "token-a1")
+
+    await call_calendar_api("calendars/primary", "token-b")
+    assert "If-None-Match" not in calendar_api["requests"][-1].headers
+
+    access_token_cache.put("user-a", "token-a2")
+    await call_calendar_api("calendars/primary", "token-a2")
+    assert calendar_api["requests"][-1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_params_are_part_of_the_key_and_writes_skip_the_cache(calendar_api):
+    await call_calendar_api("calendars/primary/events", "token", params={"timeMin": "a"})
+    await call_calendar_api("calendars/primary/events", "token", params={"timeMin": "b"})
+    await call_calendar_api("calendars/primary/events", "token", method="POST", json_data={})
+
+    assert [("If-None-Match" in request.headers) for request in calendar_api["requests"]] == [False, False, False]
+    assert calendar_response_cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_event_store_syncs_skip_the_cache(calendar_api):
+    """Test that full and delta sync responses, never requested twice, don't take up cache entries."""
+    full_sync = {"singleEvents": True, "timeMin": "a", "timeMax": "b", "fields": SYNC_FIELDS}
+    await call_calendar_api("calendars/primary/events", "token", params=full_sync)
+    await call_calendar_api("calendars/primary/events", "token", params={**full_sync, "pageToken": "2"})
+    await call_calendar_api("calendars/primary/events", "token", params={"syncToken": "s", "fields": SYNC_FIELDS})
+
+    assert calendar_response_cache.stats.misses == 0
@@ -0,0 +1,115 @@
+"""
+Test Google Calendar push-notification channels and the webhook receiver.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from services.calendar_event_store import clear_event_stores, get_event_store
+from services.calendar_watch import CalendarWatchRegistry, calendar_watch_registry
+from services.google_http import configure_google_client
+
+WEBHOOK = "https://flowstate.example.com/api/webhooks/google-calendar"
+
+
+class GoogleWatchStandIn:
+    """Stands in for events.watch / channels.stop and builds the notifications Google would POST."""
+
+    def __init__(self):
+        self.open = {}
+        self.stopped = []
+        self.expiration_ms = 4_000_000_000_000
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        if request.url.path.endswith("/events/watch"):
+            assert body["type"] == "web_hook" and body["address"] == WEBHOOK
+            resource_id = f"resource-{len(self.open)}"
+            self.open[body["id"]] = (body["token"], resource_id)
+            return httpx.Response(
+                200, json={"id": body["id"], "resourceId": resource_id, "expiration": str(self.expiration_ms)}
+            )
+        assert request.url.path.endswith("/channels/stop")
+        self.stopped.append(body["id"])
+        self.open.pop(body["id"], None)
+        return httpx.Response(204)
+
+    def notification(self, channel_id, state="exists", token=None):
+        channel_token, resource_id = self.open[channel_id]
+        return {
+            "X-Goog-Channel-ID": channel_id,
+            "X-Goog-Channel-Token": token if token is not None else channel_token,
+            "X-Goog-Resource-ID": resource_id,
+            "X-Goog-Resource-State": state,
+            "X-Goog-Message-Number": "2",
+        }
+
+
+@pytest.fixture
+def google_watch(monkeypatch):
+    stand_in = GoogleWatchStandIn()
+    configure_google_client(transport=httpx.MockTransport(stand_in))
+    monkeypatch.setattr(calendar_watch_registry, "webhook_url", WEBHOOK)
+    clear_event_stores()
+    yield stand_in
+    for channel in calendar_watch_registry.channels():
+        calendar_watch_registry._channels.pop(channel.id)
+    calendar_watch_registry._by_calendar.clear()
+    calendar_watch_registry._failed.clear()
+    configure_google_client()
+    clear_event_stores()
+
+
+@pytest.mark.asyncio
+async def test_notifications_invalidate_the_users_calendar(google_watch):
+    """Test that a change notification marks only that calendar's store stale."""
+    channel = await calendar_watch_registry.ensure_watched("user-1", "cal-a", "token")
+    assert await calendar_watch_registry.ensure_watched("user-1", "cal-a", "token") is channel
+    watched, other = get_event_store("user-1", "cal-a"), get_event_store("user-1", "cal-b")
+    watched.last_synced = other.last_synced = 1.0
+    assert watched.watched and not other.watched
+
+    assert calendar_watch_registry.handle_notification(google_watch.notification(channel.id, state="sync"))
+    assert watched.last_synced == 1.0
+
+    assert calendar_watch_registry.handle_notification(google_watch.notification(channel.id))
+    assert watched.last_synced is None and other.last_synced == 1.0
+
+
+def test_webhook_endpoint(client, google_watch):
+    """Test the FastAPI receiver with synthetic notifications, including forged ones."""
+    channel = client.portal.call(calendar_watch_registry.register, "user-1", "cal-a", "token")
+    store = get_event_store("user-1", "cal-a")
+    store.last_synced = 1.0
+
+    forged = client.post("/api/webhooks/google-calendar", headers=google_watch.notification(channel.id, token="guess"))
+    unknown = client.post("/api/webhooks/google-calendar", headers={"X-Goog-Channel-ID": "nope"})
+    assert forged.status_code == 404 and unknown.status_code == 404
+    assert store.last_synced == 1.0
+
+    response = client.post("/api/webhooks/google-calendar", headers=google_watch.notification(channel.id))
+    assert response.status_code == 200
+    assert store.last_synced is None
+
+
+@pytest.mark.asyncio
+async def test_channels_are_renewed_before_they_expire(google_watch):
+    now = [1_000_000.0]
+    registry = CalendarWatchRegistry(webhook_url=WEBHOOK, clock=lambda: now[0])
+    google_watch.expiration_ms = int((now[0] + 24 * 3600) * 1000)
+    old = await registry.register("user-1", "cal-a", "token")
+
+    async def token_for(user_id):
+        return "fresh-token"
+
+    assert await registry.renew_expiring(token_for) == 0
+
+    now[0] += 20 * 3600
+    assert await registry.renew_expiring(token_for) == 1
+
+    assert google_watch.stopped == [old.id]
+    [current] = registry.channels()
+    assert current.id != old.id and registry.is_watched("user-1", "cal-a")
+    assert not registry.handle_notification(google_watch.notification(current.id) | {"X-Goog-Channel-ID": old.id})
@@ -0,0 +1,137 @@
+"""
+Test the multi-user common availability finder.
+"""
+
+import httpx
+import pytest
+
+import agents.scheduler as scheduler
+import services.user_profile as user_profile
+from services.calendar_cache import access_token_cache, calendar_metadata_cache
+from services.google_http import configure_google_client
+from utils.auth import UserDict, get_current_user_dependency
+
+USERS = [f"user-{i}" for i in range(30)]
+
+
+class FakeProfiles:
+    """profiles table: user-1 and user-2 share with everyone, user-3 only with user-4, user-5 not at all"""
+
+    def __init__(self):
+        self.rows = [{"id": user, "email": f"{user}@example.edu"} for user in USERS]
+        for row in self.rows[1:3]:
+            row["share_availability"] = True
+        self.rows[3]["availability_shared_with"] = ["USER-4@example.edu"]
+
+    async def query(self, table, method="GET", data=None, filters=None):
+        assert table == "profiles" and method == "GET"
+        [(column, value)] = filters.items()
+        return [row for row in self.rows if row[column] == value]
+
+
+@pytest.fixture
+def participants(monkeypatch):
+    """30 users with one calendar each; user i is busy 10:00+(i % 3)h for an hour on 2025-09-01 (UTC)."""
+    free_busy_calls = []
+
+    async def fake_token(config):
+        user_id = config["configurable"]["user_id"]
+        return None if user_id == "user-offline" else f"token-{user_id}"
+
+    def calendar_list(request):
+        token = request.headers["Authorization"].split()[-1]
+        return httpx.Response(200, json={"items": [{"id": f"{token}-cal", "summary": "Main"}]})
+
+    async def fake_call(endpoint, access_token, method="GET", params=None, json_data=None):
+        assert endpoint == "freeBusy"
+        free_busy_calls.append(access_token)
+        index = int(access_token.rsplit("-", 1)[1])
+        hour = 10 + index % 3
+        busy = [{"start": f"2025-09-01T{hour:02d}:00:00Z", "end": f"2025-09-01T{hour + 1:02d}:00:00Z"}]
+        return {"calendars": {item["id"]: {"busy": busy} for item in json_data["items"]}}
+
+    monkeypatch.setattr(scheduler, "get_user_access_token", fake_token)
+    monkeypatch.setattr(scheduler, "call_calendar_api", fake_call)
+    profiles = FakeProfiles()
+    monkeypatch.setattr(user_profile, "get_supabase_service_client", lambda: profiles)
+    configure_google_client(transport=httpx.MockTransport(calendar_list))
+    calendar_metadata_cache.clear()
+    yield free_busy_calls
+    configure_google_client()
+    calendar_metadata_cache.clear()
+    access_token_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_common_slots_across_dozens_of_users(participants):
+    """Test that every participant's busy time is excluded and each is fetched with their own token."""
+    result = await scheduler.compute_common_availability(
+        USERS + ["user-offline"], "2025-09-01T09:00:00+00:00", "2025-09-01T17:00:00+00:00", [60, 180]
+    )
+
+    assert [(slot["start"], slot["end"], slot["duration_minutes"]) for slot in result["slots"]] == [
+        ("2025-09-01T09:00:00+00:00", "2025-09-01T10:00:00+00:00", 60),
+        ("2025-09-01T13:00:00+00:00", "2025-09-01T17:00:00+00:00", 60),
+        ("2025-09-01T13:00:00+00:00", "2025-09-01T17:00:00+00:00", 180),
+    ]
+    assert result["participants"] == USERS
+    assert result["unavailable"] == [{"user_id": "user-offline", "error": "Google Calendar is not connected"}]
+    assert sorted(participants) == sorted(f"token-{user}" for user in USERS)
+
+
+@pytest.mark.asyncio
+async def test_tool_resolves_emails_and_includes_the_requester(participants):
+    result = await scheduler.find_common_availability.ainvoke(
+        {
+            "participant_emails": ["user-1@example.edu", "nobody@example.edu"],
+            "start_date": "2025-09-01T09:00:00Z",
+            "end_date": "2025-09-01T17:00:00Z",
+            "rank": "longest",
+            "top_k": 1,
+        },
+        config={"configurable": {"user_id": "user-0"}},
+    )
+
+    # user-0 is busy 10-11, user-1 11-12
+    assert result["participants"] == ["user-1@example.edu"]
+    assert result["unavailable"] == ["nobody@example.edu"]
+    assert "unknown_emails" not in result
+    assert [(slot["start"], slot["free_minutes"]) for slot in result["slots"]] == [("2025-09-01T12:00:00+00:00", 300)]
+
+
+@pytest.mark.asyncio
+async def test_only_users_sharing_with_the_requester_are_read(participants):
+    """Test that unshared calendars are never fetched and look the same as unregistered emails."""
+    args = {
+        "participant_emails": ["user-3@example.edu", "user-5@example.edu", "nobody@example.edu"],
+        "start_date": "2025-09-01T09:00:00Z",
+        "end_date": "2025-09-01T17:00:00Z",
+    }
+
+    stranger = await scheduler.find_common_availability.ainvoke(args, config={"configurable": {"user_id": "user-0"}})
+    assert stranger["participants"] == []
+    assert stranger["unavailable"] == ["user-3@example.edu", "user-5@example.edu", "nobody@example.edu"]
+    assert sorted(participants) == ["token-user-0"]
+
+    friend = await scheduler.find_common_availability.ainvoke(args, config={"configurable": {"user_id": "user-4"}})
+    assert friend["participants"] == ["user-3@example.edu"]
+    assert friend["unavailable"] == ["user-5@example.edu", "nobody@example.edu"]
+
+
+def test_endpoint(client, participants):
+    client.app.dependency_overrides[get_current_user_dependency] = lambda: UserDict({"id": "user-0"})
+    try:
+        response = client.post(
+            "/api/calendar/common-availability",
+            json={
+                "participant_emails": ["user-2@example.edu"],
+                "start_date": "2025-09-01T09:00:00Z",
+                "end_date": "2025-09-01T17:00:00Z",
+            },
+        )
+    finally:
+        client.app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    # user-0 is busy 10-11, user-2 12-13
+    assert [slot["start"][11:16] for slot in response.json()["slots"]] == ["09:00", "11:00", "13:00"]
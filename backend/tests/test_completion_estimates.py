@@ -0,0 +1,134 @@
+"""
+Test batched, cached completion-time estimates and their write-back to user_tasks.
+"""
+
+import re
+
+import pytest
+
+import agents.project_manager as project_manager
+import services.completion_estimates as completion_estimates
+from services.completion_estimates import (
+    CompletionEstimateCache,
+    CompletionTimeEstimator,
+    EstimateBatch,
+    EstimateInput,
+    ItemEstimate,
+)
+
+
+class FakeEstimatorModel:
+    """Structured-output model answering 30 minutes per line of notes plus 60."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def with_structured_output(self, schema):
+        assert schema is EstimateBatch
+        return self
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        estimates = []
+        for number, notes in re.findall(r"\[(\d+)\] .*?\nNotes: (.*?)(?:\n\n|\n*$)", prompt, re.S):
+            lines = 0 if notes == "none" else notes.count("\n") + 1
+            estimates.append(ItemEstimate(index=int(number), minutes=60 + 30 * lines, explanation="Reading and problems"))
+        return EstimateBatch(estimates=estimates)
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.writes = []
+
+    async def query(self, table, method="GET", data=None, filters=None):
+        assert table == "user_tasks"
+        if method == "GET":
+            return [row for row in self.rows if row["user_id"] == filters["user_id"]]
+        self.writes.append((method, data, filters))
+        return [data]
+
+
+@pytest.mark.asyncio
+async def test_batches_and_reuses_estimates_until_content_changes():
+    model = FakeEstimatorModel()
+    estimator = CompletionTimeEstimator(model, project_manager.time_prompt, cache=CompletionEstimateCache(), batch_size=20)
+    items = [EstimateInput(f"Problem set {i}", "Chapter exercises", "Not started") for i in range(45)]
+
+    first = await estimator.estimate(items)
+    assert len(model.prompts) == 3
+    assert [estimate.minutes for estimate in first] == [60] * 45
+
+    again = await estimator.estimate(items)
+    assert len(model.prompts) == 3 and again == first
+
+    items[7] = EstimateInput("Problem set 7", "Chapter exercises", "In progress", "Q1-Q4 done\nQ5 left")
+    changed = await estimator.estimate(items)
+    assert len(model.prompts) == 4 and "[2]" not in model.prompts[-1]
+    assert changed[7].minutes == 120 and changed[6].minutes == 60
+
+
+@pytest.mark.asyncio
+async def test_tool_writes_estimates_back_to_user_tasks(fake_notion, monkeypatch):
+    api, backend = fake_notion
+    essay = backend.add_assignment("Essay", due_date="2025-09-10", description="Argumentative essay")
+    lab = backend.add_assignment("Lab report", due_date="2025-09-12")
+    backend.add_assignment("Old homework", status="Done", due_date="2025-09-01")
+    backend.add_block(lab, "paragraph", "Data collected")
+    supabase = FakeSupabase([{"id": "row-1", "user_id": "test-user-123", "notion_page_id": essay}])
+    model = FakeEstimatorModel()
+
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "llm", model)
+    monkeypatch.setattr(completion_estimates, "get_supabase_service_client", lambda: supabase)
+    completion_estimates.completion_estimate_cache.clear()
+
+    results = await project_manager.estimate_completion_time.ainvoke({}, config={"configurable": {"user_id": "test-user-123"}})
+
+    assert [(r["assignment"], r["estimated_minutes"]) for r in results] == [("Essay", 60), ("Lab report", 90)]
+    assert len(model.prompts) == 1
+    assert supabase.writes[0][0] == "PATCH" and supabase.writes[0][2] == {"id": "row-1"}
+    assert supabase.writes[0][1]["estimated_duration_minutes"] == 60
+    method, data, _ = supabase.writes[1]
+    assert method == "POST" and data["notion_page_id"] == lab and data["estimated_duration_minutes"] == 90
+
+    supabase.rows = [
+        {"id": "row-1", "user_id": "test-user-123", "notion_page_id": essay, "estimated_duration_minutes": 60},
+        {"id": "row-2", "user_id": "test-user-123", "notion_page_id": lab, "estimated_duration_minutes": 90},
+    ]
+    assert await completion_estimates.load_estimates("test-user-123") == {essay: 60, lab: 90}
+    completion_estimates.completion_estimate_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_unedited_pages_skip_notes_and_write_back(fake_notion, monkeypatch):
+    """Test that a repeat estimate fetches notes and saves only for pages edited since."""
+    api, backend = fake_notion
+    backend.add_assignment("Essay", due_date="2025-09-10")
+    lab = backend.add_assignment("Lab report", due_date="2025-09-12")
+    supabase = FakeSupabase([])
+    model = FakeEstimatorModel()
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "llm", model)
+    monkeypatch.setattr(completion_estimates, "get_supabase_service_client", lambda: supabase)
+    completion_estimates.completion_estimate_cache.clear()
+    config = {"configurable": {"user_id": "test-user-123"}}
+
+    await project_manager.estimate_completion_time.ainvoke({}, config=config)
+    backend.calls.clear()
+    supabase.writes.clear()
+
+    again = await project_manager.estimate_completion_time.ainvoke({}, config=config)
+    assert [r["estimated_minutes"] for r in again] == [60, 60]
+    assert len(model.prompts) == 1 and supabase.writes == []
+    assert [call[0] for call in backend.calls] == ["query_data_source"]
+
+    backend.add_block(lab, "paragraph", "Data collected")
+    backend.calls.clear()
+    edited = await project_manager.estimate_completion_time.ainvoke({}, config=config)
+
+    assert [r["estimated_minutes"] for r in edited] == [60, 90]
+    assert len(model.prompts) == 2 and "Essay" not in model.prompts[-1]
+    assert [call[1]["block_id"] for call in backend.calls if call[0] == "blocks/children/list"] == [lab]
+    assert [(method, data["notion_page_id"]) for method, data, _ in supabase.writes] == [("POST", lab)]
+    completion_estimates.completion_estimate_cache.clear()
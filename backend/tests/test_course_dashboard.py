@@ -0,0 +1,93 @@
+"""
+Test the course progress dashboard and its per-user cache.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import agents.project_manager as project_manager
+from models.assignment import Assignment
+from services.course_dashboard import build_course_dashboard
+from utils.auth import UserDict, get_current_user_dependency
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+
+def day(offset):
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).date().isoformat()
+
+
+def test_assignments_are_joined_to_courses_by_relation(fake_notion):
+    _, backend = fake_notion
+    physics = backend.add_course("Physics 101")
+    history = backend.add_course("History 210")
+    backend.add_assignment("Lab 1", status="Done", due_date="2025-09-01", course_id=physics)
+    lab2 = backend.add_assignment("Lab 2", status="In progress", due_date="2025-09-04", course_id=physics)
+    backend.add_assignment("Lab 3", due_date="2025-09-20", course_id=physics)
+    essay = backend.add_assignment("Essay", due_date="2025-09-09", course_id=history)
+    backend.add_assignment("Old quiz", due_date="2025-08-20", course_id="deleted-course")
+    courses = {"Physics 101": backend.course_pages[physics], "History 210": backend.course_pages[history]}
+
+    dashboard = build_course_dashboard(
+        courses, backend.assignment_pages.values(), datetime(2025, 9, 5, 12, tzinfo=timezone.utc), estimates={essay: 45}
+    )
+
+    by_course = {course["course"]: course for course in dashboard["courses"]}
+    assert [course["course"] for course in dashboard["courses"]] == ["Physics 101", "History 210", "No course"]
+    physics_progress = by_course["Physics 101"]
+    assert physics_progress["by_status"] == {"Done": 1, "In progress": 1, "Not started": 1}
+    assert (physics_progress["total"], physics_progress["completed"], physics_progress["completion_rate"]) == (3, 1, 0.333)
+    assert [(item["assignment_id"], item["days_overdue"]) for item in physics_progress["overdue"]] == [(lab2, 0)]
+    assert by_course["History 210"]["upcoming"]["estimated_minutes"] == 45
+    assert by_course["No course"]["overdue"][0]["assignment"] == "Old quiz"
+    assert dashboard["totals"] == {"total": 5, "completed": 1, "overdue": 2, "upcoming": 1, "upcoming_minutes": 45}
+
+
+@pytest.mark.asyncio
+async def test_tool_is_cached_until_a_write(fake_notion, monkeypatch):
+    api, backend = fake_notion
+    physics = backend.add_course("Physics 101")
+    backend.add_assignment("Lab 1", due_date=day(2), course_id=physics)
+
+    async def no_estimates(user_id):
+        return {}
+
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "load_estimates", no_estimates)
+
+    first = await project_manager.get_course_progress.ainvoke({}, config=CONFIG)
+    assert sorted(kwargs["data_source_id"] for _, kwargs in backend.calls) == ["assignments-ds", "courses-ds"]
+    backend.calls.clear()
+
+    assert await project_manager.get_course_progress.ainvoke({}, config=CONFIG) == first
+    assert backend.calls == []
+
+    api.create_assignment_page(
+        Assignment(name="Lab 2", description="", due_date=datetime.now() + timedelta(days=3), course_name="Physics 101"),
+        course_page_id=physics,
+    )
+    backend.calls.clear()
+    updated = await project_manager.get_course_progress.ainvoke({}, config=CONFIG)
+    assert len(backend.calls) == 2
+    assert updated["courses"][0]["upcoming"]["count"] == 2 and first["courses"][0]["upcoming"]["count"] == 1
+
+
+def test_endpoint(client, fake_notion, monkeypatch):
+    api, backend = fake_notion
+    backend.add_assignment("Worksheet", due_date=day(-1))
+
+    async def no_estimates(user_id):
+        return {}
+
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "load_estimates", no_estimates)
+    client.app.dependency_overrides[get_current_user_dependency] = lambda: UserDict({"id": "test-user-123"})
+    try:
+        response = client.get("/api/courses/progress", params={"upcoming_days": 3})
+    finally:
+        client.app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["upcoming_days"] == 3 and body["totals"]["overdue"] == 1
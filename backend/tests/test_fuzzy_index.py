@@ -0,0 +1,57 @@
+"""
+Test the token/trigram inverted index used for local fuzzy search.
+"""
+
+from utils.fuzzy_index import FuzzyIndex, within_one_edit
+
+
+def build_index():
+    index = FuzzyIndex({"summary": 1.0, "location": 0.8, "description": 0.6})
+    index.add("calc", {"summary": "Calculus II lecture", "location": "Hall B"})
+    index.add("advisor", {"summary": "Advisor meeting", "description": "Talk about calculus grade"})
+    index.add("gym", {"summary": "Gym"})
+    return index
+
+
+def test_exact_prefix_and_typo_matches():
+    index = build_index()
+
+    assert [doc for doc, _ in index.search("calculus")] == ["calc", "advisor"]
+    assert index.search("calc lect") == [("calc", 0.9)]
+    assert [doc for doc, _ in index.search("advisr meetign")] == ["advisor"]
+    assert [doc for doc, _ in index.search("gmy")] == ["gym"]
+    assert index.search("dentist") == [] and index.search("") == []
+
+
+def test_every_query_token_must_match():
+    index = build_index()
+    assert index.search("calculus gym") == []
+
+
+def test_updates_and_removals_keep_the_index_consistent():
+    index = build_index()
+    index.add("gym", {"summary": "Swim practice"})
+    index.remove("advisor")
+
+    assert index.search("gym") == []
+    assert [doc for doc, _ in index.search("swim")] == ["gym"]
+    assert [doc for doc, _ in index.search("calculus")] == ["calc"]
+    assert "advisor" not in index and len(index) == 2
+    assert "meeting" not in index._postings and "meeting" not in index._gram_counts
+
+
+def test_within_one_edit():
+    assert within_one_edit("gmy", "gym") and within_one_edit("gym", "gyms") and within_one_edit("gym", "gum")
+    assert not within_one_edit("gym", "gym") and not within_one_edit("abc", "bca")
+
+
+def test_ranked_search_weights_rare_tokens():
+    index = FuzzyIndex()
+    index.add("chem", {"title": "Chemistry lab report"})
+    index.add("bio", {"title": "Biology lab report"})
+    index.add("essay", {"title": "History essay"})
+
+    results = index.search("chemistry lab", match_all=False)
+    assert [doc for doc, _ in results] == ["chem", "bio"]
+    assert results[0][1] == 1.0 and results[1][1] < 0.5
+    assert index.search("physics lab report", match_all=False, min_score=0.6) == []
@@ -0,0 +1,61 @@
+"""
+Test the shared Google HTTP client used by the scheduler and OAuth service.
+"""
+
+import httpx
+import pytest
+
+from agents.scheduler import call_calendar_api
+from services.google_calendar_oauth import GoogleCalendarOAuthService
+from services.google_http import close_google_clients, configure_google_client, get_google_client
+
+
+@pytest.fixture
+def google_requests():
+    """Route the shared client to an in-memory transport and record requests."""
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.url.host == "oauth2.googleapis.com":
+            return httpx.Response(200, json={"access_token": "new-token", "expires_in": 3600})
+        return httpx.Response(200, json={"items": [], "timeZone": "America/New_York"})
+
+    configure_google_client(transport=httpx.MockTransport(handler))
+    yield seen
+    configure_google_client()
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_within_a_loop(google_requests):
+    """Test that every call on the same event loop shares one pooled client."""
+    assert get_google_client() is get_google_client()
+    await close_google_clients()
+    assert not get_google_client().is_closed
+
+
+@pytest.mark.asyncio
+async def test_calendar_calls_inject_auth_per_request(google_requests):
+    """Test that each request carries its own bearer token and asks for gzip."""
+    await call_calendar_api("calendars/primary", "token-a")
+    await call_calendar_api("calendars/primary", "token-b")
+
+    assert [request.headers["Authorization"] for request in google_requests] == ["Bearer token-a", "Bearer token-b"]
+    assert google_requests[0].headers["Accept-Encoding"] == "gzip"
+    assert "gzip" in google_requests[0].headers["User-Agent"]
+
+
+@pytest.mark.asyncio
+async def test_oauth_service_shares_the_client(google_requests, monkeypatch):
+    """Test that OAuth token refreshes go through the pooled client."""
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_ID", "client-id")
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_SECRET", "client-secret")
+    service = GoogleCalendarOAuthService()
+
+    token = await service.refresh_access_token("refresh-token")
+    connection = await service.test_google_calendar_connection("token-c")
+
+    assert token["access_token"] == "new-token"
+    assert connection["success"] is True
+    assert [request.url.host for request in google_requests] == ["oauth2.googleapis.com", "www.googleapis.com"]
+    assert google_requests[1].headers["Authorization"] == "Bearer token-c"
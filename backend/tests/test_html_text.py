@@ -0,0 +1,61 @@
+"""
+Test the streaming HTML cleaner against the BeautifulSoup implementation it replaced.
+"""
+
+import re
+
+import pytest
+from bs4 import BeautifulSoup
+
+from utils.html_text import html_to_text, NOTION_TEXT_LIMIT
+
+# Descriptions in the shape Canvas exports them
+CANVAS_DESCRIPTIONS = [
+    "",
+    "Plain text with no markup at all.",
+    "<p>Read <strong>Chapter 4</strong> and answer the questions&nbsp;below.</p>\n<ol>\n<li>Q1</li>\n<li>Q2</li>\n</ol>",
+    '<div class="description user_content"><h2>Lab 3 &ndash; Kinematics</h2>'
+    "<p>Submit your write-up as a PDF. Late penalty: 10%/day.</p>"
+    '<p><a href="https://canvas.example.edu/courses/1/files/2?verifier=abc&amp;wrap=1" target="_blank">Lab handout</a></p></div>',
+    "<p>Due <em>Friday</em> &#8212; see rubric:</p><table><tr><td>Clarity</td><td>40%</td></tr>"
+    "<tr><td>Analysis</td><td>60%</td></tr></table>",
+    '<p style="text-align: center;"><img src="/img.png" alt="diagram > 1" width="300"><br>Figure&nbsp;1</p>',
+    "<p>Q&amp;A session: bring questions &lt;= 3 pages. Use R &amp; Python.</p><!-- instructor note -->",
+    "<p>Curly &#147;quotes&#148; from Word &#x2019;s export</p>",
+    "<script>window.alert('<b>nope</b>')</script><p>After script</p><style>.x{color:red}</style>",
+    "<p>Unclosed <b>bold and a stray &#entity</p>",
+    "<p>" + "Write a reflective essay on the readings. " * 80 + "</p>",
+]
+
+
+def reference_clean_html(html_content):
+    """The previous BeautifulSoup based implementation of NotionAPI.clean_html."""
+    if not html_content:
+        return ""
+    text = BeautifulSoup(html_content, "html.parser").get_text()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text[:2000]
+
+
+@pytest.mark.parametrize("html_content", CANVAS_DESCRIPTIONS)
+def test_matches_beautifulsoup(html_content):
+    """Test that output is identical to the BeautifulSoup cleaner."""
+    assert html_to_text(html_content) == reference_clean_html(html_content)
+
+
+def test_truncates_to_notion_limit():
+    """Test that long descriptions stop at the Notion rich_text limit."""
+    text = html_to_text("<p>" + "word " * 5000 + "</p>")
+    assert len(text) == NOTION_TEXT_LIMIT
+    assert text == reference_clean_html("<p>" + "word " * 5000 + "</p>")
+
+
+def test_custom_limit():
+    """Test that a smaller limit truncates after whitespace collapsing."""
+    assert html_to_text("<p>  a \n\n b   c </p>", limit=3) == "a b"
+
+
+def test_hidden_elements_are_skipped():
+    """Test that template and ruby annotation text is dropped like get_text() does."""
+    html_content = "<ruby>漢<rt>kan</rt></ruby><template><p>hidden</p></template>shown"
+    assert html_to_text(html_content) == reference_clean_html(html_content) == "漢shown"
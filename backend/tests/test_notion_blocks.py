@@ -0,0 +1,114 @@
+"""
+Test concurrent block fetching and page-content caching.
+"""
+
+import pytest
+
+from services.notion_blocks import BlockContentFetcher, block_to_text, get_page_content, page_content_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    page_content_cache.clear()
+    yield
+    page_content_cache.clear()
+
+
+def build_notes(backend):
+    page_id = backend.add_assignment("Essay 1")
+    backend.add_block(page_id, "heading_2", "Outline")
+    intro = backend.add_block(page_id, "numbered_list_item", "Intro")
+    backend.add_block(intro, "bulleted_list_item", "Hook")
+    backend.add_block(page_id, "numbered_list_item", "Body")
+    backend.add_block(page_id, "to_do", "Find sources", checked=True)
+    toggle = backend.add_block(page_id, "toggle", "Details")
+    level2 = backend.add_block(toggle, "paragraph", "Level 2")
+    level3 = backend.add_block(level2, "paragraph", "Level 3")
+    backend.add_block(level3, "paragraph", "Level 4")
+    backend.add_block(page_id, "child_page", title="Research")
+    return page_id
+
+
+def test_fetch_text_renders_nested_blocks(fake_notion):
+    """Test that nested blocks are rendered in document order with indentation."""
+    api, backend = fake_notion
+    page_id = build_notes(backend)
+
+    text = BlockContentFetcher(api).fetch_text(page_id)
+
+    assert text.split("\n") == [
+        "## Outline",
+        "1. Intro",
+        "  - Hook",
+        "2. Body",
+        "[x] Find sources",
+        "Details",
+        "  Level 2",
+        "    Level 3",
+        "[page: Research]",
+    ]
+
+
+def test_depth_limit_skips_deeper_levels(fake_notion):
+    """Test that blocks deeper than max_depth are never requested."""
+    api, backend = fake_notion
+    page_id = build_notes(backend)
+
+    text = BlockContentFetcher(api, max_depth=1).fetch_text(page_id)
+
+    assert "Hook" not in text and "Level 2" not in text
+    assert [call[0] for call in backend.calls] == ["blocks/children/list"]
+
+
+def test_pagination_is_followed(fake_notion):
+    """Test that every page of a block's children is fetched."""
+    api, backend = fake_notion
+    page_id = backend.add_assignment("Reading log")
+    for i in range(250):
+        backend.add_block(page_id, "paragraph", f"line {i}")
+
+    text = BlockContentFetcher(api).fetch_text(page_id)
+
+    assert text.count("\n") == 249
+    assert len(backend.calls) == 3
+
+
+def test_cache_is_keyed_by_last_edited_time(fake_notion):
+    """Test that unchanged pages are served from the cache and edits refetch."""
+    api, backend = fake_notion
+    page_id = build_notes(backend)
+    page = backend.assignment_pages[page_id]
+
+    first = get_page_content(api, page)
+    calls = len(backend.calls)
+    assert get_page_content(api, page) == first
+    assert len(backend.calls) == calls
+
+    backend.add_block(page_id, "paragraph", "New thought")
+    page["last_edited_time"] = "2025-02-01T00:00:00.000Z"
+    assert get_page_content(api, page).endswith("New thought")
+
+
+def test_failed_fetches_are_not_cached(fake_notion):
+    """Test that a transient error doesn't leave the notes looking empty until the page is edited."""
+    api, backend = fake_notion
+    page_id = build_notes(backend)
+    page = backend.assignment_pages[page_id]
+
+    def flaky(operation_type, **kwargs):
+        if operation_type == "blocks/children/list" and kwargs["block_id"] == page_id:
+            raise TimeoutError("read timed out")
+        return backend(operation_type, **kwargs)
+
+    api.make_notion_request = flaky
+    assert get_page_content(api, page) == ""
+
+    api.make_notion_request = backend
+    assert get_page_content(api, page).startswith("## Outline")
+
+
+def test_block_to_text_media_and_code():
+    image = {"type": "image", "image": {"type": "external", "external": {"url": "https://x/y.png"}, "caption": []}}
+    code = {"type": "code", "code": {"language": "python", "rich_text": [{"plain_text": "print(1)"}]}}
+    assert block_to_text(image) == "[image: https://x/y.png]"
+    assert block_to_text(code) == "```python\nprint(1)\n```"
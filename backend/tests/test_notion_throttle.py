@@ -0,0 +1,129 @@
+"""
+Test adaptive throttling and retry classification for Notion requests.
+"""
+
+import httpx
+import pytest
+from notion_client.errors import APIResponseError, RequestTimeoutError
+
+from services.notion_throttle import AdaptiveRequestController, classify_error, parse_retry_after
+
+
+def notion_error(status, code, headers=None):
+    response = httpx.Response(status, headers=headers or {}, request=httpx.Request("POST", "https://api.notion.com/v1/x"))
+    return APIResponseError(response, f"{code} message", code)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_controller(clock, **kwargs):
+    return AdaptiveRequestController(sleep=clock.sleep, clock=clock, **kwargs)
+
+
+def flaky(errors, result="ok"):
+    calls = []
+
+    def request():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return request, calls
+
+
+def test_classification():
+    """Test that 429s throttle, transient errors retry and validation errors are fatal."""
+    assert classify_error(notion_error(429, "rate_limited", {"Retry-After": "4"})) == ("throttled", 4.0)
+    assert classify_error(notion_error(409, "conflict_error"))[0] == "retryable"
+    assert classify_error(notion_error(503, "service_unavailable"))[0] == "retryable"
+    assert classify_error(RequestTimeoutError())[0] == "retryable"
+    assert classify_error(notion_error(400, "validation_error"))[0] == "fatal"
+    assert classify_error(notion_error(404, "object_not_found"))[0] == "fatal"
+    assert classify_error(ValueError("Unknown operation type"))[0] == "fatal"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_retry_after_is_honored_and_halves_concurrency():
+    """Test that a 429 waits exactly Retry-After and applies multiplicative decrease."""
+    clock = FakeClock()
+    controller = make_controller(clock, initial_limit=4)
+    request, calls = flaky([notion_error(429, "rate_limited", {"Retry-After": "7"})])
+
+    assert controller.call(request) == "ok"
+
+    assert len(calls) == 2
+    assert 7.0 in clock.sleeps
+    metrics = controller.metrics()
+    assert metrics["throttles"] == 1
+    assert metrics["retries"] == 1
+    assert metrics["concurrency_limit"] == 2
+    assert metrics["wait_time_seconds"] >= 7.0
+
+
+def test_validation_errors_are_not_retried():
+    """Test that a 400 is raised on the first attempt."""
+    clock = FakeClock()
+    controller = make_controller(clock)
+    request, calls = flaky([notion_error(400, "validation_error")])
+
+    with pytest.raises(APIResponseError):
+        controller.call(request)
+
+    assert len(calls) == 1
+    assert controller.metrics()["failures"] == 1
+    assert controller.metrics()["retries"] == 0
+
+
+def test_transient_errors_give_up_after_max_tries():
+    """Test that 5xx errors back off and eventually surface."""
+    clock = FakeClock()
+    controller = make_controller(clock, max_tries=3)
+    request, calls = flaky([notion_error(502, "bad_gateway") for _ in range(5)])
+
+    with pytest.raises(APIResponseError):
+        controller.call(request)
+
+    assert len(calls) == 3
+    assert controller.metrics()["retries"] == 2
+
+
+def test_successes_grow_concurrency_additively():
+    """Test that the concurrency limit recovers slowly after throttling."""
+    clock = FakeClock()
+    controller = make_controller(clock, initial_limit=2, max_limit=4)
+
+    for _ in range(3):
+        controller.call(lambda: None)
+    assert controller.concurrency_limit == 3
+    for _ in range(20):
+        controller.call(lambda: None)
+    assert controller.concurrency_limit == 4
+
+
+def test_requests_are_paced_to_the_rate_limit():
+    """Test that consecutive request starts are spaced by 1 / rate."""
+    clock = FakeClock()
+    controller = make_controller(clock, rate_per_second=3)
+    starts = []
+
+    for _ in range(4):
+        controller.call(lambda: starts.append(clock.now))
+
+    assert starts == pytest.approx([0.0, 1 / 3, 2 / 3, 1.0])
@@ -0,0 +1,155 @@
+"""
+Test the write-behind queue for Notion assignment writes.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from models.assignment import Assignment
+from services.notion_write_queue import NotionWriteQueue, format_failure_notice, write_behind_enabled
+
+
+class RecordingNotionAPI:
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.writes = []
+
+    def create_assignment_page(self, assignment):
+        return self._write("create", assignment)
+
+    def update_assignment_page(self, assignment):
+        return self._write("update", assignment)
+
+    def _write(self, operation, assignment):
+        self.writes.append((operation, assignment))
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("Notion is unavailable")
+        return {"id": "page-1"}
+
+
+@pytest.fixture
+def notion():
+    return RecordingNotionAPI()
+
+
+@pytest.fixture
+def queue(tmp_path, notion):
+    queue = NotionWriteQueue(
+        path=str(tmp_path / "writes.db"), notion_api_factory=lambda user_id: notion, base_delay=0, autostart=False
+    )
+    yield queue
+    queue.stop()
+
+
+def essay(**changes):
+    values = dict(name="Essay 1", description="Draft", due_date=datetime(2025, 10, 1, 17, 0), course_name="English 103")
+    values.update(changes)
+    return Assignment(**values)
+
+
+def test_enqueue_returns_provisional_result_before_writing(queue, notion):
+    """Test that the tool result comes back without touching Notion."""
+    result = queue.enqueue("user-1", "create", essay())
+
+    assert result["status"] == "queued"
+    assert notion.writes == []
+    assert [write["name"] for write in queue.pending("user-1")] == ["Essay 1"]
+
+
+def test_repeated_writes_are_coalesced(queue, notion):
+    """Test that a create followed by updates becomes one create with the latest fields."""
+    queue.enqueue("user-1", "create", essay())
+    queue.enqueue("user-1", "update", essay(status="In progress"))
+    result = queue.enqueue("user-1", "update", essay(status="Done", priority="High"))
+
+    assert result["coalesced"] is True
+    assert queue.flush() == 1
+    ((operation, assignment),) = notion.writes
+    assert operation == "create"
+    assert (assignment.status, assignment.priority) == ("Done", "High")
+    assert assignment.due_date == datetime(2025, 10, 1, 17, 0)
+    assert queue.pending("user-1") == []
+
+
+def test_writes_survive_a_restart(tmp_path, notion):
+    """Test that queued writes are persisted and flushed by a new queue instance."""
+    path = str(tmp_path / "writes.db")
+    NotionWriteQueue(path=path, notion_api_factory=lambda user_id: notion, autostart=False).enqueue(
+        "user-1", "update", essay()
+    )
+
+    restarted = NotionWriteQueue(path=path, notion_api_factory=lambda user_id: notion, autostart=False)
+    assert restarted.flush() == 1
+    assert len(notion.writes) == 1
+
+
+def test_failures_retry_then_surface_once(queue, notion):
+    """Test that exhausted retries are reported on the next turn, and only once."""
+    notion.fail_times = 10
+    queue.max_attempts = 3
+    queue.enqueue("user-1", "update", essay(status="Done"))
+
+    for _ in range(3):
+        queue.flush()
+
+    assert len(notion.writes) == 3
+    failures = queue.pop_failures("user-1")
+    assert [(failure["name"], failure["error"]) for failure in failures] == [("Essay 1", "Notion is unavailable")]
+    assert "Essay 1" in format_failure_notice(failures)
+    assert queue.pop_failures("user-1") == []
+
+
+def test_transient_failure_recovers(queue, notion):
+    notion.fail_times = 1
+    queue.enqueue("user-1", "update", essay())
+
+    queue.flush()
+    queue.flush()
+
+    assert len(notion.writes) == 2
+    assert queue.pending("user-1") == [] and queue.pop_failures("user-1") == []
+
+
+def test_update_waits_behind_an_unfinished_create(queue, notion):
+    """Test that an update queued while its create is in flight isn't sent before the create lands."""
+    create = notion.create_assignment_page
+
+    def failing_create(assignment):
+        # The user edits the assignment while the create is being sent, and the create then fails
+        queue.enqueue("user-1", "update", essay(status="In progress"))
+        notion.create_assignment_page = create
+        notion.writes.append(("create", assignment))
+        raise RuntimeError("Notion is unavailable")
+
+    notion.create_assignment_page = failing_create
+    queue.enqueue("user-1", "create", essay())
+
+    assert queue.flush() == 1
+    assert queue.flush() == 1  # the retried create; the update waits behind it
+    assert queue.flush() == 1
+    assert [operation for operation, _ in notion.writes] == ["create", "create", "update"]
+    assert notion.writes[-1][1].status == "In progress"
+
+
+def test_edits_keep_the_retry_count(queue, notion):
+    """Test that coalescing doesn't reset attempts, so a write that always fails still gives up."""
+    notion.fail_times = 10
+    queue.max_attempts = 3
+    queue.enqueue("user-1", "update", essay())
+
+    for status in ("In progress", "Done", "Done"):
+        queue.flush()
+        queue.enqueue("user-1", "update", essay(status=status))
+
+    assert len(notion.writes) == 3
+    assert [failure["attempts"] for failure in queue.pop_failures("user-1")] == [3]
+
+
+def test_write_behind_enabled(monkeypatch):
+    monkeypatch.delenv("NOTION_WRITE_BEHIND", raising=False)
+    assert write_behind_enabled({"configurable": {}}) is False
+    assert write_behind_enabled({"configurable": {"write_behind": True}}) is True
+    monkeypatch.setenv("NOTION_WRITE_BEHIND", "true")
+    assert write_behind_enabled(None) is True
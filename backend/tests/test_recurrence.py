@@ -0,0 +1,174 @@
+"""
+Test local expansion of recurring events against what singleEvents=True returns.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import agents.scheduler as scheduler
+from utils.recurrence import expand_recurring_events
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+LECTURE = {
+    "id": "lecture",
+    "status": "confirmed",
+    "summary": "CS 101",
+    "location": "Hall A",
+    "start": {"dateTime": "2025-10-27T10:00:00-04:00", "timeZone": "America/New_York"},
+    "end": {"dateTime": "2025-10-27T11:15:00-04:00", "timeZone": "America/New_York"},
+    "recurrence": [
+        "RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR;UNTIL=20251107T150000Z",
+        "EXDATE;TZID=America/New_York:20251029T100000",
+    ],
+}
+# Friday's lecture moved to the afternoon, next Wednesday's cancelled
+MOVED = {
+    "id": "lecture_20251031T140000Z",
+    "status": "confirmed",
+    "summary": "CS 101 (makeup room)",
+    "start": {"dateTime": "2025-10-31T15:00:00-04:00", "timeZone": "America/New_York"},
+    "end": {"dateTime": "2025-10-31T16:15:00-04:00", "timeZone": "America/New_York"},
+    "recurringEventId": "lecture",
+    "originalStartTime": {"dateTime": "2025-10-31T10:00:00-04:00", "timeZone": "America/New_York"},
+}
+CANCELLED = {
+    "id": "lecture_20251105T150000Z",
+    "status": "cancelled",
+    "recurringEventId": "lecture",
+    "originalStartTime": {"dateTime": "2025-11-05T10:00:00-05:00", "timeZone": "America/New_York"},
+}
+CLUB = {
+    "id": "club",
+    "status": "confirmed",
+    "summary": "Chess club",
+    "start": {"date": "2025-10-28"},
+    "end": {"date": "2025-10-29"},
+    "recurrence": ["RRULE:FREQ=WEEKLY;COUNT=3"],
+}
+ONE_OFF = {
+    "id": "dentist",
+    "status": "confirmed",
+    "summary": "Dentist",
+    "start": {"dateTime": "2025-11-03T08:00:00-05:00"},
+    "end": {"dateTime": "2025-11-03T09:00:00-05:00"},
+}
+
+# (id, start) of what Google sends for the same window with singleEvents=True&orderBy=startTime
+EXPECTED = [
+    ("lecture_20251027T140000Z", "2025-10-27T10:00:00-04:00"),
+    ("club_20251028", "2025-10-28"),
+    ("lecture_20251031T140000Z", "2025-10-31T15:00:00-04:00"),
+    ("dentist", "2025-11-03T08:00:00-05:00"),
+    ("lecture_20251103T150000Z", "2025-11-03T10:00:00-05:00"),
+    ("club_20251104", "2025-11-04"),
+    ("lecture_20251107T150000Z", "2025-11-07T10:00:00-05:00"),
+    ("club_20251111", "2025-11-11"),
+]
+
+
+def window(start, end):
+    return datetime.fromisoformat(start), datetime.fromisoformat(end)
+
+
+def test_expansion_matches_single_events():
+    """Test EXDATE, moved and cancelled exceptions, all-day series and the DST change."""
+    events = expand_recurring_events(
+        [LECTURE, MOVED, CANCELLED, CLUB, ONE_OFF],
+        *window("2025-10-27T00:00:00-04:00", "2025-11-15T00:00:00-05:00"),
+        time_zone="America/New_York",
+    )
+
+    assert [(e["id"], e["start"].get("dateTime", e["start"].get("date"))) for e in events] == EXPECTED
+    instance = events[0]
+    assert instance["recurringEventId"] == "lecture" and instance["location"] == "Hall A"
+    assert instance["end"] == {"dateTime": "2025-10-27T11:15:00-04:00", "timeZone": "America/New_York"}
+    assert "recurrence" not in instance
+    assert events[2]["summary"] == "CS 101 (makeup room)"
+
+
+def test_window_clips_instances_and_keeps_overlapping_ones():
+    """Test that an instance already running at time_min is included, like Google's overlap semantics."""
+    events = expand_recurring_events([LECTURE], *window("2025-11-03T10:30:00-05:00", "2025-11-07T10:00:00-05:00"))
+
+    assert [event["id"] for event in events] == ["lecture_20251103T150000Z", "lecture_20251105T150000Z"]
+
+
+def test_floating_until_and_rdate():
+    master = {
+        "id": "review",
+        "start": {"dateTime": "2025-03-07T18:00:00-05:00", "timeZone": "America/New_York"},
+        "end": {"dateTime": "2025-03-07T19:00:00-05:00", "timeZone": "America/New_York"},
+        "recurrence": ["RRULE:FREQ=DAILY;UNTIL=20250310", "RDATE;TZID=America/New_York:20250314T090000"],
+    }
+
+    events = expand_recurring_events([master], *window("2025-03-01T00:00:00+00:00", "2025-04-01T00:00:00+00:00"))
+
+    assert [event["start"]["dateTime"] for event in events] == [
+        "2025-03-07T18:00:00-05:00",
+        "2025-03-08T18:00:00-05:00",
+        "2025-03-09T18:00:00-04:00",
+        "2025-03-10T18:00:00-04:00",
+        "2025-03-14T09:00:00-04:00",
+    ]
+    assert events[2]["id"] == "review_20250309T220000Z"
+
+
+@pytest.fixture
+def compact_events(monkeypatch):
+    requests = []
+
+    async def fake_token(config):
+        return "token"
+
+    async def fake_call(endpoint, access_token, method="GET", params=None, json_data=None):
+        requests.append(dict(params))
+        return {"items": [LECTURE, MOVED, CANCELLED, ONE_OFF]}
+
+    monkeypatch.setattr(scheduler, "get_user_access_token", fake_token)
+    monkeypatch.setattr(scheduler, "call_calendar_api", fake_call)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_long_ranges_fetch_series_once(compact_events):
+    events = await scheduler.get_events.ainvoke(
+        {"start_date": "2025-10-01T00:00:00Z", "end_date": "2025-12-01T00:00:00Z", "calendar_id": "school"}, config=CONFIG
+    )
+
+    [request] = compact_events
+    assert request["singleEvents"] is False and request["showDeleted"] is True
+    assert "orderBy" not in request and "recurrence" in request["fields"]
+    assert [event["id"] for event in events] == [
+        "lecture_20251027T140000Z",
+        "lecture_20251031T140000Z",
+        "dentist",
+        "lecture_20251103T150000Z",
+        "lecture_20251107T150000Z",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_short_ranges_still_let_google_expand(compact_events):
+    await scheduler.get_events.ainvoke(
+        {"start_date": "2020-01-01T00:00:00Z", "end_date": "2020-01-08T00:00:00Z", "calendar_id": "school"}, config=CONFIG
+    )
+
+    assert compact_events[0]["singleEvents"] is True and compact_events[0]["orderBy"] == "startTime"
+
+
+@pytest.mark.asyncio
+async def test_long_future_ranges_expand_locally_instead_of_using_the_store(compact_events, monkeypatch):
+    async def no_store(*args, **kwargs):
+        raise AssertionError("long ranges must not be served from the event store")
+
+    monkeypatch.setattr(scheduler, "query_stored_events", no_store)
+    start = datetime.now(timezone.utc) + timedelta(days=14)
+    await scheduler.get_events.ainvoke(
+        {"start_date": start.isoformat(), "end_date": (start + timedelta(days=75)).isoformat(), "calendar_id": "school"},
+        config=CONFIG,
+    )
+
+    [request] = compact_events
+    assert request["singleEvents"] is False and "syncToken" not in request
@@ -0,0 +1,68 @@
+"""
+Test the fast-path relative date parser and its lazy dateparser fallback.
+"""
+
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import utils.relative_dates as relative_dates
+from utils.relative_dates import parse_fast, parse_relative_date
+
+# A Wednesday afternoon
+BASE = datetime(2025, 9, 3, 14, 30, 15)
+
+
+@pytest.mark.parametrize(
+    "phrase, expected",
+    [
+        ("now", "2025-09-03T14:30:15"),
+        ("tomorrow", "2025-09-04T14:30:15"),
+        ("Tomorrow at 5pm", "2025-09-04T17:00:00"),
+        ("today at 12am", "2025-09-03T00:00:00"),
+        ("at 5:45 p.m.", "2025-09-03T17:45:00"),
+        ("friday", "2025-09-05T00:00:00"),
+        ("wednesday", "2025-09-03T00:00:00"),
+        ("next Wednesday", "2025-09-10T00:00:00"),
+        ("next Monday at 3pm", "2025-09-08T15:00:00"),
+        ("Fri 9:30am", "2025-09-05T09:30:00"),
+        ("in 3 days", "2025-09-06T14:30:15"),
+        ("in an hour", "2025-09-03T15:30:15"),
+        ("2 weeks ago", "2025-08-20T14:30:15"),
+        ("2025-10-01 at noon", "2025-10-01T12:00:00"),
+        ("day after tomorrow at 17:00", "2025-09-05T17:00:00"),
+    ],
+)
+def test_common_phrases_take_the_fast_path(phrase, expected):
+    assert parse_fast(phrase, BASE).isoformat() == expected
+
+
+def test_other_phrases_fall_back_to_dateparser(monkeypatch):
+    calls = []
+
+    def fake_parse(text, settings):
+        calls.append((text, settings["RELATIVE_BASE"]))
+        return datetime(2025, 9, 7)
+
+    monkeypatch.setattr(relative_dates, "_dateparser_parse", fake_parse)
+    relative_dates._parse_with_dateparser.cache_clear()
+
+    assert parse_fast("end of the week at 6pm", BASE) is None and parse_fast("at 13pm", BASE) is None
+    assert parse_relative_date("end of the week at 6pm", BASE) == datetime(2025, 9, 7, 18, 0)
+    assert parse_relative_date("end of the week at 6pm", BASE.replace(second=40)) == datetime(2025, 9, 7, 18, 0)
+    assert parse_relative_date("tomorrow", BASE) == datetime(2025, 9, 4, 14, 30, 15)
+    assert calls == [("end of the week at 6pm", datetime(2025, 9, 3, 14, 30))]
+    relative_dates._parse_with_dateparser.cache_clear()
+
+
+def test_dateparser_is_not_imported_until_needed():
+    code = (
+        "import sys, utils.relative_dates as r; r.parse_relative_date('tomorrow at 5pm'); print('dateparser' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,101 @@
+"""
+Test concurrent multi-calendar fetching in the scheduler tools.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import agents.scheduler as scheduler
+from services.calendar_cache import calendar_metadata_cache
+from services.google_http import configure_google_client
+
+CALENDARS = {f"Calendar {i}": f"cal-{i}" for i in range(10)}
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+
+@pytest.fixture
+def fake_calendar(monkeypatch):
+    """Serve calendarList and events from memory with a fixed latency per calendar."""
+    delays = {cal_id: 0.2 for cal_id in CALENDARS.values()}
+    failures = {}
+
+    async def fake_token(config):
+        return "token"
+
+    def calendar_list(request):
+        return httpx.Response(200, json={"items": [{"summary": name, "id": cal_id} for name, cal_id in CALENDARS.items()]})
+
+    async def fake_call(endpoint, access_token, method="GET", params=None, json_data=None):
+        cal_id = endpoint.split("/")[1]
+        await asyncio.sleep(delays[cal_id])
+        if cal_id in failures:
+            raise failures[cal_id]
+        return {"items": [{"id": f"{cal_id}-event", "summary": f"Event in {cal_id}"}]}
+
+    monkeypatch.setattr(scheduler, "get_user_access_token", fake_token)
+    monkeypatch.setattr(scheduler, "call_calendar_api", fake_call)
+    configure_google_client(transport=httpx.MockTransport(calendar_list))
+    calendar_metadata_cache.clear()
+    yield delays, failures
+    configure_google_client()
+    calendar_metadata_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_all_calendars_are_fetched_concurrently(fake_calendar):
+    """Test that wall-clock time is close to one calendar's latency, in stable order."""
+    started = time.perf_counter()
+    events = await scheduler.get_events.ainvoke(
+        {"start_date": "2025-09-01", "end_date": "2025-09-08", "calendar_id": "all"}, config=CONFIG
+    )
+    elapsed = time.perf_counter() - started
+
+    assert [event["id"] for event in events] == [f"cal-{i}-event" for i in range(10)]
+    assert elapsed < 0.2 * 3
+
+
+@pytest.mark.asyncio
+async def test_slow_and_failing_calendars_return_partial_results(fake_calendar, monkeypatch):
+    """Test that a timeout or error on one calendar doesn't lose the others."""
+    delays, failures = fake_calendar
+    monkeypatch.setattr(scheduler, "CALENDAR_FETCH_TIMEOUT_SECONDS", 0.5)
+    delays["cal-3"] = 5
+    failures["cal-7"] = RuntimeError("403 Forbidden")
+
+    events = await scheduler.get_events.ainvoke(
+        {"start_date": "2025-09-01", "end_date": "2025-09-08", "calendar_id": "all"}, config=CONFIG
+    )
+
+    ids = [event["id"] for event in events if "id" in event]
+    assert ids == [f"cal-{i}-event" for i in range(10) if i not in (3, 7)]
+    warnings = [event["warning"] for event in events if "warning" in event]
+    assert len(warnings) == 2 and "Calendar 3" in warnings[0] and "403" in warnings[1]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency fetches run at once."""
+    running = 0
+    peak = 0
+
+    async def fetch(calendar_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return calendar_id
+
+    results = await scheduler.fetch_calendars([str(i) for i in range(20)], fetch, max_concurrency=4)
+
+    assert peak == 4
+    assert [result for _, result, _ in results] == [str(i) for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_find_event_fans_out(fake_calendar):
+    events = await scheduler.find_event.ainvoke({"event_name": "Event"}, config=CONFIG)
+    assert len(events) == 10
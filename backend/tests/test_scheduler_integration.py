@@ -166,7 +166,7 @@ async def test_with_real_token():
                 config=test_config,
             )
 
-            if slots and not slots[0].startswith("Error"):
+            if slots and isinstance(slots[0], dict):
                 print(f"✅ SUCCESS: Found {len(slots)} available time slots")
                 for slot in slots[:3]:
                     print(f"  - {slot}")
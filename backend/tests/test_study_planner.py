@@ -0,0 +1,117 @@
+"""
+Test the deadline-aware study planner and the smart_schedule tool.
+"""
+
+import math
+import random
+from datetime import datetime, time, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import agents.project_manager as project_manager
+import agents.scheduler as scheduler
+from services.user_profile import SchedulingPreferences, scheduling_preferences
+from utils.availability import as_interval_arrays
+from utils.study_planner import StudyTask, plan_study_sessions, session_blocks
+
+MONDAY = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+def hours(offset, length):
+    """A free interval starting offset hours after Monday 00:00 UTC"""
+    start = MONDAY + timedelta(hours=offset)
+    return start.timestamp(), (start + timedelta(hours=length)).timestamp()
+
+
+def test_free_time_is_cut_into_focus_sessions_with_breaks():
+    starts, ends = session_blocks(*as_interval_arrays([hours(9, 2), hours(13, 0.25)]), focus_minutes=25, break_minutes=5)
+
+    assert [datetime.fromtimestamp(s, timezone.utc).strftime("%H:%M") for s in starts] == ["09:00", "09:30", "10:00", "10:30"]
+    assert np.all(ends - starts == 25 * 60)
+
+
+def test_plan_meets_every_deadline_for_hundreds_of_assignments():
+    """Test EDF feasibility: no overlap, everything inside free time, all sessions before the due date."""
+    rng = random.Random(5)
+    free = [hours(24 * day + 9, 8) for day in range(60)]
+    tasks = [
+        StudyTask(f"a{i}", f"Assignment {i}", MONDAY + timedelta(hours=rng.randrange(24, 24 * 60)), rng.randrange(20, 200))
+        for i in range(300)
+    ]
+
+    plan = plan_study_sessions(tasks, *as_interval_arrays(free), focus_minutes=25, break_minutes=5, strategy="edf")
+
+    due = {task.id: task.due for task in tasks}
+    sessions = plan.sessions
+    assert all(session.end <= due[session.task_id] for session in sessions)
+    assert all(a.end <= b.start for a, b in zip(sessions, sessions[1:]))
+    assert all(any(s <= session.start.timestamp() and session.end.timestamp() <= e for s, e in free) for session in sessions)
+    by_task = {}
+    for session in sessions:
+        by_task[session.task_id] = by_task.get(session.task_id, 0) + 1
+    scheduled = {task.id: task for task in tasks if task.id in by_task}
+    assert all(by_task[task_id] == math.ceil(task.duration_minutes / 25) for task_id, task in scheduled.items())
+    assert len(scheduled) + len(plan.unscheduled) == 300
+    assert scheduled and plan.unscheduled
+
+
+def test_strategies_choose_what_to_drop_when_overloaded():
+    """Four sessions fit before Tuesday: a 100-minute High essay, or two 50-minute Low labs."""
+    free = as_interval_arrays([hours(9, 2)])
+    tasks = [
+        StudyTask("essay", "Essay", MONDAY + timedelta(days=1), 100, "High"),
+        StudyTask("lab1", "Lab 1", MONDAY + timedelta(days=1), 50, "Low"),
+        StudyTask("lab2", "Lab 2", MONDAY + timedelta(days=1), 50, "Low"),
+    ]
+
+    weighted = plan_study_sessions(tasks, *free, strategy="weighted")
+    edf = plan_study_sessions(tasks, *free, strategy="edf")
+
+    assert {session.task_id for session in weighted.sessions} == {"essay"}
+    assert {session.task_id for session in edf.sessions} == {"lab1", "lab2"}
+    assert [item["assignment"] for item in weighted.unscheduled] == ["Lab 1", "Lab 2"]
+    with pytest.raises(ValueError):
+        plan_study_sessions(tasks, *free, strategy="random")
+
+
+@pytest.mark.asyncio
+async def test_smart_schedule_tool_without_a_calendar(fake_notion, monkeypatch):
+    api, backend = fake_notion
+    backend.add_assignment("Problem set 3", due_date="2025-09-02", priority="High")
+    backend.add_assignment("Essay draft", due_date="2025-09-04T17:00:00+00:00", priority="Medium")
+    backend.add_assignment("Old quiz", due_date="2025-08-20")
+    backend.add_assignment("Finished lab", status="Done", due_date="2025-09-03")
+
+    async def no_token(config):
+        return None
+
+    async def no_saved_estimates(user_id):
+        return {}
+
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "load_estimates", no_saved_estimates)
+    monkeypatch.setattr(scheduler, "get_user_access_token", no_token)
+    scheduling_preferences.put(
+        "test-user-123",
+        SchedulingPreferences(work_hours_start=time(9), work_hours_end=time(12), focus_session_duration_minutes=50),
+    )
+    try:
+        result = await project_manager.smart_schedule.ainvoke(
+            {
+                "start_date": "2025-09-01T00:00:00Z",
+                "end_date": "2025-09-08T00:00:00Z",
+                "estimated_minutes": {"problem set 3": 90},
+            },
+            config={"configurable": {"user_id": "test-user-123"}},
+        )
+    finally:
+        scheduling_preferences.invalidate("test-user-123")
+
+    assert "warning" in result and result["overdue"] == ["Old quiz"]
+    assert [(s["assignment"], s["start"][:16], s["minutes"], s["session"]) for s in result["sessions"][:3]] == [
+        ("Problem set 3", "2025-09-01T09:00", 50, "1/2"),
+        ("Problem set 3", "2025-09-01T10:05", 40, "2/2"),
+        ("Essay draft", "2025-09-01T11:10", 50, "1/3"),
+    ]
+    assert result["unscheduled"] == []
@@ -0,0 +1,132 @@
+"""
+Test subtask generation and concurrent creation of the subtask pages.
+"""
+
+from datetime import date
+
+import httpx
+import pytest
+from notion_client.errors import APIResponseError
+
+import agents.project_manager as project_manager
+from services.subtask_tree import AssignmentSubtasks, SubtaskBatch, SubtaskDraft, SubtaskTreeBuilder, schedule_due_dates
+
+CONFIG = {"configurable": {"user_id": "test-user-123"}}
+
+
+def notion_error(status, code, message):
+    response = httpx.Response(status, request=httpx.Request("POST", "https://api.notion.com/v1/pages"))
+    return APIResponseError(response, message, code)
+
+
+class FakeSubtaskModel:
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def with_structured_output(self, schema):
+        assert schema is SubtaskBatch
+        return self
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return self.answer
+
+
+def test_due_dates_stay_between_today_and_the_parent_due_date():
+    today, due = date(2025, 9, 1), date(2025, 9, 11)
+
+    dates = schedule_due_dates(["2025-09-03", "2025-12-01", None, "2025-09-02", "garbage"], today, due)
+
+    assert [d.isoformat() for d in dates] == ["2025-09-03", "2025-09-05", "2025-09-07", "2025-09-07", "2025-09-11"]
+    assert schedule_due_dates([None, None], today, None)[-1] == date(2025, 9, 15)
+
+
+@pytest.mark.asyncio
+async def test_one_model_call_builds_the_whole_tree(fake_notion, monkeypatch):
+    api, backend = fake_notion
+    course = backend.add_course("History 210")
+    essay = backend.add_assignment("Essay", due_date="2099-05-20", priority="High", course_id=course)
+    exam = backend.add_assignment("Midterm", due_date="2099-05-10")
+    answer = SubtaskBatch(
+        assignments=[
+            AssignmentSubtasks(
+                index=1,
+                subtasks=[
+                    SubtaskDraft(name=name, due_date=f"2099-05-{day}")
+                    for name, day in [
+                        ("Research topic", "01"),
+                        ("Create outline", "05"),
+                        ("Write first draft", "12"),
+                        ("Edit draft", "16"),
+                        ("Finalize citations", "19"),
+                        ("Celebrate", "20"),
+                    ]
+                ],
+            ),
+            AssignmentSubtasks(
+                index=2, subtasks=[SubtaskDraft(name="Review lecture notes"), SubtaskDraft(name="Practice exam")]
+            ),
+        ]
+    )
+    model = FakeSubtaskModel(answer)
+    monkeypatch.setattr(project_manager, "NotionAPI", lambda user_id: api)
+    monkeypatch.setattr(project_manager, "llm", model)
+
+    tree = await project_manager.create_subtasks.ainvoke({"assignment_names": ["essay", "Midterm", "Lab"]}, config=CONFIG)
+
+    assert len(model.prompts) == 1 and "[2] Midterm" in model.prompts[0]
+    assert [node.get("assignment") for node in tree] == ["Essay", "Midterm", None]
+    assert tree[2] == {"error": "Assignment not found: Lab"}
+    assert [subtask["name"] for subtask in tree[0]["subtasks"]] == [
+        "Research topic",
+        "Create outline",
+        "Write first draft",
+        "Edit draft",
+        "Finalize citations",
+    ]
+    assert all(subtask["success"] and subtask["parent_linked"] for node in tree[:2] for subtask in node["subtasks"])
+
+    creates = [kwargs["properties"] for operation, kwargs in backend.calls if operation == "create_page"]
+    assert len(creates) == 7
+    # Courses are only listed once, for the name index, never per subtask
+    course_queries = [kwargs for operation, kwargs in backend.calls if kwargs.get("data_source_id") == "courses-ds"]
+    assert len(course_queries) == 1
+    first = next(p for p in creates if p["Assignment Name"]["title"][0]["text"]["content"] == "Research topic")
+    assert first["Parent item"] == {"relation": [{"id": essay}]}
+    assert first["Course"] == {"relation": [{"id": course}]}
+    assert first["Priority"] == {"select": {"name": "High"}}
+    assert first["Due date"] == {"date": {"start": "2099-05-01"}}
+    exam_dates = [subtask["due_date"] for subtask in tree[1]["subtasks"]]
+    assert exam_dates == sorted(exam_dates) and exam_dates[-1] == "2099-05-10"
+    assert tree[1]["page_id"] == exam
+
+
+def test_subtasks_drop_the_parent_only_when_sub_items_are_disabled(fake_notion):
+    api, backend = fake_notion
+    essay = backend.add_assignment("Essay", due_date="2099-05-20")
+    broken = backend.add_assignment("Broken", due_date="2099-05-20")
+
+    def request(operation_type, **kwargs):
+        properties = kwargs.get("properties", {})
+        if operation_type == "create_page" and "Parent item" in properties:
+            backend.calls.append((operation_type, kwargs))
+            raise notion_error(400, "validation_error", "Parent item is not a property that exists.")
+        if operation_type == "create_page" and properties["Description"]["rich_text"][0]["text"]["content"].endswith("Broken"):
+            raise notion_error(503, "service_unavailable", "Notion is unavailable")
+        return backend(operation_type, **kwargs)
+
+    api.make_notion_request = request
+    builder = SubtaskTreeBuilder(api, max_workers=1)
+    drafts = [[SubtaskDraft(name="Outline"), SubtaskDraft(name="Draft")], [SubtaskDraft(name="Start")]]
+
+    tree = builder.materialize([backend.assignment_pages[essay], backend.assignment_pages[broken]], drafts, date(2099, 5, 1))
+
+    assert [(s.success, s.parent_linked) for s in tree[0].subtasks] == [(True, False), (True, False)]
+    # A failure unrelated to the relation isn't retried without it
+    assert not tree[1].subtasks[0].success and "unavailable" in tree[1].subtasks[0].error
+    # Only the first create tried the relation; the rest of the batch remembers it is unsupported
+    parented = [
+        kwargs for operation, kwargs in backend.calls if operation == "create_page" and "Parent item" in kwargs["properties"]
+    ]
+    assert len(parented) == 1
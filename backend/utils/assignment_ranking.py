@@ -0,0 +1,151 @@
+"""
+Deterministic "what should I work on next" ranking.
+
+Each open assignment scores
+
+    URGENCY_WEIGHT * urgency + PRIORITY_WEIGHT * priority
+
+where priority is its Notion priority scaled to 0-1 and urgency decays
+exponentially with slack, the hours left before the due date once the
+estimated work is done: no slack (or overdue) is 1.0, URGENCY_SCALE_HOURS of
+slack is 1/e. Effort therefore counts through slack, so a long assignment due
+Friday can outrank a short one due Thursday. The whole list is scored with a
+handful of numpy operations.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from utils.study_planner import PRIORITY_WEIGHTS
+except ImportError:
+    from backend.utils.study_planner import PRIORITY_WEIGHTS
+
+URGENCY_SCALE_HOURS = 48.0
+# Urgency of assignments without a due date
+UNDATED_URGENCY = 0.05
+URGENCY_WEIGHT = 0.7
+PRIORITY_WEIGHT = 0.3
+
+
+@dataclass(frozen=True)
+class OpenAssignment:
+    """An assignment that still needs work"""
+
+    id: str
+    name: str
+    due: Optional[datetime]
+    estimated_minutes: int
+    priority: Optional[str] = None
+    status: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RankedAssignment:
+    rank: int
+    assignment: OpenAssignment
+    score: float
+    urgency: float
+    hours_left: Optional[float]
+    slack_hours: Optional[float]
+
+    @property
+    def overdue(self) -> bool:
+        return self.hours_left is not None and self.hours_left < 0
+
+    @property
+    def reason(self) -> str:
+        effort = f"needs about {self.assignment.estimated_minutes / 60:.1f}h"
+        if self.hours_left is None:
+            timing = "no due date"
+        elif self.overdue:
+            timing = f"overdue by {-self.hours_left:.0f}h"
+        elif self.slack_hours < 0:
+            timing = f"due in {self.hours_left:.0f}h, less time than it needs"
+        else:
+            timing = f"due in {self.hours_left:.0f}h, {self.slack_hours:.0f}h to spare"
+        return f"{self.assignment.priority or 'No'} priority, {effort}, {timing}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rank": self.rank,
+            "assignment_id": self.assignment.id,
+            "assignment": self.assignment.name,
+            "status": self.assignment.status,
+            "priority": self.assignment.priority,
+            "due": self.assignment.due.isoformat() if self.assignment.due else None,
+            "estimated_minutes": self.assignment.estimated_minutes,
+            "hours_left": None if self.hours_left is None else round(self.hours_left, 1),
+            "overdue": self.overdue,
+            "score": round(self.score, 3),
+            "reason": self.reason,
+        }
+
+
+def score_assignments(
+    due_ts: np.ndarray, effort_minutes: np.ndarray, priority_weights: np.ndarray, now_ts: float
+) -> Dict[str, np.ndarray]:
+    """
+    Score assignments given as parallel arrays
+
+    Args:
+        due_ts: Due dates as POSIX seconds, NaN where there is none
+        effort_minutes: Estimated work left
+        priority_weights: PRIORITY_WEIGHTS values
+        now_ts: Current time, POSIX seconds
+
+    Returns:
+        Dict of "score", "urgency", "hours_left" and "slack_hours" arrays (NaN hours for undated)
+    """
+    hours_left = (due_ts - now_ts) / 3600.0
+    slack_hours = hours_left - effort_minutes / 60.0
+    with np.errstate(invalid="ignore"):
+        urgency = np.exp(-np.clip(slack_hours, 0.0, None) / URGENCY_SCALE_HOURS)
+    urgency = np.where(np.isnan(due_ts), UNDATED_URGENCY, urgency)
+    priority = priority_weights / max(PRIORITY_WEIGHTS.values())
+    return {
+        "score": URGENCY_WEIGHT * urgency + PRIORITY_WEIGHT * priority,
+        "urgency": urgency,
+        "hours_left": hours_left,
+        "slack_hours": slack_hours,
+    }
+
+
+def rank_assignments(
+    assignments: Sequence[OpenAssignment], now: datetime, limit: Optional[int] = None
+) -> List[RankedAssignment]:
+    """
+    Rank open assignments by what to work on next
+
+    Args:
+        assignments: Assignments that still need work (timezone-aware due dates)
+        now: Current time (timezone-aware)
+        limit: Return only this many (None for all)
+
+    Returns:
+        Ranked assignments, best first; ties go to the earlier due date
+    """
+    if not assignments:
+        return []
+    due_ts = np.array([a.due.timestamp() if a.due else np.nan for a in assignments])
+    effort = np.array([a.estimated_minutes for a in assignments], dtype=float)
+    weights = np.array([PRIORITY_WEIGHTS.get(a.priority or "", PRIORITY_WEIGHTS["Low"]) for a in assignments])
+    scored = score_assignments(due_ts, effort, weights, now.timestamp())
+
+    order = np.lexsort((np.nan_to_num(due_ts, nan=np.inf), -scored["score"]))
+    if limit is not None:
+        order = order[:limit]
+    return [
+        RankedAssignment(
+            rank=rank,
+            assignment=assignments[i],
+            score=float(scored["score"][i]),
+            urgency=float(scored["urgency"][i]),
+            hours_left=None if np.isnan(due_ts[i]) else float(scored["hours_left"][i]),
+            slack_hours=None if np.isnan(due_ts[i]) else float(scored["slack_hours"][i]),
+        )
+        for rank, i in enumerate(order, 1)
+    ]
@@ -0,0 +1,216 @@
+"""
+Interval engine for calendar availability.
+
+Busy time arrives as (start, end) POSIX timestamps from the event store or
+freeBusy. Everything here works on numpy arrays of those timestamps: busy
+intervals are padded by the minimum gap, combined with the hours outside the
+user's working day, merged with a sort and a running maximum, and the free
+time is the complement of the result inside the query window. Slots are then
+filtered for each requested duration and ranked, so the scheduler can hand the
+agent structured candidates instead of strings it has to post-filter.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pytz
+
+RANKINGS = ("earliest", "longest", "tightest")
+
+
+@dataclass(frozen=True)
+class FreeSlot:
+    """A free interval long enough for the requested duration"""
+
+    start: datetime
+    end: datetime
+    duration_minutes: int
+
+    @property
+    def free_minutes(self) -> int:
+        return int((self.end - self.start).total_seconds() // 60)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "duration_minutes": self.duration_minutes,
+            "free_minutes": self.free_minutes,
+            "label": f"Available from {self.start.strftime('%A, %b %d, %I:%M %p')} to {self.end.strftime('%A, %b %d, %I:%M %p')}",
+        }
+
+
+def as_interval_arrays(intervals: Iterable[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Split (start, end) pairs into float64 start and end arrays"""
+    array = np.asarray(list(intervals), dtype=np.float64).reshape(-1, 2)
+    return array[:, 0].copy(), array[:, 1].copy()
+
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge overlapping or touching intervals
+
+    Args:
+        starts: Interval starts
+        ends: Interval ends (same length as starts)
+
+    Returns:
+        Sorted, disjoint (starts, ends)
+    """
+    if starts.size == 0:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    reach = np.maximum.accumulate(ends)
+    # A new group begins where an interval starts after everything before it has ended
+    new_group = np.empty(starts.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > reach[:-1]
+    group_starts = np.flatnonzero(new_group)
+    group_ends = np.append(group_starts[1:], starts.size) - 1
+    return starts[group_starts], reach[group_ends]
+
+
+def complement(starts: np.ndarray, ends: np.ndarray, window_start: float, window_end: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Free intervals inside a window, given merged busy intervals
+
+    Args:
+        starts: Merged busy starts
+        ends: Merged busy ends
+        window_start: Window start
+        window_end: Window end
+
+    Returns:
+        (starts, ends) of the non-empty gaps
+    """
+    starts = np.clip(starts, window_start, window_end)
+    ends = np.clip(ends, window_start, window_end)
+    free_starts = np.concatenate(([window_start], ends))
+    free_ends = np.concatenate((starts, [window_end]))
+    keep = free_ends > free_starts
+    return free_starts[keep], free_ends[keep]
+
+
+def off_hours(
+    window_start: float, window_end: float, time_zone: str, work_start: time, work_end: time
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intervals outside working hours covering a window, in local time
+
+    Working hours that end before they start (e.g. 22:00-02:00) wrap past midnight.
+
+    Args:
+        window_start: Window start
+        window_end: Window end
+        time_zone: User's IANA timezone
+        work_start: Start of the working day
+        work_end: End of the working day
+
+    Returns:
+        (starts, ends) of the blocked intervals
+    """
+    tz = pytz.timezone(time_zone)
+    day = datetime.fromtimestamp(window_start, tz).date() - timedelta(days=1)
+    last_day = datetime.fromtimestamp(window_end, tz).date()
+    span = 1 if work_end <= work_start else 0
+    opens, closes = [], []
+    while day <= last_day + timedelta(days=1):
+        opens.append(tz.localize(datetime.combine(day, work_start)).timestamp())
+        closes.append(tz.localize(datetime.combine(day + timedelta(days=span), work_end)).timestamp())
+        day += timedelta(days=1)
+    # Blocked time is everything between one day's close and the next day's open
+    opens_array, closes_array = np.array(opens), np.array(closes)
+    return closes_array[:-1], opens_array[1:]
+
+
+def union_sorted_busy(busy_by_participant: Sequence[Sequence[Tuple[float, float]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Union of several participants' busy intervals in one pass
+
+    Each participant's list must already be sorted by start; heapq.merge walks
+    all of them together (a k-way merge), so combining dozens of calendars
+    costs O(n log k) rather than re-sorting everything.
+
+    Args:
+        busy_by_participant: One sorted list of (start, end) timestamps per participant
+
+    Returns:
+        Sorted, disjoint (starts, ends) of the time at least one participant is busy
+    """
+    starts: List[float] = []
+    ends: List[float] = []
+    for start, end in heapq.merge(*busy_by_participant):
+        if starts and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64)
+
+
+def find_free_slots(
+    busy_starts: np.ndarray,
+    busy_ends: np.ndarray,
+    window_start: datetime,
+    window_end: datetime,
+    durations_minutes: Sequence[int] = (60,),
+    time_zone: str = "UTC",
+    work_hours: Optional[Tuple[time, time]] = None,
+    min_gap_minutes: int = 0,
+    top_k: Optional[int] = None,
+    rank: str = "earliest",
+) -> Dict[int, List[FreeSlot]]:
+    """
+    Find free slots for one or more durations
+
+    Args:
+        busy_starts: Busy interval starts (POSIX timestamps)
+        busy_ends: Busy interval ends (POSIX timestamps)
+        window_start: Start of the search window (timezone-aware)
+        window_end: End of the search window (timezone-aware)
+        durations_minutes: Candidate durations; each gets its own slot list
+        time_zone: Timezone for work hours and the returned datetimes
+        work_hours: (start, end) local working hours to restrict slots to, or None
+        min_gap_minutes: Buffer kept free before and after every busy interval
+        top_k: Return at most this many slots per duration
+        rank: "earliest" first, "longest" free interval first, or "tightest" fit first
+
+    Returns:
+        Mapping of duration to its slots
+    """
+    if rank not in RANKINGS:
+        raise ValueError(f"rank must be one of {RANKINGS}")
+    low, high = window_start.timestamp(), window_end.timestamp()
+    gap = min_gap_minutes * 60.0
+
+    starts = [np.asarray(busy_starts, dtype=np.float64) - gap]
+    ends = [np.asarray(busy_ends, dtype=np.float64) + gap]
+    if work_hours is not None:
+        blocked_starts, blocked_ends = off_hours(low, high, time_zone, *work_hours)
+        starts.append(blocked_starts)
+        ends.append(blocked_ends)
+
+    merged_starts, merged_ends = merge_intervals(np.concatenate(starts), np.concatenate(ends))
+    free_starts, free_ends = complement(merged_starts, merged_ends, low, high)
+    lengths = free_ends - free_starts
+
+    tz = pytz.timezone(time_zone)
+    slots: Dict[int, List[FreeSlot]] = {}
+    for duration in durations_minutes:
+        fits = np.flatnonzero(lengths >= duration * 60.0)
+        if rank == "longest":
+            fits = fits[np.argsort(-lengths[fits], kind="stable")]
+        elif rank == "tightest":
+            fits = fits[np.argsort(lengths[fits], kind="stable")]
+        if top_k is not None:
+            fits = fits[:top_k]
+        slots[duration] = [
+            FreeSlot(datetime.fromtimestamp(free_starts[i], tz), datetime.fromtimestamp(free_ends[i], tz), duration)
+            for i in fits
+        ]
+    return slots
@@ -0,0 +1,208 @@
+"""
+In-memory inverted index for fuzzy, typo-tolerant search over short texts.
+
+Documents are split into lowercase word tokens. Postings map each token to
+the documents containing it (with the weight of the best field it appeared
+in), and a second index maps character trigrams to vocabulary tokens. A query
+token matches a vocabulary token exactly, by prefix ("calc" -> "calculus"), or
+by trigram similarity ("calculsu" -> "calculus"), so searches cost a few set
+lookups instead of a scan over every document.
+
+Searches either require every query token to match (a search box) or rank
+documents by the BM25 inverse document frequency of the tokens they match, so
+rare words outweigh common ones and a stray word only lowers the score.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Query tokens shorter than this only match exactly or by prefix
+MIN_FUZZY_LENGTH = 3
+# Trigram Jaccard similarity a vocabulary token needs to count as a typo match
+MIN_SIMILARITY = 0.4
+# Score of a prefix match, relative to 1.0 for an exact match
+PREFIX_SCORE = 0.9
+# Score of a single-edit typo ("gmy" -> "gym") that shares too few trigrams for MIN_SIMILARITY
+ONE_EDIT_SCORE = 0.6
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Whether a and b differ by one insertion, deletion, substitution or adjacent transposition"""
+    if abs(len(a) - len(b)) > 1 or a == b:
+        return False
+    prefix = 0
+    while prefix < min(len(a), len(b)) and a[prefix] == b[prefix]:
+        prefix += 1
+    if len(a) == len(b):
+        rest_a, rest_b = a[prefix + 1 :], b[prefix + 1 :]
+        transposed = (
+            a[prefix + 1 : prefix + 2] == b[prefix : prefix + 1] and a[prefix : prefix + 1] == b[prefix + 1 : prefix + 2]
+        )
+        return rest_a == rest_b or (transposed and a[prefix + 2 :] == b[prefix + 2 :])
+    longer, shorter = (a, b) if len(a) > len(b) else (b, a)
+    return longer[prefix + 1 :] == shorter[prefix:]
+
+
+class FuzzyIndex:
+    """
+    Token and trigram index over documents with weighted fields.
+
+    Every query token must match the document (AND semantics, like a search
+    box); the score is the mean of each query token's best match weighted by
+    the field it was found in.
+    """
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None):
+        self.field_weights = field_weights or {}
+        self._postings: Dict[str, Dict[Hashable, float]] = defaultdict(dict)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._gram_counts: Dict[str, int] = {}
+        self._documents: Dict[Hashable, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._documents
+
+    def add(self, doc_id: Hashable, fields: Dict[str, Optional[str]]) -> None:
+        """
+        Index a document, replacing any previous version
+
+        Args:
+            doc_id: Document identifier
+            fields: Field name to text, e.g. {"summary": ..., "location": ...}
+        """
+        self.remove(doc_id)
+        tokens: Dict[str, float] = {}
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for token in tokenize(text):
+                if weight > tokens.get(token, 0.0):
+                    tokens[token] = weight
+        self._documents[doc_id] = tokens
+        for token, weight in tokens.items():
+            if token not in self._postings:
+                grams = trigrams(token)
+                self._gram_counts[token] = len(grams)
+                for gram in grams:
+                    self._trigrams[gram].add(token)
+            self._postings[token][doc_id] = weight
+
+    def remove(self, doc_id: Hashable) -> None:
+        tokens = self._documents.pop(doc_id, None)
+        if not tokens:
+            return
+        for token in tokens:
+            postings = self._postings[token]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._gram_counts[token]
+                for gram in trigrams(token):
+                    self._trigrams[gram].discard(token)
+                    if not self._trigrams[gram]:
+                        del self._trigrams[gram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._trigrams.clear()
+        self._gram_counts.clear()
+        self._documents.clear()
+
+    def _candidates(self, token: str) -> Dict[str, float]:
+        """Vocabulary tokens matching a query token, with their similarity"""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = 1.0
+        query_grams = trigrams(token)
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for candidate in self._trigrams.get(gram, ()):
+                counts[candidate] += 1
+        for candidate, shared in counts.items():
+            if candidate in matches:
+                continue
+            if candidate.startswith(token):
+                matches[candidate] = PREFIX_SCORE
+            elif len(token) >= MIN_FUZZY_LENGTH:
+                similarity = shared / (len(query_grams) + self._gram_counts[candidate] - shared)
+                if similarity >= MIN_SIMILARITY:
+                    matches[candidate] = similarity
+                elif within_one_edit(token, candidate):
+                    matches[candidate] = ONE_EDIT_SCORE
+        return matches
+
+    def _token_scores(self, token: str) -> Dict[Hashable, float]:
+        """Best score of a query token in each document it matches"""
+        best: Dict[Hashable, float] = {}
+        for candidate, similarity in self._candidates(token).items():
+            for doc_id, weight in self._postings[candidate].items():
+                score = similarity * weight
+                if score > best.get(doc_id, 0.0):
+                    best[doc_id] = score
+        return best
+
+    def search(
+        self, query: str, limit: Optional[int] = 10, min_score: float = 0.0, match_all: bool = True
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Find documents matching the query
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results (None for all)
+            min_score: Drop results scoring below this (0-1)
+            match_all: Require every query token to match; otherwise rank documents
+                matching any token, weighting each token by its BM25 IDF
+
+        Returns:
+            (doc_id, score) pairs, best first
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+
+        scores: Optional[Dict[Hashable, float]] = None
+        if match_all:
+            for token in query_tokens:
+                best = self._token_scores(token)
+                if scores is None:
+                    scores = best
+                else:
+                    scores = {doc_id: scores[doc_id] + score for doc_id, score in best.items() if doc_id in scores}
+                if not scores:
+                    return []
+            results = [(doc_id, total / len(query_tokens)) for doc_id, total in scores.items()]
+        else:
+            scores = defaultdict(float)
+            total_idf = 0.0
+            for token in query_tokens:
+                best = self._token_scores(token)
+                # Unmatched tokens get the highest IDF, so an unknown word costs the most
+                idf = math.log(1 + (len(self._documents) - len(best) + 0.5) / (len(best) + 0.5))
+                total_idf += idf
+                for doc_id, score in best.items():
+                    scores[doc_id] += idf * score
+            results = [(doc_id, total / total_idf) for doc_id, total in scores.items()]
+
+        results = [result for result in results if result[1] >= min_score]
+        results.sort(key=lambda result: -result[1])
+        return results[:limit] if limit is not None else results
+
+    def add_many(self, documents: Iterable[Tuple[Hashable, Dict[str, Optional[str]]]]) -> None:
+        for doc_id, fields in documents:
+            self.add(doc_id, fields)
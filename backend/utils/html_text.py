@@ -0,0 +1,319 @@
+"""
+HTML to plain text conversion for Notion rich_text fields.
+
+Canvas assignment descriptions arrive as HTML. Building a full BeautifulSoup
+tree for each one only to flatten it again is wasteful, so this module streams
+over the markup instead: tags are dropped, entities decoded and whitespace
+collapsed as text is produced, and work stops as soon as the output limit is
+reached.
+
+The result is identical to what ``NotionAPI.clean_html`` produced with
+``BeautifulSoup(html, "html.parser").get_text()`` followed by whitespace
+collapsing and truncation. Well-formed markup goes through a regex scanner;
+anything unusual (script blocks, CDATA, unterminated tags, stray ``&#``) is
+handed to ``html.parser`` directly, which is the same tokenizer BeautifulSoup
+uses, so edge cases keep their exact behaviour.
+"""
+
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Notion rejects rich_text content longer than this
+NOTION_TEXT_LIMIT = 2000
+
+# Named entities as BeautifulSoup resolves them (&name; and &name<non-alnum>)
+_ENTITIES = {name[:-1]: char for name, char in html5.items() if name.endswith(";")}
+
+# Text inside these elements is not returned by get_text()
+_HIDDEN_ELEMENTS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Elements that never hold content, so they are closed as soon as they open
+_VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "basefont",
+        "bgsound",
+        "br",
+        "col",
+        "command",
+        "embed",
+        "frame",
+        "hr",
+        "image",
+        "img",
+        "input",
+        "isindex",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "nextid",
+        "param",
+        "source",
+        "spacer",
+        "track",
+        "wbr",
+    }
+)
+
+# Elements whose content html.parser treats as raw or escapable raw text; the
+# exact rules differ between Python versions so the fast path never handles them
+_RAW_TEXT_ELEMENTS = frozenset(
+    {"script", "style", "textarea", "title", "xmp", "iframe", "noembed", "noframes", "noscript", "plaintext"}
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_MARKUP_OR_REF = re.compile(r"[<&]")
+_START_TAG = re.compile(
+    r"""<([a-zA-Z][a-zA-Z0-9:-]*)""" r"""(?:\s+[^\s/>"'=<]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*""" r"""\s*(/?)>"""
+)
+_END_TAG = re.compile(r"</([a-zA-Z][a-zA-Z0-9:-]*)\s*>")
+_DOCTYPE = re.compile(r"<!doctype[^<>]*>", re.IGNORECASE)
+_PROCESSING_INSTRUCTION = re.compile(r"<\?[^<>]*>")
+_CHARREF = re.compile(r"&#(?:([0-9]+)|[xX]([0-9a-fA-F]+))[^0-9a-fA-F]")
+_ENTITYREF = re.compile(r"&([a-zA-Z][-.a-zA-Z0-9]*)[^a-zA-Z0-9]")
+
+
+class _LimitReached(Exception):
+    """Raised internally once enough text has been collected."""
+
+
+class _TextSink:
+    """Collects text, collapsing whitespace runs and stopping at the limit."""
+
+    __slots__ = ("parts", "length", "limit", "pending_space")
+
+    def __init__(self, limit: int):
+        self.parts: List[str] = []
+        self.length = 0
+        self.limit = limit
+        self.pending_space = False
+
+    def write(self, text: str) -> None:
+        words = _WHITESPACE.split(text)
+        for index, word in enumerate(words):
+            if index:
+                self.pending_space = True
+            if not word:
+                continue
+            if self.pending_space and self.length:
+                self.parts.append(" ")
+                self.length += 1
+            self.pending_space = False
+            self.parts.append(word)
+            self.length += len(word)
+            if self.length >= self.limit:
+                raise _LimitReached
+
+    def text(self) -> str:
+        return "".join(self.parts)[: self.limit]
+
+
+class _OpenElements:
+    """
+    Tracks open elements the way BeautifulSoup's html.parser builder does,
+    which decides whether a piece of text belongs to a hidden element.
+    """
+
+    __slots__ = ("stack", "hidden")
+
+    def __init__(self):
+        self.stack: List[str] = []
+        self.hidden = 0
+
+    def open(self, name: str) -> None:
+        if name in _VOID_ELEMENTS:
+            return
+        self.stack.append(name)
+        if name in _HIDDEN_ELEMENTS:
+            self.hidden += 1
+
+    def close(self, name: str) -> None:
+        # Closing tags pop everything above the most recent element of that name
+        if name not in self.stack:
+            return
+        while self.stack:
+            popped = self.stack.pop()
+            if popped in _HIDDEN_ELEMENTS:
+                self.hidden -= 1
+            if popped == name:
+                return
+
+
+def _decode_charref(number: int) -> str:
+    # Code points below 256 are read as windows-1252, like BeautifulSoup does
+    if number < 256:
+        try:
+            return bytes([number]).decode("windows-1252")
+        except UnicodeDecodeError:
+            pass
+    try:
+        return chr(number)
+    except (ValueError, OverflowError):
+        return "\N{REPLACEMENT CHARACTER}"
+
+
+class _TextExtractor(HTMLParser):
+    """Event-driven extractor used for markup the fast scanner does not model."""
+
+    def __init__(self, sink: _TextSink):
+        super().__init__(convert_charrefs=False)
+        self.sink = sink
+        self.elements = _OpenElements()
+
+    def handle_starttag(self, tag, attrs):
+        self.elements.open(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # Opened and closed immediately, so the element stack is unchanged
+        pass
+
+    def handle_endtag(self, tag):
+        self.elements.close(tag)
+
+    def handle_data(self, data):
+        if not self.elements.hidden:
+            self.sink.write(data)
+
+    def handle_charref(self, name):
+        number = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+        self.handle_data(_decode_charref(number))
+
+    def handle_entityref(self, name):
+        self.handle_data(_ENTITIES.get(name, "&" + name))
+
+    def unknown_decl(self, data):
+        # CDATA sections are kept even inside hidden elements
+        if data.upper().startswith("CDATA["):
+            self.sink.write(data[len("CDATA[") :])
+
+
+def _scan(html_content: str, sink: _TextSink) -> bool:
+    """
+    Fast path over well-formed markup.
+
+    Returns False as soon as it meets a construct it does not reproduce
+    exactly; the caller then discards the sink and falls back to the parser.
+    """
+    elements = _OpenElements()
+    parts: List[str] = []
+    end = len(html_content)
+    pos = 0
+
+    def flush() -> None:
+        if parts and not elements.hidden:
+            sink.write("".join(parts))
+        parts.clear()
+
+    while pos < end:
+        match = _MARKUP_OR_REF.search(html_content, pos)
+        if match is None:
+            parts.append(html_content[pos:])
+            break
+        index = match.start()
+        if index > pos:
+            parts.append(html_content[pos:index])
+        nxt = html_content[index + 1 : index + 2]
+
+        if match.group() == "&":
+            if nxt == "#":
+                ref = _CHARREF.match(html_content, index)
+                if not ref:
+                    return False
+                digits, hexdigits = ref.groups()
+                parts.append(_decode_charref(int(digits) if digits else int(hexdigits, 16)))
+            elif nxt.isascii() and nxt.isalpha():
+                ref = _ENTITYREF.match(html_content, index)
+                if not ref:
+                    return False
+                name = ref.group(1)
+                parts.append(_ENTITIES.get(name, "&" + name))
+            elif nxt:
+                parts.append("&")
+                pos = index + 1
+                continue
+            else:
+                return False
+            # The terminating character is only consumed when it is a semicolon
+            pos = ref.end() if html_content[ref.end() - 1] == ";" else ref.end() - 1
+            continue
+
+        if nxt == "/":
+            tag = _END_TAG.match(html_content, index)
+            if not tag:
+                return False
+            flush()
+            elements.close(tag.group(1).lower())
+        elif nxt == "!":
+            if html_content.startswith("<!--", index):
+                close = html_content.find("-->", index + 4)
+                body = html_content[index + 4 : close]
+                if close < 0 or "--" in body or body.startswith(">") or body.startswith("->"):
+                    return False
+                flush()
+                pos = close + 3
+                continue
+            tag = _DOCTYPE.match(html_content, index)
+            if not tag:
+                return False
+            flush()
+        elif nxt == "?":
+            tag = _PROCESSING_INSTRUCTION.match(html_content, index)
+            if not tag:
+                return False
+            flush()
+        elif nxt.isascii() and nxt.isalpha():
+            tag = _START_TAG.match(html_content, index)
+            if not tag:
+                return False
+            name = tag.group(1).lower()
+            if name in _RAW_TEXT_ELEMENTS:
+                return False
+            flush()
+            if not tag.group(2):
+                elements.open(name)
+        elif nxt:
+            # A "<" that cannot start markup is literal text
+            parts.append("<")
+            pos = index + 1
+            continue
+        else:
+            return False
+        pos = tag.end()
+
+    flush()
+    return True
+
+
+def html_to_text(html_content: Optional[str], limit: int = NOTION_TEXT_LIMIT) -> str:
+    """
+    Strip tags from HTML, decode entities and collapse whitespace.
+
+    Args:
+        html_content: HTML string to clean
+        limit: Maximum length of the returned text
+
+    Returns:
+        Plain text with whitespace runs collapsed to single spaces, truncated to ``limit``
+    """
+    if not html_content:
+        return ""
+
+    sink = _TextSink(limit)
+    try:
+        if _scan(html_content, sink):
+            return sink.text()
+    except _LimitReached:
+        return sink.text()
+
+    sink = _TextSink(limit)
+    parser = _TextExtractor(sink)
+    try:
+        parser.feed(html_content)
+        parser.close()
+    except _LimitReached:
+        pass
+    return sink.text()
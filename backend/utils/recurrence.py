@@ -0,0 +1,224 @@
+"""
+Local expansion of recurring Google Calendar events.
+
+events.list with singleEvents=True makes Google expand every recurring event
+into its instances, which for a semester of daily classes is thousands of
+near-identical resources. With singleEvents=False Google returns each series
+once (the master, carrying its RRULE/EXDATE/RDATE lines) plus the instances
+that were moved, edited or cancelled. expand_recurring_events turns that
+response into the same instance list Google would have sent.
+
+Rules are evaluated in the series' own time zone with zoneinfo, so a 10:00
+class stays at 10:00 local across DST changes; pytz zones can't be used here
+because dateutil does wall-clock arithmetic on the tzinfo it is given.
+"""
+
+import re
+from datetime import date, datetime, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.rrule import rrule, rruleset, rrulestr
+
+_UNTIL_PATTERN = re.compile(r"UNTIL=(\d{8})(T\d{6})?(Z?)")
+
+
+def _zone(name: Optional[str], fallback: tzinfo = timezone.utc) -> tzinfo:
+    if not name:
+        return fallback
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return fallback
+
+
+def _parse_value(value: str, tz: Optional[tzinfo], all_day: bool) -> datetime:
+    """Parse one iCalendar DATE or DATE-TIME value"""
+    if len(value) == 8:
+        parsed = datetime.strptime(value, "%Y%m%d")
+        return parsed if all_day else parsed.replace(tzinfo=tz)
+    parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return parsed if all_day else parsed.replace(tzinfo=timezone.utc)
+    return parsed if all_day else parsed.replace(tzinfo=tz)
+
+
+def _parse_dates(line: str, tz: Optional[tzinfo], all_day: bool) -> List[datetime]:
+    """Values of an EXDATE or RDATE line, honoring its TZID parameter"""
+    head, _, values = line.partition(":")
+    for param in head.split(";")[1:]:
+        key, _, param_value = param.partition("=")
+        if key.upper() == "TZID" and not all_day:
+            tz = _zone(param_value, tz)
+    return [_parse_value(value, tz, all_day) for value in values.split(",") if value]
+
+
+def _rule(line: str, dtstart: datetime, tz: Optional[tzinfo]) -> rrule:
+    """Parse an RRULE/EXRULE line; a floating UNTIL on a timed series is read in the series' zone"""
+    if dtstart.tzinfo is not None:
+
+        def to_utc(match: re.Match) -> str:
+            if match.group(3):
+                return match.group(0)
+            until = datetime.strptime(match.group(1) + (match.group(2) or "T235959"), "%Y%m%dT%H%M%S")
+            return "UNTIL=" + until.replace(tzinfo=tz).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+        line = _UNTIL_PATTERN.sub(to_utc, line)
+    return rrulestr(line.split(":", 1)[1], dtstart=dtstart)
+
+
+def _instance_key(moment: datetime, all_day: bool) -> str:
+    if all_day:
+        return moment.strftime("%Y%m%d")
+    return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _start_of(event: Dict[str, Any], default_tz: tzinfo) -> Tuple[datetime, bool]:
+    """An event's start as an aware datetime, and whether it is all-day"""
+    start = event.get("start") or {}
+    if "date" in start:
+        return datetime.combine(date.fromisoformat(start["date"]), datetime.min.time(), default_tz), True
+    return datetime.fromisoformat(start["dateTime"].replace("Z", "+00:00")), False
+
+
+def _overlaps(event: Dict[str, Any], time_min: datetime, time_max: datetime, default_tz: tzinfo) -> bool:
+    start, all_day = _start_of(event, default_tz)
+    end_field = event.get("end") or {}
+    if all_day:
+        end = datetime.combine(date.fromisoformat(end_field["date"]), datetime.min.time(), default_tz)
+    else:
+        end = datetime.fromisoformat(end_field["dateTime"].replace("Z", "+00:00"))
+    return start < time_max and end > time_min
+
+
+def _original_key(event: Dict[str, Any]) -> Optional[str]:
+    """The instance key of an exception, from originalStartTime or its instance ID"""
+    original = event.get("originalStartTime")
+    if original:
+        if "date" in original:
+            return date.fromisoformat(original["date"]).strftime("%Y%m%d")
+        return _instance_key(datetime.fromisoformat(original["dateTime"].replace("Z", "+00:00")), False)
+    master_id = event.get("recurringEventId")
+    event_id = event.get("id", "")
+    if master_id and event_id.startswith(f"{master_id}_"):
+        return event_id[len(master_id) + 1 :]
+    return None
+
+
+def expand_master(
+    master: Dict[str, Any], time_min: datetime, time_max: datetime, default_tz: tzinfo = timezone.utc
+) -> List[Dict[str, Any]]:
+    """
+    Instances of one recurring event overlapping [time_min, time_max)
+
+    Args:
+        master: Recurring event resource with a "recurrence" list
+        time_min: Range start (aware)
+        time_max: Range end (aware)
+        default_tz: Zone for all-day dates and series without start.timeZone
+
+    Returns:
+        Instance resources shaped like singleEvents=True results, in start order
+    """
+    start_field, end_field = master["start"], master["end"]
+    all_day = "date" in start_field
+    if all_day:
+        tz = None
+        dtstart = datetime.fromisoformat(start_field["date"])
+        duration = datetime.fromisoformat(end_field["date"]) - dtstart
+        # All-day dates are floating; the window is compared in the calendar's zone
+        window_start = time_min.astimezone(default_tz).replace(tzinfo=None) - duration
+        window_end = time_max.astimezone(default_tz).replace(tzinfo=None)
+    else:
+        first = datetime.fromisoformat(start_field["dateTime"].replace("Z", "+00:00"))
+        tz = _zone(start_field.get("timeZone"), first.tzinfo or default_tz)
+        dtstart = first.astimezone(tz)
+        duration = datetime.fromisoformat(end_field["dateTime"].replace("Z", "+00:00")) - first
+        window_start, window_end = time_min - duration, time_max
+
+    rules = rruleset()
+    for line in master.get("recurrence", []):
+        name = line.split(":", 1)[0].split(";", 1)[0].upper()
+        if name == "RRULE":
+            rules.rrule(_rule(line, dtstart, tz))
+        elif name == "EXRULE":
+            rules.exrule(_rule(line, dtstart, tz))
+        elif name == "RDATE":
+            for moment in _parse_dates(line, tz, all_day):
+                rules.rdate(moment)
+        elif name == "EXDATE":
+            for moment in _parse_dates(line, tz, all_day):
+                rules.exdate(moment)
+    # RRULE always generates DTSTART when it matches, but an RDATE-only series still starts there
+    rules.rdate(dtstart)
+
+    template = {key: value for key, value in master.items() if key not in ("recurrence", "id", "start", "end")}
+    instances = []
+    for moment in rules.between(window_start, window_end):
+        end = moment + duration
+        if all_day:
+            start_value = {"date": moment.date().isoformat()}
+            end_value = {"date": end.date().isoformat()}
+        else:
+            end = end.astimezone(tz)
+            start_value = {"dateTime": moment.isoformat(), "timeZone": start_field.get("timeZone")}
+            end_value = {"dateTime": end.isoformat(), "timeZone": end_field.get("timeZone")}
+            start_value = {key: value for key, value in start_value.items() if value}
+            end_value = {key: value for key, value in end_value.items() if value}
+        instance = {
+            **template,
+            "id": f"{master['id']}_{_instance_key(moment, all_day)}",
+            "start": start_value,
+            "end": end_value,
+            "recurringEventId": master["id"],
+        }
+        instances.append(instance)
+    return instances
+
+
+def expand_recurring_events(
+    items: Iterable[Dict[str, Any]],
+    time_min: datetime,
+    time_max: datetime,
+    time_zone: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Expand an events.list response fetched with singleEvents=False
+
+    Args:
+        items: Event resources: single events, recurring masters (with
+            "recurrence") and exceptions (with "recurringEventId"); cancelled
+            exceptions are only returned by Google with showDeleted=True
+        time_min: Range start (aware)
+        time_max: Range end (aware)
+        time_zone: IANA zone for all-day dates (the calendar's time zone)
+
+    Returns:
+        Non-cancelled events and instances overlapping the range, ordered by start
+        like orderBy=startTime
+    """
+    default_tz = _zone(time_zone)
+    singles: List[Dict[str, Any]] = []
+    masters: List[Dict[str, Any]] = []
+    exceptions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for item in items:
+        if item.get("recurrence"):
+            if item.get("status") != "cancelled":
+                masters.append(item)
+        elif item.get("recurringEventId") and _original_key(item):
+            exceptions[(item["recurringEventId"], _original_key(item))] = item
+        elif item.get("status") != "cancelled":
+            singles.append(item)
+
+    events = [event for event in singles if _overlaps(event, time_min, time_max, default_tz)]
+    for master in masters:
+        for instance in expand_master(master, time_min, time_max, default_tz):
+            if (master["id"], instance["id"][len(master["id"]) + 1 :]) not in exceptions:
+                events.append(instance)
+    # Moved and edited instances replace the generated ones; they count where they ended up
+    for exception in exceptions.values():
+        if exception.get("status") != "cancelled" and _overlaps(exception, time_min, time_max, default_tz):
+            events.append(exception)
+
+    events.sort(key=lambda event: (_start_of(event, default_tz)[0], event.get("id", "")))
+    return events
@@ -0,0 +1,194 @@
+"""
+Deadline-aware study planner behind smart_schedule.
+
+Free time (POSIX timestamp intervals, as utils.availability produces them) is
+cut into focus sessions of the user's focus length separated by their break
+length. Assignments need ceil(duration / focus) sessions each.
+
+With one shared pool of sessions and every assignment available now, taking
+assignments in earliest-deadline-first (EDF) order and giving each the next
+free sessions meets every deadline whenever any plan can. When the sessions
+before some deadline can't hold everything due by then, assignments are
+dropped Moore-Hodgson style: walking deadlines in order, the cheapest
+assignment accepted so far is removed until the load fits again. "weighted"
+drops the lowest priority per session first; "edf" drops the largest
+assignment first, which keeps the most assignments on time.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pytz
+
+STRATEGIES = ("weighted", "edf")
+PRIORITY_WEIGHTS = {"High": 3.0, "Medium": 2.0, "Low": 1.0}
+
+
+@dataclass(frozen=True)
+class StudyTask:
+    """An assignment to plan for"""
+
+    id: str
+    name: str
+    due: datetime
+    duration_minutes: int
+    priority: Optional[str] = "Medium"
+
+    @property
+    def weight(self) -> float:
+        return PRIORITY_WEIGHTS.get(self.priority or "", PRIORITY_WEIGHTS["Medium"])
+
+
+@dataclass(frozen=True)
+class StudySession:
+    """One focus session on one assignment"""
+
+    task_id: str
+    name: str
+    start: datetime
+    end: datetime
+    part: int
+    parts: int
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "assignment_id": self.task_id,
+            "assignment": self.name,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "minutes": int((self.end - self.start).total_seconds() // 60),
+            "session": f"{self.part}/{self.parts}",
+        }
+
+
+@dataclass
+class StudyPlan:
+    """Scheduled sessions in start order, and assignments that didn't fit"""
+
+    sessions: List[StudySession] = field(default_factory=list)
+    unscheduled: List[Dict[str, object]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "sessions": [session.to_dict() for session in self.sessions],
+            "unscheduled": self.unscheduled,
+        }
+
+
+def session_blocks(
+    free_starts: np.ndarray, free_ends: np.ndarray, focus_minutes: int, break_minutes: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cut free intervals into focus sessions with breaks between them
+
+    Args:
+        free_starts: Sorted, non-overlapping free interval starts (POSIX seconds)
+        free_ends: Matching ends
+        focus_minutes: Session length
+        break_minutes: Gap between consecutive sessions in the same interval
+
+    Returns:
+        (starts, ends) of every full-length session, in order
+    """
+    focus = focus_minutes * 60.0
+    cycle = focus + break_minutes * 60.0
+    counts = np.floor((free_ends - free_starts + cycle - focus) / cycle).astype(np.int64)
+    counts = np.maximum(counts, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0), np.empty(0)
+    first_index = np.repeat(np.cumsum(counts) - counts, counts)
+    starts = np.repeat(free_starts, counts) + (np.arange(total) - first_index) * cycle
+    return starts, starts + focus
+
+
+def plan_study_sessions(
+    tasks: Sequence[StudyTask],
+    free_starts: np.ndarray,
+    free_ends: np.ndarray,
+    focus_minutes: int = 25,
+    break_minutes: int = 5,
+    strategy: str = "weighted",
+    time_zone: str = "UTC",
+) -> StudyPlan:
+    """
+    Plan focus sessions for assignments ahead of their due dates
+
+    Args:
+        tasks: Assignments with due dates and estimated durations
+        free_starts: Sorted, non-overlapping free interval starts (POSIX seconds)
+        free_ends: Matching ends
+        focus_minutes: Session length (profiles.focus_session_duration_minutes)
+        break_minutes: Break between sessions (profiles.break_duration_minutes)
+        strategy: "weighted" (keep high priority work) or "edf" (keep the most assignments)
+        time_zone: Timezone the sessions are reported in
+
+    Returns:
+        Feasible plan: each scheduled assignment gets all its sessions before it is due
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}")
+    if focus_minutes <= 0:
+        raise ValueError("focus_minutes must be positive")
+
+    block_starts, block_ends = session_blocks(free_starts, free_ends, focus_minutes, break_minutes)
+    plan = StudyPlan()
+
+    ordered = sorted(tasks, key=lambda task: (task.due, -task.weight, task.name))
+    needed = [max(1, math.ceil(task.duration_minutes / focus_minutes)) for task in ordered]
+    capacity = np.searchsorted(block_ends, [task.due.timestamp() for task in ordered], side="right")
+
+    accepted: List[Tuple[float, int, int]] = []
+    dropped = set()
+    load = 0
+    for index, task in enumerate(ordered):
+        if strategy == "weighted":
+            key = task.weight / needed[index]
+        else:
+            key = -needed[index]
+        heapq.heappush(accepted, (key, -index, index))
+        load += needed[index]
+        while load > capacity[index]:
+            _, _, evicted = heapq.heappop(accepted)
+            dropped.add(evicted)
+            load -= needed[evicted]
+
+    tz = pytz.timezone(time_zone)
+    next_block = 0
+    for index, task in enumerate(ordered):
+        if index in dropped:
+            plan.unscheduled.append(
+                {
+                    "assignment_id": task.id,
+                    "assignment": task.name,
+                    "due": task.due.astimezone(tz).isoformat(),
+                    "needed_minutes": task.duration_minutes,
+                    "reason": (
+                        "not enough free time before it is due, after earlier deadlines"
+                        if capacity[index]
+                        else "no free focus session before it is due"
+                    ),
+                }
+            )
+            continue
+        remaining = task.duration_minutes
+        for part in range(1, needed[index] + 1):
+            start = block_starts[next_block]
+            minutes = min(focus_minutes, remaining) if remaining > 0 else focus_minutes
+            plan.sessions.append(
+                StudySession(
+                    task.id,
+                    task.name,
+                    datetime.fromtimestamp(start, tz),
+                    datetime.fromtimestamp(start + minutes * 60, tz),
+                    part,
+                    needed[index],
+                )
+            )
+            remaining -= minutes
+            next_block += 1
+    return plan